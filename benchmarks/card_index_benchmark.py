@@ -0,0 +1,92 @@
+"""Benchmark for the MCP server cold start with a large card directory.
+
+Builds the agent card index over 500 synthetic cards three times: without
+an embedding cache, with an empty cache and with the cache written by the
+previous run, plus a run where one card changed. Reports the build time and
+how many cards were embedded.
+
+run:
+  python benchmarks/card_index_benchmark.py
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(
+    0,
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), '..', 'claude-code-sdk')
+    ),
+)
+
+from a2a_mcp.mcp.card_index import build_card_index
+from a2a_mcp.mcp.embedding_cache import EmbeddingCache
+from a2a_mcp.mcp.embeddings import EmbeddingService
+
+
+CARDS = 500
+WORDS = (
+    'flight hotel car rental booking itinerary payment invoice weather '
+    'currency translation calendar meeting email search summary report'
+).split()
+
+
+def make_cards() -> list[dict]:
+    return [
+        {
+            'name': f'Agent {i}',
+            'description': ' '.join(WORDS[(i + j) % len(WORDS)] for j in range(40)),
+            'skills': [
+                {
+                    'name': f'skill {i}.{s}',
+                    'description': ' '.join(WORDS[(i * s + j) % len(WORDS)] for j in range(30)),
+                    'tags': WORDS[s : s + 4],
+                    'examples': [f'Please {WORDS[(i + s) % len(WORDS)]} for me'],
+                }
+                for s in range(4)
+            ],
+        }
+        for i in range(CARDS)
+    ]
+
+
+async def measure(name: str, service, cards, cache) -> None:
+    uris = [f'resource://agent_cards/agent_{i}' for i in range(len(cards))]
+    embedded = 0
+    batch = service.embedder.embed_many
+
+    def counting(texts):
+        nonlocal embedded
+        embedded += len(texts)
+        return batch(texts)
+
+    with mock.patch.object(service.embedder, 'embed_many', counting):
+        start = time.perf_counter()
+        await build_card_index(uris, cards, service, cache)
+        elapsed = time.perf_counter() - start
+    print(f'{name:>14} {elapsed * 1000:>9.1f} ms {embedded:>5} embedded')
+
+
+async def main():
+    service = EmbeddingService()
+    cards = make_cards()
+    print(f'{CARDS} agent cards')
+    with tempfile.TemporaryDirectory() as tmp:
+        await measure('no cache', service, cards, None)
+        cache = EmbeddingCache(Path(tmp), service.model, service.dim)
+        await measure('cold cache', service, cards, cache)
+        # A restart opens the cache from disk
+        cache = EmbeddingCache(Path(tmp), service.model, service.dim)
+        await measure('warm cache', service, cards, cache)
+        cards[7] = dict(cards[7], description='Sells train tickets.')
+        await measure('one changed', service, cards, cache)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
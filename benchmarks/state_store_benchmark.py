@@ -0,0 +1,92 @@
+"""Micro-benchmark for the StateStore lookups on the task callback hot path.
+
+Every streaming TaskStatusUpdateEvent resolves the conversation, the task and
+the message -> task mapping. This measures the per-event cost of those
+lookups for a growing number of stored tasks, next to the linear scans the
+manager used before.
+
+run:
+  python benchmarks/state_store_benchmark.py
+"""
+
+import os
+import sys
+import timeit
+import uuid
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from a2a.types import Task, TaskState, TaskStatus
+
+from service.server.state_store import StateStore
+from service.types import Conversation
+
+
+SIZES = [100, 1_000, 10_000, 100_000]
+EVENTS = 2_000
+
+
+def populate(size: int) -> tuple[StateStore, list[Task], list[str]]:
+    store = StateStore()
+    tasks = []
+    message_ids = []
+    for i in range(size):
+        context_id = f'context-{i % 50}'
+        if i < 50:
+            store.add_conversation(
+                Conversation(conversation_id=context_id, is_active=True)
+            )
+        task = Task(
+            id=str(uuid.uuid4()),
+            context_id=context_id,
+            status=TaskStatus(state=TaskState.working),
+        )
+        store.add_task(task)
+        message_id = str(uuid.uuid4())
+        store.attach_message_to_task(message_id, task.id)
+        tasks.append(task)
+        message_ids.append(message_id)
+    return store, tasks, message_ids
+
+
+def indexed_event(store: StateStore, task: Task, message_id: str):
+    store.get_conversation(task.context_id)
+    current = store.get_task(task.id)
+    store.attach_message_to_task(message_id, current.id)
+    store.update_task(current)
+    store.task_for_message(message_id)
+
+
+def linear_event(tasks: list[Task], task: Task, message_id: str):
+    # Mirrors the previous filter(lambda ...) based lookups.
+    current = next(filter(lambda x: x.id == task.id, tasks), None)
+    for i, t in enumerate(tasks):
+        if t.id == current.id:
+            tasks[i] = current
+            break
+    next(filter(lambda x: x.id == current.id, tasks), None)
+
+
+def main():
+    print(f'{"tasks":>8} {"indexed us/event":>18} {"linear us/event":>17}')
+    for size in SIZES:
+        store, tasks, message_ids = populate(size)
+        # Hit the tail of the collection, the worst case for a linear scan.
+        probe = [(tasks[-1 - (i % 10)], message_ids[-1 - (i % 10)]) for i in range(EVENTS)]
+
+        indexed = timeit.timeit(
+            lambda: [indexed_event(store, t, m) for t, m in probe], number=1
+        )
+        linear_events = probe[: max(1, EVENTS * 100 // size)]
+        linear = timeit.timeit(
+            lambda: [linear_event(tasks, t, m) for t, m in linear_events],
+            number=1,
+        )
+        print(
+            f'{size:>8} {indexed / len(probe) * 1e6:>18.2f}'
+            f' {linear / len(linear_events) * 1e6:>17.2f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""Benchmark UpdateAppState latency with and without the pooled http client.
+
+Starts the ConversationServer with the in-memory fake manager on a local
+port and times UpdateAppState when every request opens its own
+httpx.AsyncClient (the previous behaviour) and when requests share the
+pooled client.
+
+run:
+  python benchmarks/update_app_state_benchmark.py
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ['A2A_HOST'] = 'FAKE'
+
+import httpx
+import uvicorn
+
+from fastapi import FastAPI
+
+from service.client import client as client_module
+from service.client.http_pool import close_http_clients, get_http_client
+from service.server.server import ConversationServer
+from state import host_agent_service
+from state.state import AppState
+
+
+PORT = int(os.environ.get('BENCHMARK_PORT', '12999'))
+ROUNDS = 200
+
+
+def start_server() -> uvicorn.Server:
+    app = FastAPI()
+    ConversationServer(app, httpx.AsyncClient())
+    server = uvicorn.Server(
+        uvicorn.Config(app, host='127.0.0.1', port=PORT, log_level='warning')
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+async def measure(label: str) -> list[float]:
+    state = AppState()
+    await host_agent_service.UpdateAppState(state, '')
+    timings = []
+    for _ in range(ROUNDS):
+        # Reset the cursors so every round transfers the full state.
+        state.sync_cursors = {}
+        start = time.perf_counter()
+        await host_agent_service.UpdateAppState(state, '')
+        timings.append((time.perf_counter() - start) * 1000)
+    print(
+        f'{label:<12} median {statistics.median(timings):7.2f} ms'
+        f'  p95 {sorted(timings)[int(ROUNDS * 0.95)]:7.2f} ms'
+    )
+    return timings
+
+
+async def main():
+    host_agent_service.server_url = f'http://127.0.0.1:{PORT}'
+    for _ in range(20):
+        await host_agent_service.CreateConversation()
+
+    opened: list[httpx.AsyncClient] = []
+
+    def fresh_client() -> httpx.AsyncClient:
+        client = httpx.AsyncClient()
+        opened.append(client)
+        return client
+
+    client_module.get_http_client = fresh_client
+    await measure('per-request')
+    for client in opened:
+        await client.aclose()
+
+    client_module.get_http_client = get_http_client
+    await measure('pooled')
+    await close_http_clients()
+
+
+if __name__ == '__main__':
+    server = start_server()
+    try:
+        asyncio.run(main())
+    finally:
+        server.should_exit = True
@@ -1,7 +1,10 @@
+import asyncio
 import json
 import logging
+import os
 
 from collections.abc import AsyncIterable
+from dataclasses import dataclass, field
 
 from a2a.types import (
     SendStreamingMessageSuccessResponse,
@@ -11,6 +14,7 @@ from a2a.types import (
 )
 from a2a_mcp.common import prompts
 from a2a_mcp.common.base_agent import BaseAgent
+from a2a_mcp.common.session_table import SessionTable
 from a2a_mcp.common.utils import init_api_key
 from a2a_mcp.common.workflow import Status, WorkflowGraph, WorkflowNode
 from google import genai
@@ -19,8 +23,35 @@ from google import genai
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class OrchestratorSession:
+    """Workflow state of one conversation (context id)."""
+
+    graph: WorkflowGraph | None = None
+    results: list = field(default_factory=list)
+    travel_context: dict = field(default_factory=dict)
+    query_history: list = field(default_factory=list)
+    # Requests of the same conversation run one after the other
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    def reset(self):
+        self.graph = None
+        self.results = []
+        self.travel_context = {}
+        self.query_history = []
+
+
 class OrchestratorAgent(BaseAgent):
-    """Orchestrator Agent."""
+    """Orchestrator Agent.
+
+    Conversations are independent: each context id has its own
+    OrchestratorSession, kept in an LRU with a time to live.
+
+    Configuration through environment variables:
+      A2A_ORCHESTRATOR_MAX_SESSIONS    conversations kept (default 1000)
+      A2A_ORCHESTRATOR_SESSION_TTL     seconds an idle conversation is kept
+                                       (default 3600)
+    """
 
     def __init__(self):
         init_api_key()
@@ -29,32 +60,68 @@ class OrchestratorAgent(BaseAgent):
             description='Facilitate inter agent communication',
             content_types=['text', 'text/plain'],
         )
-        self.graph = None
-        self.results = []
-        self.travel_context = {}
-        self.query_history = []
-        self.context_id = None
+        self.sessions: SessionTable[OrchestratorSession] = SessionTable(
+            OrchestratorSession,
+            max_sessions=int(
+                os.environ.get('A2A_ORCHESTRATOR_MAX_SESSIONS', '1000')
+            ),
+            ttl=float(os.environ.get('A2A_ORCHESTRATOR_SESSION_TTL', '3600')),
+            busy=lambda session: session.lock.locked(),
+        )
+        self._llm: genai.Client | None = None
+
+    @property
+    def llm(self) -> genai.Client:
+        """Model client shared by every call, created on first use."""
+        if self._llm is None:
+            self._llm = genai.Client()
+        return self._llm
 
-    async def generate_summary(self) -> str:
-        client = genai.Client()
-        response = client.models.generate_content(
+    async def generate_summary(
+        self, session: OrchestratorSession
+    ) -> AsyncIterable[str]:
+        """Stream the summary text as the model generates it."""
+        stream = await self.llm.aio.models.generate_content_stream(
             model='gemini-2.0-flash',
             contents=prompts.SUMMARY_COT_INSTRUCTIONS.replace(
-                '{travel_data}', str(self.results)
+                '{travel_data}', str(session.results)
             ),
             config={'temperature': 0.0},
         )
-        return response.text
+        async for chunk in stream:
+            if chunk.text:
+                yield chunk.text
+
+    async def stream_summary(
+        self, session: OrchestratorSession
+    ) -> AsyncIterable[dict[str, any]]:
+        """Yield the summary chunk by chunk, then the whole text as result."""
+        parts = []
+        async for text in self.generate_summary(session):
+            parts.append(text)
+            yield {
+                'response_type': 'text',
+                'is_task_complete': False,
+                'require_user_input': False,
+                'content': text,
+            }
+        yield {
+            'response_type': 'text',
+            'is_task_complete': True,
+            'require_user_input': False,
+            'content': ''.join(parts),
+        }
 
-    def answer_user_question(self, question) -> str:
+    async def answer_user_question(
+        self, session: OrchestratorSession, question
+    ) -> str:
         try:
-            client = genai.Client()
-            response = client.models.generate_content(
+            response = await self.llm.aio.models.generate_content(
                 model='gemini-2.0-flash',
                 contents=prompts.QA_COT_PROMPT.replace(
-                    '{TRIP_CONTEXT}', str(self.travel_context)
+                    '{TRIP_CONTEXT}', str(session.travel_context)
                 )
-                .replace('{CONVERSATION_HISTORY}', str(self.query_history))
+                .replace('{CONVERSATION_HISTORY}', str(session.query_history))
                 .replace('{TRIP_QUESTION}', question),
                 config={
                     'temperature': 0.0,
@@ -67,7 +134,12 @@ class OrchestratorAgent(BaseAgent):
         return '{"can_answer": "no", "answer": "Cannot answer based on provided context"}'
 
     def set_node_attributes(
-        self, node_id, task_id=None, context_id=None, query=None
+        self,
+        session: OrchestratorSession,
+        node_id,
+        task_id=None,
+        context_id=None,
+        query=None,
     ):
         attr_val = {}
         if task_id:
@@ -77,10 +149,11 @@ class OrchestratorAgent(BaseAgent):
         if query:
             attr_val['query'] = query
 
-        self.graph.set_node_attributes(node_id, attr_val)
+        session.graph.set_node_attributes(node_id, attr_val)
 
     def add_graph_node(
         self,
+        session: OrchestratorSession,
         task_id,
         context_id,
         query: str,
@@ -92,17 +165,14 @@ class OrchestratorAgent(BaseAgent):
         node = WorkflowNode(
             task=query, node_key=node_key, node_label=node_label
         )
-        self.graph.add_node(node)
+        session.graph.add_node(node)
         if node_id:
-            self.graph.add_edge(node_id, node.id)
-        self.set_node_attributes(node.id, task_id, context_id, query)
+            session.graph.add_edge(node_id, node.id)
+        self.set_node_attributes(session, node.id, task_id, context_id, query)
         return node
 
-    def clear_state(self):
-        self.graph = None
-        self.results.clear()
-        self.travel_context.clear()
-        self.query_history.clear()
+    def clear_state(self, session: OrchestratorSession):
+        session.reset()
 
     async def stream(
         self, query, context_id, task_id
@@ -113,17 +183,30 @@ class OrchestratorAgent(BaseAgent):
         )
         if not query:
             raise ValueError('Query cannot be empty')
-        if self.context_id != context_id:
-            # Clear state when the context changes
-            self.clear_state()
-            self.context_id = context_id
+        session = self.sessions.get(context_id)
+        try:
+            async with session.lock:
+                async for item in self._run(
+                    session, query, context_id, task_id
+                ):
+                    yield item
+        finally:
+            self.sessions.touch(context_id)
 
-        self.query_history.append(query)
+    async def _run(
+        self, session: OrchestratorSession, query, context_id, task_id
+    ) -> AsyncIterable[dict[str, any]]:
+        """Run the workflow of one conversation."""
+        session.query_history.append(query)
         start_node_id = None
+        # Set instead of start_node_id when the workflow starts at several
+        # independent nodes
+        start_node_ids = None
         # Graph does not exist, start a new graph with planner node.
-        if not self.graph:
-            self.graph = WorkflowGraph()
+        if not session.graph:
+            session.graph = WorkflowGraph()
             planner_node = self.add_graph_node(
+                session,
                 task_id=task_id,
                 context_id=context_id,
                 query=query,
@@ -132,9 +215,11 @@ class OrchestratorAgent(BaseAgent):
             )
             start_node_id = planner_node.id
         # Paused state is when the agent might need more information.
-        elif self.graph.state == Status.PAUSED:
-            start_node_id = self.graph.paused_node_id
-            self.set_node_attributes(node_id=start_node_id, query=query)
+        elif session.graph.state == Status.PAUSED:
+            start_node_id = session.graph.paused_node_id
+            self.set_node_attributes(
+                session, node_id=start_node_id, query=query
+            )
 
         # This loop can be avoided if the workflow graph is dynamic or
         # is built from the results of the planner when the planner
@@ -142,15 +227,17 @@ class OrchestratorAgent(BaseAgent):
         # TODO: Make the graph dynamically iterable over edges
         while True:
             # Set attributes on the node so we propagate task and context
-            self.set_node_attributes(
-                node_id=start_node_id,
-                task_id=task_id,
-                context_id=context_id,
-            )
+            for node_id in start_node_ids or [start_node_id]:
+                self.set_node_attributes(
+                    session,
+                    node_id=node_id,
+                    task_id=task_id,
+                    context_id=context_id,
+                )
             # Resume workflow, used when the workflow nodes are updated.
             should_resume_workflow = False
-            async for chunk in self.graph.run_workflow(
-                start_node_id=start_node_id
+            async for chunk in session.graph.run_workflow(
+                start_node_id=start_node_id, start_node_ids=start_node_ids
             ):
                 if isinstance(chunk.root, SendStreamingMessageSuccessResponse):
                     # The graph node retured TaskStatusUpdateEvent
@@ -175,16 +262,21 @@ class OrchestratorAgent(BaseAgent):
 
                             try:
                                 answer = json.loads(
-                                    self.answer_user_question(question)
+                                    await self.answer_user_question(
+                                        session, question
+                                    )
                                 )
                                 logger.info(f'Agent Answer {answer}')
                                 if answer['can_answer'] == 'yes':
                                     # Orchestrator can answer on behalf of the user set the query
                                     # Resume workflow from paused state.
                                     query = answer['answer']
-                                    start_node_id = self.graph.paused_node_id
+                                    start_node_id = session.graph.paused_node_id
+                                    start_node_ids = None
                                     self.set_node_attributes(
-                                        node_id=start_node_id, query=query
+                                        session,
+                                        node_id=start_node_id,
+                                        query=query,
                                     )
                                     should_resume_workflow = True
                             except Exception:
@@ -194,32 +286,48 @@ class OrchestratorAgent(BaseAgent):
                     # Store the node and continue.
                     if isinstance(chunk.root.result, TaskArtifactUpdateEvent):
                         artifact = chunk.root.result.artifact
-                        self.results.append(artifact)
+                        session.results.append(artifact)
                         if artifact.name == 'PlannerAgent-result':
                             # Planning agent returned data, update graph.
                             artifact_data = artifact.parts[0].root.data
                             if 'trip_info' in artifact_data:
-                                self.travel_context = artifact_data['trip_info']
+                                session.travel_context = artifact_data['trip_info']
                             logger.info(
                                 f'Updating workflow with {len(artifact_data["tasks"])} task nodes'
                             )
-                            # Define the edges
-                            current_node_id = start_node_id
-                            for idx, task_data in enumerate(
-                                artifact_data['tasks']
-                            ):
+                            # Define the edges, tasks without dependencies
+                            # hang off the planner and run in parallel.
+                            planner_node_id = start_node_id
+                            node_ids = {}
+                            new_node_ids = []
+                            start_node_ids = []
+                            for task_data in artifact_data['tasks']:
+                                depends_on = [
+                                    node_ids[x]
+                                    for x in task_data.get('depends_on') or []
+                                    if x in node_ids
+                                ]
                                 node = self.add_graph_node(
+                                    session,
                                     task_id=task_id,
                                     context_id=context_id,
                                     query=task_data['description'],
-                                    node_id=current_node_id,
+                                    node_id=None
+                                    if depends_on
+                                    else planner_node_id,
                                 )
-                                current_node_id = node.id
-                                # Restart graph from the newly inserted subgraph state
-                                # Start from the new node just created.
-                                if idx == 0:
-                                    should_resume_workflow = True
-                                    start_node_id = node.id
+                                for node_id in depends_on:
+                                    session.graph.add_edge(node_id, node.id)
+                                node_ids[task_data.get('id')] = node.id
+                                new_node_ids.append(node.id)
+                                if not depends_on:
+                                    start_node_ids.append(node.id)
+                            # One find_agent call for all the new tasks
+                            await session.graph.resolve_agents(new_node_ids)
+                            # Restart graph from the newly inserted subgraph
+                            if start_node_ids:
+                                should_resume_workflow = True
+                                start_node_id = None
                         else:
                             # Not planner but artifacts from other tasks,
                             # continue to the next node in the workflow.
@@ -240,15 +348,11 @@ class OrchestratorAgent(BaseAgent):
             else:
                 # Readable logs
                 logger.info('Restarting workflow loop.')
-        if self.graph.state == Status.COMPLETED:
+        if session.graph.state == Status.COMPLETED:
             # All individual actions complete, now generate the summary
-            logger.info(f'Generating summary for {len(self.results)} results')
-            summary = await self.generate_summary()
-            self.clear_state()
-            logger.info(f'Summary: {summary}')
-            yield {
-                'response_type': 'text',
-                'is_task_complete': True,
-                'require_user_input': False,
-                'content': summary,
-            }
+            logger.info(f'Generating summary for {len(session.results)} results')
+            async for item in self.stream_summary(session):
+                if item['is_task_complete']:
+                    self.clear_state(session)
+                    logger.info(f'Summary: {item["content"]}')
+                yield item
@@ -0,0 +1,57 @@
+"""Shared, long-lived httpx client for the workflow agents.
+
+httpx.AsyncClient connections are bound to the event loop that opened them,
+so one client is kept per running loop. Every workflow node of that loop
+reuses its keep-alive connections to the remote agents.
+
+Configuration through environment variables:
+  A2A_MCP_HTTP_MAX_CONNECTIONS    maximum open connections (default 100)
+  A2A_MCP_HTTP_MAX_KEEPALIVE      idle keep-alive connections (default 20)
+  A2A_MCP_HTTP_TIMEOUT            request timeout in seconds (default 5)
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+
+import httpx
+
+
+# event loop -> shared client of that loop
+_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def create_http_client() -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=int(
+            os.environ.get('A2A_MCP_HTTP_MAX_CONNECTIONS', '100')
+        ),
+        max_keepalive_connections=int(
+            os.environ.get('A2A_MCP_HTTP_MAX_KEEPALIVE', '20')
+        ),
+    )
+    return httpx.AsyncClient(
+        limits=limits,
+        timeout=float(os.environ.get('A2A_MCP_HTTP_TIMEOUT', '5')),
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client of the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _clients.get(loop)
+        if client is None or client.is_closed:
+            client = create_http_client()
+            _clients[loop] = client
+        return client
+
+
+async def close_http_client():
+    """Close the client of the running event loop."""
+    with _lock:
+        client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None and not client.is_closed:
+        await client.aclose()
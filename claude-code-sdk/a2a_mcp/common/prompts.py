@@ -8,6 +8,11 @@ You will include 3 tasks in your plan, based on the user request.
 2. Hotel Booking.
 3. Car Rental Booking.
 
+Tasks that do not depend on each other run in parallel. For each task, list in
+'depends_on' the ids of the earlier tasks that must complete before it can start,
+for example a car rental picked up at the arrival airport depends on the airfare.
+Leave 'depends_on' empty for tasks that can start right away.
+
 Always use chain-of-thought reasoning before responding to track where you are 
 in the decision tree and determine the next appropriate question.
 
@@ -102,17 +107,20 @@ Your output should follow this example format. DO NOT add any thing else apart f
         {
             'id': 1,
             'description': 'Book round-trip economy class air tickets from San Francisco (SFO) to London (LHR) for the dates May 12, 2025 to May 20, 2025.',
-            'status': 'pending'
+            'status': 'pending',
+            'depends_on': []
         }, 
         {
             'id': 2,
             'description': 'Book a suite room at a hotel in London for checkin date May 12, 2025 and checkout date May 20th 2025',
-            'status': 'pending'
+            'status': 'pending',
+            'depends_on': []
         },
         {
             'id': 3,
             'description': 'Book an SUV rental car in London with a pickup on May 12, 2025 and return on May 20, 2025', 
-            'status': 'pending'
+            'status': 'pending',
+            'depends_on': [1]
         }
     ]
 }
@@ -0,0 +1,84 @@
+"""Per-context state of a long-lived agent.
+
+A SessionTable maps a context id to the state of that conversation, so
+one agent process serves many independent conversations at once. Idle
+sessions expire after a TTL, and past max_sessions the least recently used
+ones are dropped. A session reported busy is never dropped, its
+conversation is still running.
+"""
+
+import time
+
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Generic, TypeVar
+
+
+T = TypeVar('T')
+
+
+class SessionTable(Generic[T]):
+    """LRU of sessions with a time to live."""
+
+    def __init__(
+        self,
+        factory: Callable[[], T],
+        max_sessions: int = 1000,
+        ttl: float = 3600.0,
+        busy: Callable[[T], bool] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._factory = factory
+        self._max_sessions = max_sessions
+        self._ttl = ttl
+        self._busy = busy or (lambda session: False)
+        self._clock = clock
+        # key -> (session, last use)
+        self._sessions: OrderedDict[Hashable, tuple[T, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._sessions
+
+    def get(self, key: Hashable) -> T:
+        """The session of key, created when missing or expired."""
+        now = self._clock()
+        self._expire(now)
+        entry = self._sessions.pop(key, None)
+        session = entry[0] if entry is not None else self._factory()
+        self._sessions[key] = (session, now)
+        self._shrink()
+        return session
+
+    def touch(self, key: Hashable):
+        """Mark the session of key as used now, if it is still there."""
+        entry = self._sessions.pop(key, None)
+        if entry is not None:
+            self._sessions[key] = (entry[0], self._clock())
+
+    def pop(self, key: Hashable) -> T | None:
+        entry = self._sessions.pop(key, None)
+        return entry[0] if entry is not None else None
+
+    def _expire(self, now: float):
+        expired = []
+        # Ordered by last use, stop at the first live session
+        for key, (session, last_use) in self._sessions.items():
+            if now - last_use <= self._ttl:
+                break
+            if not self._busy(session):
+                expired.append(key)
+        for key in expired:
+            del self._sessions[key]
+
+    def _shrink(self):
+        if len(self._sessions) <= self._max_sessions:
+            return
+        # Oldest first, the entry just used is last
+        for key, (session, _) in list(self._sessions.items())[:-1]:
+            if not self._busy(session):
+                del self._sessions[key]
+                if len(self._sessions) <= self._max_sessions:
+                    return
@@ -34,6 +34,10 @@ class PlannerTask(BaseModel):
         ]
         | None
     ) = Field(description='Status of the task', default='input_required')
+    depends_on: list[int] = Field(
+        description='Ids of the tasks that must complete before this one.',
+        default_factory=list,
+    )
 
 
 class TripInfo(BaseModel):
@@ -97,7 +101,7 @@ class TaskList(BaseModel):
     trip_info: TripInfo | None = Field(description='Trip information')
 
     tasks: list[PlannerTask] = Field(
-        description='A list of tasks to be executed sequentially.'
+        description='A list of tasks, tasks without dependencies run in parallel.'
     )
 
 
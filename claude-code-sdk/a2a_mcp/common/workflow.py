@@ -1,7 +1,10 @@
+import asyncio
 import json
 import logging
+import os
 import uuid
 
+from collections import deque
 from collections.abc import AsyncIterable
 from enum import Enum
 from uuid import uuid4
@@ -14,17 +17,25 @@ from a2a.types import (
     AgentCard,
     MessageSendParams,
     SendStreamingMessageRequest,
+    SendStreamingMessageResponse,
     SendStreamingMessageSuccessResponse,
     TaskArtifactUpdateEvent,
     TaskState,
+    TaskStatus,
     TaskStatusUpdateEvent,
 )
+from a2a.utils import new_agent_text_message
+from a2a_mcp.common.http_pool import get_http_client
 from a2a_mcp.common.utils import get_mcp_server_config
 from a2a_mcp.mcp import client
+from a2a_mcp.mcp.session_pool import get_session_pool
 
 
 logger = logging.getLogger(__name__)
 
+# Queued by a node task once its stream is exhausted
+_NODE_DONE = object()
+
 
 class Status(Enum):
     """Represents the status of a workflow and its associated node."""
@@ -33,6 +44,7 @@ class Status(Enum):
     RUNNING = 'RUNNING'
     COMPLETED = 'COMPLETED'
     PAUSED = 'PAUSED'
+    FAILED = 'FAILED'
     INITIALIZED = 'INITIALIZED'
 
 
@@ -57,78 +69,103 @@ class WorkflowNode:
         self.task = task
         self.results = None
         self.state = Status.READY
+        # Resolved ahead of time by WorkflowGraph.resolve_agents
+        self.agent_card: AgentCard | None = None
+        # Set when that lookup found no agent, the node then fails without
+        # asking find_agent again
+        self.agent_missing = False
 
     async def get_planner_resource(self) -> AgentCard | None:
         logger.info(f'Getting resource for node {self.id}')
         config = get_mcp_server_config()
-        async with client.init_session(
-            config.host, config.port, config.transport
-        ) as session:
-            response = await client.find_resource(
-                session, 'resource://agent_cards/planner_agent'
-            )
-            data = json.loads(response.contents[0].text)
-            return AgentCard(**data['agent_card'][0])
+        pool = get_session_pool(config.host, config.port, config.transport)
+        response = await pool.call(
+            client.find_resource, 'resource://agent_cards/planner_agent'
+        )
+        data = json.loads(response.contents[0].text)
+        return AgentCard(**data['agent_card'][0])
 
     async def find_agent_for_task(self) -> AgentCard | None:
         logger.info(f'Find agent for task - {self.task}')
         config = get_mcp_server_config()
-        async with client.init_session(
-            config.host, config.port, config.transport
-        ) as session:
-            result = await client.find_agent(session, self.task)
-            agent_card_json = json.loads(result.content[0].text)
-            logger.debug(f'Found agent {agent_card_json} for task {self.task}')
-            return AgentCard(**agent_card_json)
+        pool = get_session_pool(config.host, config.port, config.transport)
+        result = await pool.call(client.find_agent, self.task)
+        data = json.loads(result.content[0].text)
+        if 'agent_card' not in data:
+            raise ValueError(
+                f'No agent found for task {self.task}: {data.get("error")}'
+            )
+        logger.debug(f'Found agent {data["uri"]} for task {self.task}')
+        return AgentCard(**data['agent_card'])
 
     async def run_node(
         self,
         query: str,
         task_id: str,
         context_id: str,
+        httpx_client: httpx.AsyncClient | None = None,
     ) -> AsyncIterable[dict[str, any]]:
         logger.info(f'Executing node {self.id}')
-        agent_card = None
-        if self.node_key == 'planner':
+        agent_card = self.agent_card
+        if agent_card is None and self.node_key == 'planner':
             agent_card = await self.get_planner_resource()
-        else:
+        elif agent_card is None and self.agent_missing:
+            raise LookupError(f'No agent found for task {self.task}')
+        elif agent_card is None:
             agent_card = await self.find_agent_for_task()
-        async with httpx.AsyncClient() as httpx_client:
-            client = A2AClient(httpx_client, agent_card)
-
-            payload: dict[str, any] = {
-                'message': {
-                    'role': 'user',
-                    'parts': [{'kind': 'text', 'text': query}],
-                    'message_id': uuid4().hex,
-                    'task_id': task_id,
-                    'context_id': context_id,
-                },
-            }
-            request = SendStreamingMessageRequest(
-                id=str(uuid4()), params=MessageSendParams(**payload)
-            )
-            response_stream = client.send_message_streaming(request)
-            async for chunk in response_stream:
-                # Save the artifact as a result of the node
-                if isinstance(
-                    chunk.root, SendStreamingMessageSuccessResponse
-                ) and (isinstance(chunk.root.result, TaskArtifactUpdateEvent)):
-                    artifact = chunk.root.result.artifact
-                    self.results = artifact
-                yield chunk
+        # The shared client keeps connections to the agents alive across nodes
+        a2a_client = A2AClient(httpx_client or get_http_client(), agent_card)
+
+        payload: dict[str, any] = {
+            'message': {
+                'role': 'user',
+                'parts': [{'kind': 'text', 'text': query}],
+                'message_id': uuid4().hex,
+                'task_id': task_id,
+                'context_id': context_id,
+            },
+        }
+        request = SendStreamingMessageRequest(
+            id=str(uuid4()), params=MessageSendParams(**payload)
+        )
+        response_stream = a2a_client.send_message_streaming(request)
+        async for chunk in response_stream:
+            # Save the artifact as a result of the node
+            if isinstance(
+                chunk.root, SendStreamingMessageSuccessResponse
+            ) and (isinstance(chunk.root.result, TaskArtifactUpdateEvent)):
+                artifact = chunk.root.result.artifact
+                self.results = artifact
+            yield chunk
 
 
 class WorkflowGraph:
     """Represents a graph of workflow nodes."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        httpx_client: httpx.AsyncClient | None = None,
+        max_parallelism: int | None = None,
+    ):
         self.graph = nx.DiGraph()
+        # Nodes running at the same time in run_workflow
+        self.max_parallelism = max_parallelism or int(
+            os.environ.get('A2A_WORKFLOW_MAX_PARALLELISM', '4')
+        )
+        # Shared by the nodes, defaults to the client of the running loop
+        self.httpx_client = httpx_client
         self.nodes = {}
         self.latest_node = None
         self.node_type = None
         self.state = Status.INITIALIZED
         self.paused_node_id = None
+        # Nodes of the last run that did not complete, other than the paused
+        # one. Resuming from the paused node runs them too.
+        self.interrupted_node_ids: list[str] = []
+        # Questions of nodes that asked for input while another node was
+        # already paused, by node id. Each is asked in turn once the pause
+        # before it is answered, those nodes do not run again until then.
+        self.pending_inputs: dict[str, SendStreamingMessageResponse] = {}
 
     def add_node(self, node) -> None:
         logger.info(f'Adding node {node.id}')
@@ -142,11 +179,76 @@ class WorkflowGraph:
 
         self.graph.add_edge(from_node_id, to_node_id)
 
+    async def resolve_agents(self, node_ids: list[str] | None = None) -> int:
+        """Find the agents of many task nodes in one find_agent call.
+
+        Nodes nothing scored high enough for are marked agent_missing and
+        fail when they run. When the call itself fails the nodes look
+        their agent up themselves.
+        Returns the number of nodes resolved.
+        """
+        if node_ids is None:
+            node_ids = list(self.nodes)
+        nodes = [
+            self.nodes[node_id]
+            for node_id in node_ids
+            if self.nodes[node_id].agent_card is None
+            and self.nodes[node_id].node_key != 'planner'
+        ]
+        if not nodes:
+            return 0
+        config = get_mcp_server_config()
+        pool = get_session_pool(config.host, config.port, config.transport)
+        try:
+            result = await pool.call(
+                client.find_agents, [node.task for node in nodes]
+            )
+            results = json.loads(result.content[0].text)['results']
+        except Exception as e:
+            logger.warning(f'Batch agent lookup failed: {e}')
+            return 0
+        resolved = 0
+        for node, entry in zip(nodes, results):
+            if not entry['candidates']:
+                node.agent_missing = True
+                continue
+            try:
+                node.agent_card = AgentCard(
+                    **entry['candidates'][0]['agent_card']
+                )
+            except ValueError as e:
+                logger.warning(f'Invalid agent card for node {node.id}: {e}')
+                continue
+            resolved += 1
+        logger.info(f'Resolved agents for {resolved} of {len(nodes)} nodes')
+        return resolved
+
     async def run_workflow(
-        self, start_node_id: str = None
+        self,
+        start_node_id: str = None,
+        start_node_ids: list[str] | None = None,
     ) -> AsyncIterable[dict[str, any]]:
+        """Run the sub graph reachable from the start nodes.
+
+        Every node whose predecessors in the sub graph are complete runs
+        concurrently with the others, up to max_parallelism nodes at once.
+        The chunks of all running nodes are merged into one stream, the
+        events carry the id of their node in metadata['workflow_node_id'].
+
+        Once a node asks for input the graph is PAUSED: no new node is
+        started and the chunks of the other running nodes are still
+        yielded until they finish. Resuming from the paused node also runs
+        the nodes that the pause kept from running. A node asking for input
+        while the graph is paused keeps its question in pending_inputs, the
+        run resuming the earlier pause ends by pausing on it.
+
+        A node that raises is FAILED and reported by a failed status chunk,
+        the nodes that depend on it do not run and the others finish.
+        """
         logger.info('Executing workflow graph')
-        if not start_node_id or start_node_id not in self.nodes:
+        if start_node_ids:
+            start_nodes = [n for n in start_node_ids if n in self.nodes]
+        elif not start_node_id or start_node_id not in self.nodes:
             start_nodes = [n for n, d in self.graph.in_degree() if d == 0]
         else:
             start_nodes = [self.nodes[start_node_id].id]
@@ -156,45 +258,160 @@ class WorkflowGraph:
         for node_id in start_nodes:
             applicable_graph.add(node_id)
             applicable_graph.update(nx.descendants(self.graph, node_id))
+        if start_node_id and start_node_id == self.paused_node_id:
+            applicable_graph.update(self.interrupted_node_ids)
 
         complete_graph = list(nx.topological_sort(self.graph))
         sub_graph = [n for n in complete_graph if n in applicable_graph]
         logger.info(f'Sub graph {sub_graph} size {len(sub_graph)}')
+        # Number of predecessors in the sub graph each node still waits for
+        waiting = {
+            n: sum(
+                1 for p in self.graph.predecessors(n) if p in applicable_graph
+            )
+            for n in sub_graph
+        }
+        ready = deque(n for n in sub_graph if not waiting[n])
+        chunks: asyncio.Queue = asyncio.Queue(maxsize=64)
+        running: dict[str, asyncio.Task] = {}
+        httpx_client = self.httpx_client or get_http_client()
         self.state = Status.RUNNING
-        # Alternative is to loop over all nodes, but we only need the connected nodes.
-        for node_id in sub_graph:
-            node = self.nodes[node_id]
-            node.state = Status.RUNNING
-            query = self.graph.nodes[node_id].get('query')
-            task_id = self.graph.nodes[node_id].get('task_id')
-            context_id = self.graph.nodes[node_id].get('context_id')
-            async for chunk in node.run_node(query, task_id, context_id):
+        try:
+            while ready or running:
+                while (
+                    ready
+                    and len(running) < self.max_parallelism
+                    and self.state != Status.PAUSED
+                ):
+                    node_id = ready.popleft()
+                    if node_id in self.pending_inputs:
+                        # Runs again once its question is answered
+                        continue
+                    running[node_id] = asyncio.create_task(
+                        self._drive_node(node_id, httpx_client, chunks)
+                    )
+                if not running:
+                    break
+                node_id, chunk = await chunks.get()
+                node = self.nodes[node_id]
+                if chunk is _NODE_DONE:
+                    running.pop(node_id)
+                    if node.state == Status.RUNNING:
+                        node.state = Status.COMPLETED
+                        for successor in self.graph.successors(node_id):
+                            if successor in waiting:
+                                waiting[successor] -= 1
+                                if not waiting[successor]:
+                                    ready.append(successor)
+                    continue
+                if isinstance(chunk, BaseException):
+                    # Only this node fails: its successors never run and
+                    # the other nodes finish.
+                    running.pop(node_id)
+                    node.state = Status.FAILED
+                    logger.warning(f'Node {node_id} failed: {chunk}')
+                    chunk = self._failed_chunk(node_id, chunk)
                 # When the workflow node is paused, do not yeild any chunks
-                # but, let the loop complete.
-                if node.state != Status.PAUSED:
-                    if isinstance(
-                        chunk.root, SendStreamingMessageSuccessResponse
-                    ) and (
-                        isinstance(chunk.root.result, TaskStatusUpdateEvent)
+                # but, let the node complete.
+                if node.state == Status.PAUSED:
+                    continue
+                if isinstance(
+                    chunk.root, SendStreamingMessageSuccessResponse
+                ) and (isinstance(chunk.root.result, TaskStatusUpdateEvent)):
+                    task_status_event = chunk.root.result
+                    context_id = task_status_event.context_id
+                    if (
+                        task_status_event.status.state
+                        == TaskState.input_required
+                        and context_id
                     ):
-                        task_status_event = chunk.root.result
-                        context_id = task_status_event.context_id
-                        if (
-                            task_status_event.status.state
-                            == TaskState.input_required
-                            and context_id
-                        ):
-                            node.state = Status.PAUSED
+                        node.state = Status.PAUSED
+                        if self.state != Status.PAUSED:
                             self.state = Status.PAUSED
                             self.paused_node_id = node.id
-                    yield chunk
-            if self.state == Status.PAUSED:
-                break
-            if node.state == Status.RUNNING:
-                node.state = Status.COMPLETED
+                        else:
+                            # Another node already waits for the user, this
+                            # question is asked after that one.
+                            self.pending_inputs[node_id] = chunk
+                if isinstance(chunk.root, SendStreamingMessageSuccessResponse):
+                    event = chunk.root.result
+                    event.metadata = {
+                        **(event.metadata or {}),
+                        'workflow_node_id': node_id,
+                    }
+                if node_id in self.pending_inputs:
+                    continue
+                yield chunk
+            if self.state != Status.PAUSED and self.pending_inputs:
+                # The earlier pause was answered, ask the next question
+                node_id = next(iter(self.pending_inputs))
+                self.state = Status.PAUSED
+                self.paused_node_id = node_id
+                yield self.pending_inputs.pop(node_id)
+        finally:
+            # Also recorded when the generator is closed or cancelled, the
+            # nodes cancelled below run again on resume.
+            self.interrupted_node_ids = [
+                n
+                for n in sub_graph
+                if self.nodes[n].state != Status.COMPLETED
+                and n != self.paused_node_id
+            ]
+            for task in running.values():
+                task.cancel()
+            if running:
+                await asyncio.gather(*running.values(), return_exceptions=True)
         if self.state == Status.RUNNING:
             self.state = Status.COMPLETED
 
+    def _failed_chunk(
+        self, node_id: str, error: Exception
+    ) -> SendStreamingMessageResponse:
+        """Status chunk reporting the task of a node that failed."""
+        task_id = self.graph.nodes[node_id].get('task_id') or node_id
+        context_id = self.graph.nodes[node_id].get('context_id') or ''
+        text = f'Task "{self.nodes[node_id].task}" failed: {error}'
+        return SendStreamingMessageResponse(
+            root=SendStreamingMessageSuccessResponse(
+                id=str(uuid4()),
+                result=TaskStatusUpdateEvent(
+                    task_id=task_id,
+                    context_id=context_id,
+                    status=TaskStatus(
+                        state=TaskState.failed,
+                        message=new_agent_text_message(
+                            text, context_id, task_id
+                        ),
+                    ),
+                    # Not final, the other nodes still stream on the task
+                    final=False,
+                ),
+            )
+        )
+
+    async def _drive_node(
+        self,
+        node_id: str,
+        httpx_client: httpx.AsyncClient,
+        chunks: asyncio.Queue,
+    ):
+        node = self.nodes[node_id]
+        node.state = Status.RUNNING
+        query = self.graph.nodes[node_id].get('query')
+        task_id = self.graph.nodes[node_id].get('task_id')
+        context_id = self.graph.nodes[node_id].get('context_id')
+        try:
+            async for chunk in node.run_node(
+                query, task_id, context_id, httpx_client
+            ):
+                await chunks.put((node_id, chunk))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await chunks.put((node_id, e))
+            return
+        await chunks.put((node_id, _NODE_DONE))
+
     def set_node_attribute(self, node_id, attribute, value):
         nx.set_node_attributes(self.graph, {node_id: value}, attribute)
 
@@ -0,0 +1,226 @@
+"""Prebuilt search matrix over the agent cards.
+
+A CardIndex is an immutable snapshot: the raw embedding of every card,
+weighted by the inverse document frequency of each hashed feature over the
+card corpus and L2 normalized, stacked into one matrix. A lookup is one
+matrix-vector product and a partial sort, the scores are cosine
+similarities in [-1, 1].
+
+The raw card embeddings are kept in an EmbeddingCache under the hash of
+each card's JSON, so a restart only embeds the cards that changed. A
+rebuild after a card change also reuses the rows of the previous index.
+
+Configuration through environment variables:
+  A2A_MCP_FIND_AGENT_MIN_SCORE    default minimum cosine score of a
+                                  find_agent candidate (default 0.05)
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+
+from typing import Any
+
+import numpy as np
+
+from a2a_mcp.mcp.embedding_cache import EmbeddingCache
+from a2a_mcp.mcp.embeddings import EmbeddingService, card_text
+
+
+logger = logging.getLogger(__name__)
+
+
+def card_hash(card: dict[str, Any]) -> str:
+    return hashlib.sha256(
+        json.dumps(card, sort_keys=True).encode('utf-8')
+    ).hexdigest()
+
+
+def configured_min_score() -> float:
+    return float(os.environ.get('A2A_MCP_FIND_AGENT_MIN_SCORE', '0.05'))
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class CardIndex:
+    """Cosine search over a fixed set of agent cards."""
+
+    def __init__(
+        self,
+        uris: list[str],
+        cards: list[dict[str, Any]],
+        vectors: np.ndarray,
+        hashes: list[str] | None = None,
+    ):
+        self.uris = list(uris)
+        self.cards = list(cards)
+        if hashes is None:
+            hashes = [card_hash(card) for card in self.cards]
+        # Content hash of every card, used to reuse rows on rebuilds
+        self.hashes = list(hashes)
+        # Raw embeddings, one row per card
+        self.vectors = vectors
+        n = len(self.cards)
+        document_frequency = np.count_nonzero(vectors, axis=0)
+        self.idf = (
+            np.log((1.0 + n) / (1.0 + document_frequency)) + 1.0
+        ).astype(np.float32)
+        self.matrix = _normalize_rows(vectors * self.idf).astype(np.float32)
+
+    def __len__(self) -> int:
+        return len(self.cards)
+
+    def query_vector(self, embedding: np.ndarray) -> np.ndarray:
+        """Weight and normalize a raw embedding like the card rows."""
+        return _normalize_rows(embedding * self.idf)
+
+    def search(
+        self, embedding: np.ndarray, k: int = 1, min_score: float | None = None
+    ) -> list[tuple[int, float]]:
+        """The k best cards for a raw query embedding, best first."""
+        return self.search_many(embedding[np.newaxis], k, min_score)[0]
+
+    def search_many(
+        self,
+        embeddings: np.ndarray,
+        k: int = 1,
+        min_score: float | None = None,
+    ) -> list[list[tuple[int, float]]]:
+        """Ranked (card, score) candidates for each row of raw embeddings.
+
+        All queries are scored with one matrix product. Candidates scoring
+        below min_score are left out, so a query may get none.
+        """
+        if not len(self) or not len(embeddings) or k < 1:
+            return [[] for _ in range(len(embeddings))]
+        scores = self.query_vector(embeddings) @ self.matrix.T
+        k = min(k, len(self))
+        if k < len(self):
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(len(self)), scores.shape)
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind='stable')
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        return [
+            [
+                (int(i), float(score))
+                for i, score in zip(row, row_scores)
+                if min_score is None or score >= min_score
+            ]
+            for row, row_scores in zip(top, top_scores)
+        ]
+
+
+async def build_card_index(
+    uris: list[str],
+    cards: list[dict[str, Any]],
+    embeddings: EmbeddingService,
+    cache: EmbeddingCache | None = None,
+    previous: CardIndex | None = None,
+) -> CardIndex:
+    """Build the index, embedding only the cards missing from the cache.
+
+    Cards already in the previous index keep their row.
+    """
+    hashes = [card_hash(card) for card in cards]
+    vectors = np.zeros((len(cards), embeddings.dim), dtype=np.float32)
+    missing = list(range(len(cards)))
+    if previous is not None and previous.vectors.shape[1] == embeddings.dim:
+        rows = {h: row for row, h in enumerate(previous.hashes)}
+        missing = [i for i in range(len(cards)) if hashes[i] not in rows]
+        reused = [i for i in range(len(cards)) if hashes[i] in rows]
+        vectors[reused] = previous.vectors[[rows[hashes[i]] for i in reused]]
+    if cache is not None and missing:
+        cached, still_missing = await asyncio.to_thread(
+            cache.get_many, [hashes[i] for i in missing]
+        )
+        vectors[missing] = cached
+        missing = [missing[i] for i in still_missing]
+    if missing:
+        logger.info(f'Embedding {len(missing)} of {len(cards)} agent cards')
+        vectors[missing] = await embeddings.embed_many(
+            [card_text(cards[i]) for i in missing]
+        )
+        if cache is not None:
+            await asyncio.to_thread(
+                cache.put_many, [hashes[i] for i in missing], vectors[missing]
+            )
+    if cache is not None:
+        # Rows of removed or edited cards are dropped
+        await asyncio.to_thread(cache.retain, hashes)
+    return await asyncio.to_thread(CardIndex, uris, cards, vectors, hashes)
+
+
+async def rank_agents(
+    index: CardIndex,
+    embeddings: EmbeddingService,
+    queries: list[str],
+    k: int = 1,
+    min_score: float | None = None,
+) -> list[list[dict[str, Any]]]:
+    """find_agent candidates for each query, best first."""
+    if not queries:
+        return []
+    if min_score is None:
+        min_score = configured_min_score()
+    matrix = np.stack([await embeddings.embed(q) for q in queries])
+    return [
+        [
+            {
+                'agent_card': index.cards[i],
+                'confidence': score,
+                'uri': index.uris[i],
+            }
+            for i, score in matches
+        ]
+        for matches in index.search_many(matrix, k, min_score)
+    ]
+
+
+async def find_agent_response(
+    index: CardIndex,
+    embeddings: EmbeddingService,
+    query: str = '',
+    queries: list[str] | None = None,
+    k: int = 1,
+    min_score: float | None = None,
+) -> dict[str, Any]:
+    """Response of the find_agent tool, shared by the MCP servers.
+
+    A single query answers with its best card at the top level and the
+    ranked 'candidates', or an error when none scores above min_score. A
+    list of queries answers with one entry per query in 'results'.
+    """
+    ranked = await rank_agents(
+        index,
+        embeddings,
+        list(queries) if queries is not None else [query],
+        k,
+        min_score,
+    )
+    if queries is not None:
+        return {
+            'results': [
+                {'query': q, 'candidates': candidates}
+                for q, candidates in zip(queries, ranked)
+            ]
+        }
+    candidates = ranked[0]
+    if not candidates:
+        return {
+            'error': f'Nenhum agente adequado para: {query}',
+            'candidates': [],
+        }
+    logger.debug(
+        f'Best match for "{query}": {candidates[0]["uri"]}, '
+        f'score {candidates[0]["confidence"]:.3f}'
+    )
+    return {**candidates[0], 'candidates': candidates}
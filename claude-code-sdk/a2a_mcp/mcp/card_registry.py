@@ -0,0 +1,118 @@
+"""Typed lookup tables over the agent cards for the MCP resources.
+
+A CardRegistry is an immutable snapshot built once per card set: entries by
+URI stem, an inverted index from lowercase accent-folded keywords (name,
+URI stem, capabilities, skill names and tags) to entries, and the JSON
+response of every entry serialized up front. Resource reads are dict
+lookups, nothing is serialized per request. A changed card directory gets a
+new registry, which takes the entries of unchanged cards from the previous
+one instead of serializing them again.
+"""
+
+import json
+import re
+
+from dataclasses import dataclass
+from typing import Any
+
+from a2a_mcp.mcp.embeddings import normalize_text
+
+
+AGENT_CARD_URI_PREFIX = 'resource://agent_cards/'
+
+_WORD = re.compile(r'\w+')
+
+
+def keywords(text: str) -> list[str]:
+    return _WORD.findall(normalize_text(text))
+
+
+def card_keywords(stem: str, card: dict[str, Any]) -> set[str]:
+    fields = [stem, str(card.get('name', ''))]
+    capabilities = card.get('capabilities')
+    if isinstance(capabilities, list):
+        fields.extend(str(x) for x in capabilities)
+    for skill in card.get('skills') or []:
+        if isinstance(skill, dict):
+            fields.append(str(skill.get('name', '')))
+            fields.extend(str(x) for x in skill.get('tags') or [])
+    return {word for field in fields for word in keywords(field)}
+
+
+@dataclass(frozen=True)
+class CardEntry:
+    uri: str
+    stem: str
+    card: dict[str, Any]
+    # Serialized resource response
+    resource_json: str
+    # Lowercase JSON of the card, for substring fallbacks
+    search_text: str
+
+
+class CardRegistry:
+    """Agent cards by URI stem and keyword."""
+
+    def __init__(
+        self,
+        uris: list[str],
+        cards: list[dict[str, Any]],
+        extra: dict[str, Any] | None = None,
+        previous: 'CardRegistry | None' = None,
+    ):
+        self._extra = dict(extra or {})
+        reusable = (
+            previous.by_stem
+            if previous is not None and previous._extra == self._extra
+            else {}
+        )
+        self.entries: list[CardEntry] = []
+        self.by_stem: dict[str, CardEntry] = {}
+        self.by_keyword: dict[str, list[CardEntry]] = {}
+        for uri, card in zip(uris, cards):
+            stem = uri.removeprefix(AGENT_CARD_URI_PREFIX)
+            entry = reusable.get(stem)
+            if entry is None or entry.uri != uri or entry.card is not card:
+                entry = CardEntry(
+                    uri=uri,
+                    stem=stem,
+                    card=card,
+                    resource_json=self.response_json([card]),
+                    search_text=json.dumps(card).lower(),
+                )
+            self.entries.append(entry)
+            self.by_stem[stem] = entry
+            for word in card_keywords(stem, card):
+                self.by_keyword.setdefault(word, []).append(entry)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def response_json(self, cards: list[dict[str, Any]]) -> str:
+        return json.dumps({'agent_card': cards, **self._extra})
+
+    def get(self, stem: str) -> CardEntry | None:
+        return self.by_stem.get(stem)
+
+    def find(self, text: str) -> list[CardEntry]:
+        """Entries holding every keyword of text, in card order."""
+        words = keywords(text)
+        if not words:
+            return []
+        postings = [self.by_keyword.get(word, []) for word in words]
+        postings.sort(key=len)
+        common = set(map(id, postings[0]))
+        for posting in postings[1:]:
+            common &= set(map(id, posting))
+        return [entry for entry in postings[0] if id(entry) in common]
+
+    def find_first(self, text: str) -> CardEntry | None:
+        """Best keyword match, falling back to a substring of the card JSON."""
+        matches = self.find(text)
+        if matches:
+            return matches[0]
+        needle = text.lower()
+        for entry in self.entries:
+            if needle in entry.search_text:
+                return entry
+        return None
@@ -0,0 +1,254 @@
+"""Hot reload of the agent card directory.
+
+The watcher keeps the current CardCatalog, the search index and the
+resource registry of one card set, behind a single attribute. A refresh
+stats the directory, parses only the files whose mtime or size changed,
+builds the next index and registry from the previous ones (unchanged cards
+keep their embedding row and their serialized response) and then swaps the
+catalog in one assignment. Readers take the catalog once per request and
+never see a half-built index.
+
+Changes are picked up with watchfiles when it is installed, otherwise by
+polling the directory. With watchfiles the directory is still rescanned
+every RESCAN_SECONDS, for events missed while the watch was starting.
+
+Configuration through environment variables:
+  A2A_MCP_CARD_POLL_INTERVAL    seconds between polls (default 2, 'off'
+                                disables reloading)
+"""
+
+import asyncio
+import json
+import logging
+import os
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from a2a_mcp.mcp.card_index import CardIndex, build_card_index
+from a2a_mcp.mcp.card_registry import AGENT_CARD_URI_PREFIX, CardRegistry
+from a2a_mcp.mcp.embedding_cache import EmbeddingCache
+from a2a_mcp.mcp.embeddings import EmbeddingService
+
+
+try:
+    import watchfiles
+except ImportError:
+    watchfiles = None
+
+
+logger = logging.getLogger(__name__)
+
+RESCAN_SECONDS = 30
+
+
+def configured_poll_interval() -> float | None:
+    value = os.environ.get('A2A_MCP_CARD_POLL_INTERVAL', '2')
+    if value.lower() == 'off':
+        return None
+    return float(value)
+
+
+@dataclass(frozen=True)
+class CardFile:
+    mtime_ns: int
+    size: int
+    uri: str
+    card: dict[str, Any]
+
+
+@dataclass(frozen=True)
+class CardCatalog:
+    index: CardIndex
+    registry: CardRegistry
+    # file name -> parsed card
+    files: dict[str, CardFile] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+
+def _scan(directory: Path) -> dict[str, tuple[int, int]]:
+    """File name -> (mtime_ns, size) of the JSON files of directory."""
+    stats = {}
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name.lower().endswith('.json') and entry.is_file():
+                    stat = entry.stat()
+                    stats[entry.name] = (stat.st_mtime_ns, stat.st_size)
+    except FileNotFoundError:
+        logger.error(f'Agent card directory not found: {directory}')
+    return stats
+
+
+def _read_cards(
+    directory: Path, names: list[str]
+) -> dict[str, dict[str, Any] | None]:
+    cards = {}
+    for name in names:
+        try:
+            with (directory / name).open('r', encoding='utf-8') as f:
+                cards[name] = json.load(f)
+        except Exception as e:
+            logger.error(f'Error reading agent card {name}: {e}')
+            cards[name] = None
+    return cards
+
+
+class CardDirectoryWatcher:
+    """Keeps a CardCatalog in sync with a directory of agent card files."""
+
+    def __init__(
+        self,
+        directory: str | Path,
+        embeddings: EmbeddingService,
+        cache: EmbeddingCache | None = None,
+        registry_extra: dict[str, Any] | None = None,
+        poll_interval: float | None = None,
+    ):
+        self.directory = Path(directory)
+        self._embeddings = embeddings
+        self._cache = cache
+        self._registry_extra = registry_extra
+        self._poll_interval = (
+            poll_interval
+            if poll_interval is not None
+            else configured_poll_interval()
+        )
+        self._catalog: CardCatalog | None = None
+        # file name -> (mtime_ns, size) of files that failed to parse
+        self._broken: dict[str, tuple[int, int]] = {}
+        # Refreshes are serialized, the lock belongs to one event loop
+        self._refresh_lock: asyncio.Lock | None = None
+        self._lock_loop: asyncio.AbstractEventLoop | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def catalog(self) -> CardCatalog | None:
+        return self._catalog
+
+    def _lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._lock_loop is not loop:
+            self._refresh_lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._refresh_lock
+
+    async def current(self) -> CardCatalog:
+        """The current catalog, loaded on first use, and the watch started."""
+        if self._catalog is None:
+            await self.refresh()
+        self.start()
+        return self._catalog
+
+    async def refresh(self) -> bool:
+        """Pick up changed card files, True when the catalog was swapped."""
+        async with self._lock():
+            return await self._refresh()
+
+    async def _refresh(self) -> bool:
+        previous = self._catalog
+        old_files = previous.files if previous is not None else {}
+        stats = await asyncio.to_thread(_scan, self.directory)
+        changed = [
+            name
+            for name, stat in stats.items()
+            if self._broken.get(name) != stat
+            and (
+                name not in old_files
+                or (old_files[name].mtime_ns, old_files[name].size) != stat
+            )
+        ]
+        parsed = await asyncio.to_thread(_read_cards, self.directory, changed)
+        self._broken = {
+            name: stat
+            for name, stat in stats.items()
+            if (name in parsed and parsed[name] is None)
+            or self._broken.get(name) == stat
+        }
+        files = {}
+        for name in sorted(stats):
+            card = parsed.get(name)
+            if card is None:
+                # Unchanged, or broken: keep the last good version
+                if name in old_files:
+                    files[name] = old_files[name]
+            else:
+                mtime_ns, size = stats[name]
+                files[name] = CardFile(
+                    mtime_ns=mtime_ns,
+                    size=size,
+                    uri=f'{AGENT_CARD_URI_PREFIX}{Path(name).stem}',
+                    card=card,
+                )
+        if previous is not None and files.keys() == old_files.keys() and all(
+            files[name] is old_files[name] for name in files
+        ):
+            return False
+        uris = [f.uri for f in files.values()]
+        cards = [f.card for f in files.values()]
+        index = await build_card_index(
+            uris,
+            cards,
+            self._embeddings,
+            self._cache,
+            previous=previous.index if previous is not None else None,
+        )
+        registry = await asyncio.to_thread(
+            CardRegistry,
+            uris,
+            cards,
+            self._registry_extra,
+            previous.registry if previous is not None else None,
+        )
+        self._catalog = CardCatalog(index=index, registry=registry, files=files)
+        if previous is not None:
+            logger.info(
+                f'Reloaded agent cards: {len(changed)} changed,'
+                f' {len(files)} total'
+            )
+        return True
+
+    def start(self):
+        """Watch the directory from the running event loop."""
+        if self._poll_interval is None:
+            return
+        loop = asyncio.get_running_loop()
+        if (
+            self._task is not None
+            and not self._task.done()
+            and self._task.get_loop() is loop
+        ):
+            return
+        self._task = loop.create_task(self._watch())
+
+    async def stop(self):
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _watch(self):
+        if watchfiles is not None and self.directory.is_dir():
+            async for _ in watchfiles.awatch(
+                self.directory,
+                debounce=int(self._poll_interval * 1000),
+                rust_timeout=RESCAN_SECONDS * 1000,
+                yield_on_timeout=True,
+            ):
+                await self._safe_refresh()
+            return
+        while True:
+            await asyncio.sleep(self._poll_interval)
+            await self._safe_refresh()
+
+    async def _safe_refresh(self):
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.error(f'Agent card reload failed: {e}', exc_info=True)
@@ -1,7 +1,10 @@
 #!/usr/bin/env python3
 """
 MCP Server usando Claude Code SDK ao invés de Google API.
-Integra com Claude para embeddings e busca semântica de agentes.
+Integra com Claude para análise de agentes; a busca semântica usa
+embeddings locais (a2a_mcp.mcp.embeddings), gerados em threads sem bloquear
+o loop do servidor. Mudanças em agent_cards/ são recarregadas sem reiniciar
+(a2a_mcp.mcp.card_watcher).
 """
 
 import json
@@ -15,8 +18,6 @@ import asyncio
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
-import numpy as np
-import pandas as pd
 import requests
 
 # Importar Claude Code SDK
@@ -43,6 +44,11 @@ except ImportError:
 from mcp.server.fastmcp import FastMCP
 from mcp.server.fastmcp.utilities.logging import get_logger
 
+from a2a_mcp.mcp.card_index import find_agent_response
+from a2a_mcp.mcp.card_watcher import CardCatalog, CardDirectoryWatcher
+from a2a_mcp.mcp.embedding_cache import open_embedding_cache
+from a2a_mcp.mcp.embeddings import EmbeddingService
+
 
 logger = get_logger(__name__)
 AGENT_CARDS_DIR = 'agent_cards'
@@ -50,176 +56,12 @@ SQLLITE_DB = 'travel_agency.db'
 PLACES_API_URL = 'https://places.googleapis.com/v1/places:searchText'
 
 
-class ClaudeEmbeddingService:
-    """Serviço para gerar embeddings usando Claude Code SDK."""
-    
-    def __init__(self):
-        """Inicializa o serviço de embeddings com Claude."""
-        self.client = None
-        self.embeddings_cache = {}
-        
-    async def initialize(self):
-        """Inicializa o cliente Claude SDK."""
-        try:
-            self.client = ClaudeSDKClient(
-                options=ClaudeCodeOptions(
-                    claude_cli_path="claude",
-                    log_level="info"
-                )
-            )
-            logger.info("Claude SDK Client inicializado com sucesso")
-        except Exception as e:
-            logger.error(f"Erro ao inicializar Claude SDK: {e}")
-            raise
-    
-    async def generate_embedding(self, text: str) -> List[float]:
-        """
-        Gera embeddings para o texto usando Claude.
-        
-        Como o Claude não fornece embeddings nativos, vamos usar uma estratégia alternativa:
-        1. Pedir ao Claude para analisar e extrair características do texto
-        2. Converter essas características em um vetor numérico
-        """
-        # Verificar cache
-        if text in self.embeddings_cache:
-            return self.embeddings_cache[text]
-        
-        try:
-            # Prompt para Claude analisar o texto e gerar características
-            prompt = f"""
-            Analise o seguinte texto e extraia 10 características numéricas principais (0-1):
-            1. Complexidade técnica (0=simples, 1=complexo)
-            2. Orientação a dados (0=não, 1=muito)
-            3. Interatividade (0=passivo, 1=interativo)
-            4. Automação (0=manual, 1=automático)
-            5. Processamento de linguagem (0=não, 1=intensivo)
-            6. Visualização (0=texto, 1=visual)
-            7. Tempo real (0=batch, 1=real-time)
-            8. Colaboração (0=individual, 1=colaborativo)
-            9. Segurança (0=aberto, 1=seguro)
-            10. Escalabilidade (0=pequeno, 1=grande escala)
-            
-            Texto: "{text[:500]}"
-            
-            Responda APENAS com 10 números decimais separados por vírgula.
-            Exemplo: 0.8,0.5,0.3,0.9,0.2,0.7,0.4,0.6,0.1,0.5
-            """
-            
-            # Consultar Claude
-            result = await query(prompt)
-            
-            if isinstance(result, ResultMessage):
-                response = result.content.strip()
-            else:
-                response = str(result).strip()
-            
-            # Extrair números da resposta
-            try:
-                numbers = [float(x.strip()) for x in response.split(',')[:10]]
-                # Garantir que temos 10 dimensões
-                while len(numbers) < 10:
-                    numbers.append(0.5)  # Valor padrão neutro
-                embedding = numbers[:10]
-            except:
-                # Fallback: embedding aleatório baseado no hash do texto
-                import hashlib
-                hash_obj = hashlib.md5(text.encode())
-                hash_bytes = hash_obj.digest()
-                # Converter bytes para floats entre 0 e 1
-                embedding = [b / 255.0 for b in hash_bytes[:10]]
-            
-            # Cachear resultado
-            self.embeddings_cache[text] = embedding
-            return embedding
-            
-        except Exception as e:
-            logger.error(f"Erro ao gerar embedding com Claude: {e}")
-            # Fallback: embedding baseado em hash
-            import hashlib
-            hash_obj = hashlib.md5(text.encode())
-            hash_bytes = hash_obj.digest()
-            return [b / 255.0 for b in hash_bytes[:10]]
-    
-    async def close(self):
-        """Fecha o cliente Claude SDK."""
-        if self.client:
-            try:
-                await self.client.disconnect()
-            except:
-                pass
-
-
-# Instância global do serviço de embeddings
-embedding_service = ClaudeEmbeddingService()
-
-
-def load_agent_cards():
-    """Carrega agent cards dos arquivos JSON."""
-    card_uris = []
-    agent_cards = []
-    dir_path = Path(AGENT_CARDS_DIR)
-    
-    if not dir_path.is_dir():
-        logger.error(f'Diretório de agent cards não encontrado: {AGENT_CARDS_DIR}')
-        return card_uris, agent_cards
-    
-    logger.info(f'Carregando agent cards de: {AGENT_CARDS_DIR}')
-    
-    for filename in os.listdir(AGENT_CARDS_DIR):
-        if filename.lower().endswith('.json'):
-            file_path = dir_path / filename
-            
-            if file_path.is_file():
-                logger.info(f'Lendo arquivo: {filename}')
-                try:
-                    with file_path.open('r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        card_uris.append(f'resource://agent_cards/{Path(filename).stem}')
-                        agent_cards.append(data)
-                except Exception as e:
-                    logger.error(f'Erro ao processar {filename}: {e}')
-    
-    logger.info(f'Carregados {len(agent_cards)} agent cards')
-    return card_uris, agent_cards
-
-
-async def build_agent_card_embeddings() -> Optional[pd.DataFrame]:
-    """
-    Carrega agent cards e gera embeddings usando Claude.
-    """
-    card_uris, agent_cards = load_agent_cards()
-    
-    if not agent_cards:
-        logger.warning("Nenhum agent card encontrado")
-        return None
-    
-    logger.info('Gerando embeddings para agent cards com Claude')
-    
-    try:
-        # Inicializar serviço de embeddings
-        await embedding_service.initialize()
-        
-        # Criar DataFrame
-        df = pd.DataFrame({
-            'card_uri': card_uris,
-            'agent_card': agent_cards
-        })
-        
-        # Gerar embeddings para cada card
-        embeddings = []
-        for card in agent_cards:
-            card_text = json.dumps(card)
-            embedding = await embedding_service.generate_embedding(card_text)
-            embeddings.append(embedding)
-        
-        df['card_embeddings'] = embeddings
-        
-        logger.info('Embeddings gerados com sucesso')
-        return df
-        
-    except Exception as e:
-        logger.error(f'Erro ao gerar embeddings: {e}', exc_info=True)
-        return None
+# Embeddings locais compartilhados pelos cards e pelas consultas
+embedding_service = EmbeddingService()
+# Embeddings dos cards persistidos entre reinícios
+embedding_cache = open_embedding_cache(
+    embedding_service.model, embedding_service.dim
+)
 
 
 def serve(host, port, transport):
@@ -243,47 +85,62 @@ def serve(host, port, transport):
     
     mcp = FastMCP('agent-cards-claude', host=host, port=port)
     
-    # DataFrame global para armazenar embeddings
-    df = None
+    # Índice de busca e lookups por nome, montados na primeira consulta e
+    # recarregados quando os arquivos mudam
+    watcher = CardDirectoryWatcher(
+        AGENT_CARDS_DIR, embedding_service, embedding_cache
+    )
+    
+    async def get_catalog() -> Optional[CardCatalog]:
+        """Snapshot atual dos agent cards, None se não houver nenhum."""
+        try:
+            catalog = await watcher.current()
+        except Exception as e:
+            logger.error(f'Erro ao gerar embeddings: {e}', exc_info=True)
+            return None
+        if not len(catalog):
+            logger.warning("Nenhum agent card encontrado")
+            return None
+        return catalog
     
     @mcp.tool(
         name='find_agent',
-        description='Encontra o agent card mais relevante usando Claude para análise semântica.'
+        description=(
+            'Encontra os agent cards mais relevantes por similaridade '
+            'semântica, para uma consulta ou uma lista de consultas.'
+        )
     )
-    async def find_agent(query: str) -> str:
-        """Encontra o agent card mais relevante baseado em uma consulta."""
-        nonlocal df
-        
-        # Carregar embeddings se ainda não carregados
-        if df is None:
-            df = await build_agent_card_embeddings()
-            if df is None:
-                return json.dumps({
-                    "error": "Nenhum agent card disponível",
-                    "suggestion": "Adicione agent cards no diretório 'agent_cards/'"
-                })
+    async def find_agent(
+        query: str = '',
+        queries: list[str] | None = None,
+        k: int = 1,
+        min_score: float | None = None,
+    ) -> str:
+        """
+        Encontra os agent cards mais relevantes para uma ou várias consultas.
         
-        try:
-            # Gerar embedding para a query
-            query_embedding = await embedding_service.generate_embedding(query)
-            
-            # Calcular similaridade (produto escalar)
-            similarities = []
-            for card_embedding in df['card_embeddings']:
-                similarity = np.dot(card_embedding, query_embedding)
-                similarities.append(similarity)
-            
-            # Encontrar melhor match
-            best_match_index = np.argmax(similarities)
-            best_score = similarities[best_match_index]
-            
-            logger.debug(f'Melhor match para "{query}": índice {best_match_index}, score {best_score:.3f}')
-            
+        Args:
+            query: Consulta única; a resposta traz o melhor card no topo e
+                os k melhores em "candidates".
+            queries: Várias consultas de uma vez, ranqueadas com um único
+                produto de matrizes; a resposta traz "results" na mesma ordem.
+            k: Número máximo de candidatos por consulta.
+            min_score: Similaridade mínima (cosseno) de um candidato.
+        """
+        # Um único snapshot por consulta, nunca um índice pela metade
+        catalog = await get_catalog()
+        if catalog is None:
             return json.dumps({
-                "agent_card": df.iloc[best_match_index]['agent_card'],
-                "confidence": float(best_score),
-                "uri": df.iloc[best_match_index]['card_uri']
+                "error": "Nenhum agent card disponível",
+                "suggestion": "Adicione agent cards no diretório 'agent_cards/'"
             })
+        
+        try:
+            # Similaridade de cosseno contra a matriz pré-calculada
+            response = await find_agent_response(
+                catalog.index, embedding_service, query, queries, k, min_score
+            )
+            return json.dumps(response)
             
         except Exception as e:
             logger.error(f"Erro ao buscar agente: {e}")
@@ -295,23 +152,17 @@ def serve(host, port, transport):
     )
     async def analyze_agent_with_claude(agent_name: str) -> str:
         """Usa Claude para analisar profundamente um agent card."""
-        nonlocal df
-        
-        if df is None:
-            df = await build_agent_card_embeddings()
-            if df is None:
-                return json.dumps({"error": "Nenhum agent card disponível"})
+        catalog = await get_catalog()
+        if catalog is None:
+            return json.dumps({"error": "Nenhum agent card disponível"})
         
         try:
             # Encontrar o agent card pelo nome
-            agent_card = None
-            for _, row in df.iterrows():
-                if agent_name.lower() in json.dumps(row['agent_card']).lower():
-                    agent_card = row['agent_card']
-                    break
+            entry = catalog.registry.find_first(agent_name)
             
-            if not agent_card:
+            if entry is None:
                 return json.dumps({"error": f"Agent '{agent_name}' não encontrado"})
+            agent_card = entry.card
             
             # Pedir análise ao Claude
             prompt = f"""
@@ -348,14 +199,15 @@ def serve(host, port, transport):
     )
     async def list_all_agents() -> str:
         """Retorna lista de todos os agents disponíveis."""
-        _, agent_cards = load_agent_cards()
+        catalog = await get_catalog()
+        entries = catalog.registry.entries if catalog is not None else []
         
         agents_list = []
-        for card in agent_cards:
+        for entry in entries:
             agents_list.append({
-                "name": card.get("name", "Unknown"),
-                "description": card.get("description", ""),
-                "url": card.get("url", "")
+                "name": entry.card.get("name", "Unknown"),
+                "description": entry.card.get("description", ""),
+                "url": entry.card.get("url", "")
             })
         
         return json.dumps({
@@ -79,23 +79,49 @@ async def init_session(host, port, transport):
         )
 
 
-async def find_agent(session: ClientSession, query) -> CallToolResult:
+async def find_agent(
+    session: ClientSession, query, k: int = 1, min_score: float | None = None
+) -> CallToolResult:
     """Calls the 'find_agent' tool on the connected MCP server.
 
     Args:
         session: The active ClientSession.
         query: The natural language query to send to the 'find_agent' tool.
+        k: Maximum number of ranked candidates to return.
+        min_score: Minimum similarity of a candidate, server default if None.
 
     Returns:
         The result of the tool call.
     """
     logger.info(f"Calling 'find_agent' tool with query: '{query[:50]}...'")
-    return await session.call_tool(
-        name='find_agent',
-        arguments={
-            'query': query,
-        },
-    )
+    arguments = {'query': query, 'k': k}
+    if min_score is not None:
+        arguments['min_score'] = min_score
+    return await session.call_tool(name='find_agent', arguments=arguments)
+
+
+async def find_agents(
+    session: ClientSession,
+    queries: list[str],
+    k: int = 1,
+    min_score: float | None = None,
+) -> CallToolResult:
+    """Calls the 'find_agent' tool with a batch of queries.
+
+    Args:
+        session: The active ClientSession.
+        queries: The natural language queries, ranked in one call.
+        k: Maximum number of ranked candidates per query.
+        min_score: Minimum similarity of a candidate, server default if None.
+
+    Returns:
+        The result of the tool call, with one entry per query in 'results'.
+    """
+    logger.info(f"Calling 'find_agent' tool with {len(queries)} queries")
+    arguments = {'queries': queries, 'k': k}
+    if min_score is not None:
+        arguments['min_score'] = min_score
+    return await session.call_tool(name='find_agent', arguments=arguments)
 
 
 async def find_resource(session: ClientSession, resource) -> ReadResourceResult:
@@ -0,0 +1,194 @@
+"""Agent card embeddings persisted across MCP server restarts.
+
+Vectors live in a float32 data file per embedding model, memory mapped and
+grown by appending rows, next to a JSON sidecar that names the data file and
+maps the content hash of each card to its row. A card whose JSON changed
+gets a new hash, so only that card is embedded again; rows nobody references
+any more are dropped by compaction once they outnumber the live ones.
+
+The sidecar is replaced atomically after the rows it points to are written
+and compaction writes a new data file, so a crash leaves unreferenced rows,
+never a wrong vector.
+
+Configuration through environment variables:
+  A2A_MCP_EMBEDDING_CACHE    cache directory (default tmp/a2a-mcp/embeddings,
+                             'off' disables)
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+
+from pathlib import Path
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+
+def configured_cache_dir() -> Path | None:
+    path = os.environ.get('A2A_MCP_EMBEDDING_CACHE', 'tmp/a2a-mcp/embeddings')
+    if path.lower() == 'off':
+        return None
+    return Path(path)
+
+
+def open_embedding_cache(model: str, dim: int) -> 'EmbeddingCache | None':
+    """The cache of the configured directory, None when disabled."""
+    directory = configured_cache_dir()
+    if directory is None:
+        return None
+    try:
+        return EmbeddingCache(directory, model, dim)
+    except OSError as e:
+        logger.warning(f'Embedding cache disabled, {directory}: {e}')
+        return None
+
+
+class EmbeddingCache:
+    """Content hash -> embedding, memory mapped on disk."""
+
+    def __init__(self, directory: Path, model: str, dim: int):
+        self.model = model
+        self.dim = dim
+        self._directory = directory
+        self._stem = re.sub(r'[^\w.-]', '_', model)
+        self._index_path = directory / f'{self._stem}.json'
+        self._generation = 0
+        self._lock = threading.Lock()
+        # content hash -> row in the data file
+        self._rows: dict[str, int] = {}
+        self._count = 0
+        self._map: np.memmap | None = None
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    def _load(self):
+        try:
+            sidecar = json.loads(self._index_path.read_text(encoding='utf-8'))
+            if (sidecar.get('model'), sidecar.get('dim')) != (
+                self.model,
+                self.dim,
+            ):
+                raise ValueError('written by another model')
+            rows = {str(k): int(v) for k, v in sidecar['rows'].items()}
+            count = int(sidecar['count'])
+            generation = int(sidecar['generation'])
+            data_path = self._data_path(generation)
+            if data_path.stat().st_size < count * self.dim * 4:
+                raise ValueError('data file is truncated')
+            if any(not 0 <= row < count for row in rows.values()):
+                raise ValueError('row out of range')
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f'Discarding embedding cache {self._index_path}: {e}')
+            return
+        self._rows = rows
+        self._count = count
+        self._generation = generation
+        self._remap()
+
+    def _data_path(self, generation: int) -> Path:
+        return self._directory / f'{self._stem}.{generation}.f32'
+
+    def _remap(self):
+        self._map = (
+            np.memmap(
+                self._data_path(self._generation),
+                dtype=np.float32,
+                mode='r',
+                shape=(self._count, self.dim),
+            )
+            if self._count
+            else None
+        )
+
+    def _write_sidecar(self):
+        tmp = self._index_path.with_name(self._index_path.name + '.tmp')
+        tmp.write_text(
+            json.dumps(
+                {
+                    'model': self.model,
+                    'dim': self.dim,
+                    'generation': self._generation,
+                    'count': self._count,
+                    'rows': self._rows,
+                }
+            ),
+            encoding='utf-8',
+        )
+        os.replace(tmp, self._index_path)
+
+    def get_many(self, keys: list[str]) -> tuple[np.ndarray, list[int]]:
+        """Cached vectors of keys, and the positions of the missing ones."""
+        matrix = np.zeros((len(keys), self.dim), dtype=np.float32)
+        with self._lock:
+            found = [
+                (i, self._rows[key])
+                for i, key in enumerate(keys)
+                if key in self._rows
+            ]
+            if found:
+                positions, rows = zip(*found)
+                matrix[list(positions)] = self._map[list(rows)]
+        found_positions = {i for i, _ in found}
+        missing = [i for i in range(len(keys)) if i not in found_positions]
+        return matrix, missing
+
+    def put_many(self, keys: list[str], vectors: np.ndarray):
+        """Append the vectors of new keys."""
+        with self._lock:
+            new = {}
+            for key, vector in zip(keys, vectors):
+                if key not in self._rows and key not in new:
+                    new[key] = vector
+            if not new:
+                return
+            self._directory.mkdir(parents=True, exist_ok=True)
+            data_path = self._data_path(self._generation)
+            with open(data_path, 'r+b' if self._count else 'wb') as f:
+                f.seek(self._count * self.dim * 4)
+                f.write(
+                    np.asarray(list(new.values()), dtype=np.float32).tobytes()
+                )
+            for key in new:
+                self._rows[key] = self._count
+                self._count += 1
+            self._write_sidecar()
+            self._remap()
+
+    def retain(self, keys: list[str]):
+        """Forget every other key, compacting the data file when worth it."""
+        with self._lock:
+            wanted = set(keys)
+            live = {k: row for k, row in self._rows.items() if k in wanted}
+            if len(live) == len(self._rows):
+                return
+            if self._count - len(live) > len(live):
+                self._compact(live)
+            else:
+                self._rows = live
+                self._write_sidecar()
+
+    def _compact(self, live: dict[str, int]):
+        old_path = self._data_path(self._generation)
+        vectors = np.asarray(self._map[list(live.values())])
+        self._generation += 1
+        vectors.tofile(self._data_path(self._generation))
+        self._rows = {key: row for row, key in enumerate(live)}
+        self._count = len(self._rows)
+        self._write_sidecar()
+        self._remap()
+        try:
+            old_path.unlink()
+        except OSError:
+            pass
@@ -0,0 +1,173 @@
+"""Local text embeddings for the agent card search.
+
+Texts are turned into hashed term-frequency vectors: accent-folded word
+unigrams and bigrams plus character trigrams of every word (which catch
+inflections such as "booking" / "book"), each feature hashed with CRC32
+into a fixed number of dimensions with a sign bit to keep collisions
+unbiased. Term frequencies are sublinear (1 + log tf).
+
+The vectors are raw: IDF weighting and L2 normalization are applied by the
+CardIndex over the whole card corpus, so a text always maps to the same
+vector and embeddings can be cached by content. No model call, no network.
+
+EmbeddingService is the async front end used by the MCP servers: batches
+run in worker threads, at most max_concurrency at a time, so embedding a
+large card directory never blocks the server's event loop. Query
+embeddings are kept in a bounded LRU.
+
+Configuration through environment variables:
+  A2A_MCP_EMBED_BATCH_SIZE     texts per worker batch (default 32)
+  A2A_MCP_EMBED_CONCURRENCY    batches embedded at once (default 4)
+  A2A_MCP_QUERY_CACHE_SIZE     cached query embeddings (default 1024)
+"""
+
+import asyncio
+import math
+import os
+import re
+import unicodedata
+import zlib
+
+from collections import Counter, OrderedDict
+from typing import Any
+
+import numpy as np
+
+
+EMBEDDING_MODEL = 'hashed-ngram-v1'
+DEFAULT_DIM = 4096
+
+_WORD = re.compile(r'\w+')
+# Character n-grams weigh less than whole words
+_CHAR_NGRAM_WEIGHT = 0.5
+_CHAR_NGRAM = 3
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and strip accents."""
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def card_text(card: dict[str, Any]) -> str:
+    """Text of an agent card that is relevant to the search."""
+    parts = [str(card.get('name', '')), str(card.get('description', ''))]
+    capabilities = card.get('capabilities')
+    if isinstance(capabilities, list):
+        parts.extend(str(x) for x in capabilities)
+    for skill in card.get('skills') or []:
+        if not isinstance(skill, dict):
+            continue
+        parts.append(str(skill.get('name', '')))
+        parts.append(str(skill.get('description', '')))
+        parts.extend(str(x) for x in skill.get('tags') or [])
+        parts.extend(str(x) for x in skill.get('examples') or [])
+    return '\n'.join(x for x in parts if x)
+
+
+class HashedNgramEmbedder:
+    """Feature hashing embedder, see the module docstring."""
+
+    def __init__(self, dim: int = DEFAULT_DIM):
+        self.dim = dim
+
+    @property
+    def model(self) -> str:
+        """Identifies the vector space, vectors of different models differ."""
+        return f'{EMBEDDING_MODEL}-{self.dim}'
+
+    def features(self, text: str) -> Counter:
+        words = _WORD.findall(normalize_text(text))
+        counts: Counter = Counter(words)
+        counts.update(f'{a} {b}' for a, b in zip(words, words[1:]))
+        for word in words:
+            padded = f'<{word}>'
+            for i in range(len(padded) - _CHAR_NGRAM + 1):
+                counts[f'#{padded[i : i + _CHAR_NGRAM]}'] += _CHAR_NGRAM_WEIGHT
+        return counts
+
+    def embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature, count in self.features(text).items():
+            h = zlib.crc32(feature.encode('utf-8'))
+            sign = 1.0 if h & 0x80000000 else -1.0
+            vector[h % self.dim] += sign * (1.0 + math.log(count))
+        return vector
+
+    def embed_many(self, texts: list[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            matrix[i] = self.embed(text)
+        return matrix
+
+
+class EmbeddingService:
+    """Non-blocking access to an embedder."""
+
+    # Shorter texts are embedded inline, a thread hop would cost more
+    INLINE_MAX_CHARS = 2000
+
+    def __init__(
+        self,
+        embedder: HashedNgramEmbedder | None = None,
+        batch_size: int | None = None,
+        max_concurrency: int | None = None,
+        query_cache_size: int | None = None,
+    ):
+        self.embedder = embedder or HashedNgramEmbedder()
+        self._batch_size = batch_size or int(
+            os.environ.get('A2A_MCP_EMBED_BATCH_SIZE', '32')
+        )
+        self._max_concurrency = max_concurrency or int(
+            os.environ.get('A2A_MCP_EMBED_CONCURRENCY', '4')
+        )
+        self._query_cache_size = (
+            query_cache_size
+            if query_cache_size is not None
+            else int(os.environ.get('A2A_MCP_QUERY_CACHE_SIZE', '1024'))
+        )
+        self._queries: OrderedDict[str, np.ndarray] = OrderedDict()
+
+    @property
+    def model(self) -> str:
+        return self.embedder.model
+
+    @property
+    def dim(self) -> int:
+        return self.embedder.dim
+
+    async def embed(self, text: str) -> np.ndarray:
+        """Embedding of a query text, read only."""
+        vector = self._queries.get(text)
+        if vector is not None:
+            self._queries.move_to_end(text)
+            return vector
+        if len(text) <= self.INLINE_MAX_CHARS:
+            vector = self.embedder.embed(text)
+        else:
+            vector = await asyncio.to_thread(self.embedder.embed, text)
+        vector.flags.writeable = False
+        if self._query_cache_size > 0:
+            self._queries[text] = vector
+            if len(self._queries) > self._query_cache_size:
+                self._queries.popitem(last=False)
+        return vector
+
+    async def embed_many(self, texts: list[str]) -> np.ndarray:
+        """Embed texts in batches, one row per text in input order."""
+        matrix = np.zeros((len(texts), self.embedder.dim), dtype=np.float32)
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        async def run(start: int):
+            async with semaphore:
+                matrix[start : start + self._batch_size] = (
+                    await asyncio.to_thread(
+                        self.embedder.embed_many,
+                        texts[start : start + self._batch_size],
+                    )
+                )
+
+        await asyncio.gather(
+            *(run(i) for i in range(0, len(texts), self._batch_size))
+        )
+        return matrix
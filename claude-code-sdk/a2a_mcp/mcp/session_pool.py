@@ -0,0 +1,225 @@
+"""Pool of initialized MCP client sessions.
+
+Opening a session costs a connection (an SSE stream or a stdio subprocess)
+plus the `initialize` handshake. The pool keeps sessions open between
+calls so a tool call or resource read only pays for itself.
+
+Every session is owned by a background task: the transports are anyio
+context managers that must be entered and exited by the same task. Idle
+sessions are pinged before reuse once they have been idle for
+`health_check_interval` seconds, dead or failing sessions are closed and
+replaced by a new connection.
+"""
+
+import asyncio
+import logging
+import time
+import weakref
+
+from collections.abc import Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import Any, TypeVar
+
+from mcp import ClientSession
+from mcp.shared.exceptions import McpError
+
+from a2a_mcp.mcp.client import init_session
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class _PooledSession:
+    def __init__(
+        self,
+        session: ClientSession,
+        owner: asyncio.Task,
+        close: asyncio.Event,
+    ):
+        self.session = session
+        self.owner = owner
+        self.close = close
+        self.last_used = time.monotonic()
+
+    @property
+    def alive(self) -> bool:
+        return not self.owner.done()
+
+
+class MCPSessionPool:
+    """Reusable sessions to one MCP server.
+
+    At most max_sessions sessions are open at once, callers beyond that
+    wait for a session to be released.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        transport: str,
+        max_sessions: int = 4,
+        health_check_interval: float = 30.0,
+        connect_timeout: float = 10.0,
+        connect: Callable[..., Any] = init_session,
+    ):
+        self._host = host
+        self._port = port
+        self._transport = transport
+        self._health_check_interval = health_check_interval
+        self._connect_timeout = connect_timeout
+        self._connect = connect
+        self._semaphore = asyncio.Semaphore(max_sessions)
+        # Most recently released last
+        self._idle: list[_PooledSession] = []
+        self._open: set[_PooledSession] = set()
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    async def _start(self) -> _PooledSession:
+        ready = asyncio.get_running_loop().create_future()
+        close = asyncio.Event()
+
+        async def own():
+            try:
+                async with self._connect(
+                    self._host, self._port, self._transport
+                ) as session:
+                    ready.set_result(session)
+                    await close.wait()
+            except asyncio.CancelledError:
+                if not ready.done():
+                    ready.cancel()
+                raise
+            except Exception as e:
+                if not ready.done():
+                    ready.set_exception(e)
+                else:
+                    logger.warning(f'MCP session closed with error: {e}')
+
+        owner = asyncio.create_task(own())
+        try:
+            session = await asyncio.wait_for(
+                asyncio.shield(ready), self._connect_timeout
+            )
+        except BaseException:
+            close.set()
+            owner.cancel()
+            raise
+        pooled = _PooledSession(session, owner, close)
+        self._open.add(pooled)
+        return pooled
+
+    async def _healthy(self, pooled: _PooledSession) -> bool:
+        if not pooled.alive:
+            return False
+        if time.monotonic() - pooled.last_used < self._health_check_interval:
+            return True
+        try:
+            await asyncio.wait_for(
+                pooled.session.send_ping(), self._connect_timeout
+            )
+            return True
+        except Exception as e:
+            logger.info(f'Idle MCP session failed its health check: {e}')
+            return False
+
+    async def _checkout(self) -> _PooledSession:
+        while self._idle:
+            pooled = self._idle.pop()
+            if await self._healthy(pooled):
+                return pooled
+            await self._discard(pooled)
+        return await self._start()
+
+    async def _discard(self, pooled: _PooledSession):
+        self._open.discard(pooled)
+        pooled.close.set()
+        try:
+            await asyncio.wait_for(pooled.owner, self._connect_timeout)
+        except BaseException:
+            # Closing is best effort, the transport may already be gone
+            pooled.owner.cancel()
+
+    @asynccontextmanager
+    async def session(self):
+        """Borrow a session for the duration of the block.
+
+        A session whose call failed with anything but an MCP protocol error
+        is closed instead of being returned to the pool.
+        """
+        if self._closed:
+            raise RuntimeError('MCP session pool is closed')
+        async with self._semaphore:
+            pooled = await self._checkout()
+            try:
+                yield pooled.session
+            except McpError:
+                pooled.last_used = time.monotonic()
+                self._idle.append(pooled)
+                raise
+            except BaseException:
+                await self._discard(pooled)
+                raise
+            pooled.last_used = time.monotonic()
+            if self._closed:
+                await self._discard(pooled)
+            else:
+                self._idle.append(pooled)
+
+    async def call(
+        self,
+        fn: Callable[..., Awaitable[T]],
+        *args: Any,
+        retries: int = 1,
+    ) -> T:
+        """Run fn(session, *args), reconnecting on transport failures.
+
+        Only for idempotent calls (tool lookups, resource reads), a failed
+        call is sent again on a fresh session.
+        """
+        for attempt in range(retries + 1):
+            try:
+                async with self.session() as session:
+                    return await fn(session, *args)
+            except McpError:
+                raise
+            except Exception as e:
+                if attempt == retries:
+                    raise
+                logger.warning(
+                    f'MCP call {fn.__name__} failed ({e}), reconnecting'
+                )
+
+    async def close(self):
+        self._closed = True
+        self._idle.clear()
+        for pooled in list(self._open):
+            await self._discard(pooled)
+
+
+# event loop -> (host, port, transport) -> pool
+_pools: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def get_session_pool(host: str, port: int, transport: str) -> MCPSessionPool:
+    """Return the pool of the running event loop for the given server."""
+    pools = _pools.setdefault(asyncio.get_running_loop(), {})
+    key = (host, port, transport)
+    pool = pools.get(key)
+    if pool is None or pool.closed:
+        pool = MCPSessionPool(host, port, transport)
+        pools[key] = pool
+    return pool
+
+
+async def close_session_pools():
+    """Close the pools of the running event loop."""
+    pools = _pools.pop(asyncio.get_running_loop(), {})
+    for pool in pools.values():
+        await pool.close()
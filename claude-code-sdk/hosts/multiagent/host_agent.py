@@ -1,6 +1,7 @@
 import asyncio
 import base64
 import json
+import threading
 import uuid
 
 import httpx
@@ -41,9 +42,18 @@ class HostAgent:
     ):
         self.task_callback = task_callback
         self.httpx_client = http_client
+        # Agents are registered from other threads (agent discovery) while
+        # the runner reads them on the event loop. Writers copy, change and
+        # reassign these collections under a lock; readers take a reference
+        # once and never see a collection change under them.
         self.remote_agent_connections: dict[str, RemoteAgentConnections] = {}
         self.cards: dict[str, AgentCard] = {}
-        self.agents: str = ''
+        # Names of registered agents hidden from the model. Their connections
+        # are kept so enabling them again is free.
+        self.disabled_agents: frozenset[str] = frozenset()
+        self._write_lock = threading.Lock()
+        # (cards, disabled_agents, description) the description was built from
+        self._agents_description: tuple | None = None
         loop = asyncio.get_running_loop()
         loop.create_task(
             self.init_remote_agent_addresses(remote_agent_addresses)
@@ -56,8 +66,8 @@ class HostAgent:
             for address in remote_agent_addresses:
                 task_group.create_task(self.retrieve_card(address))
         # The task groups run in the background and complete.
-        # Once completed the self.agents string is set and the remote
-        # connections are established.
+        # Once completed the remote connections are established and listed
+        # by self.agents.
 
     async def retrieve_card(self, address: str):
         card_resolver = A2ACardResolver(self.httpx_client, address)
@@ -65,13 +75,61 @@ class HostAgent:
         self.register_agent_card(card)
 
     def register_agent_card(self, card: AgentCard):
-        remote_connection = RemoteAgentConnections(self.httpx_client, card)
-        self.remote_agent_connections[card.name] = remote_connection
-        self.cards[card.name] = card
-        agent_info = []
-        for ra in self.list_remote_agents():
-            agent_info.append(json.dumps(ra))
-        self.agents = '\n'.join(agent_info)
+        """Add or replace a remote agent without rebuilding the host agent.
+
+        Calls already running against a replaced agent keep using the
+        connection they started with.
+        """
+        with self._write_lock:
+            if self.cards.get(card.name) == card:
+                return
+            remote_connection = RemoteAgentConnections(self.httpx_client, card)
+            # The connection is published first, a listed card always has one
+            self.remote_agent_connections = {
+                **self.remote_agent_connections,
+                card.name: remote_connection,
+            }
+            self.cards = {**self.cards, card.name: card}
+
+    def remove_agent_card(self, name: str) -> bool:
+        """Remove a remote agent, returns False if it was not registered."""
+        with self._write_lock:
+            registered = name in self.cards
+            if registered or name in self.remote_agent_connections:
+                self.cards = {
+                    k: v for k, v in self.cards.items() if k != name
+                }
+                self.remote_agent_connections = {
+                    k: v
+                    for k, v in self.remote_agent_connections.items()
+                    if k != name
+                }
+            if name in self.disabled_agents:
+                self.disabled_agents = self.disabled_agents - {name}
+            return registered
+
+    def set_agent_enabled(self, name: str, enabled: bool):
+        """Show or hide a registered remote agent from the model."""
+        with self._write_lock:
+            if enabled == (name not in self.disabled_agents):
+                return
+            if enabled:
+                self.disabled_agents = self.disabled_agents - {name}
+            else:
+                self.disabled_agents = self.disabled_agents | {name}
+
+    @property
+    def agents(self) -> str:
+        """The enabled agents as JSON lines, recomputed only after changes."""
+        cards, disabled = self.cards, self.disabled_agents
+        cached = self._agents_description
+        if cached is None or cached[0] is not cards or cached[1] is not disabled:
+            description = '\n'.join(
+                json.dumps(ra) for ra in self._remote_agents(cards, disabled)
+            )
+            cached = (cards, disabled, description)
+            self._agents_description = cached
+        return cached[2]
 
     def create_agent(self) -> Agent:
         return Agent(
@@ -132,15 +190,17 @@ Current agent: {current_agent['active_agent']}
 
     def list_remote_agents(self):
         """List the available remote agents you can use to delegate the task."""
-        if not self.remote_agent_connections:
-            return []
+        return self._remote_agents(self.cards, self.disabled_agents)
 
-        remote_agent_info = []
-        for card in self.cards.values():
-            remote_agent_info.append(
-                {'name': card.name, 'description': card.description}
-            )
-        return remote_agent_info
+    @staticmethod
+    def _remote_agents(
+        cards: dict[str, AgentCard], disabled: frozenset[str]
+    ) -> list[dict]:
+        return [
+            {'name': card.name, 'description': card.description}
+            for card in cards.values()
+            if card.name not in disabled
+        ]
 
     async def send_message(
         self, agent_name: str, message: str, tool_context: ToolContext
@@ -157,11 +217,11 @@ Current agent: {current_agent['active_agent']}
         Yields:
           A dictionary of JSON data.
         """
-        if agent_name not in self.remote_agent_connections:
+        client = self.remote_agent_connections.get(agent_name)
+        if client is None or agent_name in self.disabled_agents:
             raise ValueError(f'Agent {agent_name} not found')
         state = tool_context.state
         state['agent'] = agent_name
-        client = self.remote_agent_connections[agent_name]
         if not client:
             raise ValueError(f'Client not available for {agent_name}')
         task_id = state.get('task_id', None)
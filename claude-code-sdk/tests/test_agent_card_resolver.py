@@ -0,0 +1,68 @@
+import asyncio
+import unittest
+
+import httpx
+
+from utils.agent_card import AgentCardResolver
+
+
+CARD = {
+    'name': 'Echo',
+    'description': 'Echo agent',
+    'url': 'http://localhost:10020/',
+    'version': '1.0.0',
+    'capabilities': {},
+    'defaultInputModes': ['text'],
+    'defaultOutputModes': ['text'],
+    'skills': [],
+}
+
+
+class AgentCardResolverTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the async agent card resolver."""
+
+    async def asyncSetUp(self) -> None:
+        self.requests: list[httpx.Request] = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            await asyncio.sleep(0.01)
+            if request.headers.get('if-none-match') == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json=CARD, headers={'ETag': '"v1"'})
+
+        self.client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        )
+
+    async def asyncTearDown(self) -> None:
+        await self.client.aclose()
+
+    async def test_coalesces_concurrent_fetches(self) -> None:
+        """Concurrent resolutions of one address share a single request."""
+        resolver = AgentCardResolver(self.client)
+        cards = await asyncio.gather(
+            *(resolver.resolve('localhost:10020') for _ in range(10))
+        )
+        self.assertEqual(len(self.requests), 1)
+        self.assertTrue(all(card.name == 'Echo' for card in cards))
+
+    async def test_serves_fresh_cards_from_cache(self) -> None:
+        """A card within its TTL is returned without a request."""
+        resolver = AgentCardResolver(self.client)
+        await resolver.resolve('http://localhost:10020')
+        await resolver.resolve('http://localhost:10020/')
+        self.assertEqual(len(self.requests), 1)
+
+    async def test_revalidates_expired_cards(self) -> None:
+        """An expired card is revalidated with its ETag."""
+        resolver = AgentCardResolver(self.client, ttl=0)
+        await resolver.resolve('http://localhost:10020')
+        card = await resolver.resolve('http://localhost:10020')
+        self.assertEqual(len(self.requests), 2)
+        self.assertEqual(self.requests[1].headers['if-none-match'], '"v1"')
+        self.assertEqual(card.name, 'Echo')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+import asyncio
+import unittest
+
+from unittest import mock
+
+import httpx
+
+from a2a.types import AgentCard
+from service.server.adk_host_manager import ADKHostManager
+from service.server.agent_discovery import AgentDiscovery
+
+
+CARD = {
+    'name': 'Test Agent',
+    'description': 'An agent for tests',
+    'url': 'http://localhost:10000/',
+    'version': '1.0.0',
+    'capabilities': {'streaming': True},
+    'defaultInputModes': ['text'],
+    'defaultOutputModes': ['text'],
+    'skills': [],
+}
+
+
+class StubAgents:
+    """httpx transport answering agent card requests per port."""
+
+    def __init__(self, cards: dict[int, dict], etag: str | None = None):
+        self.cards = cards
+        self.etag = etag
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        card = self.cards.get(request.url.port)
+        if card is None or request.url.path != '/.well-known/agent.json':
+            return httpx.Response(404)
+        headers = {'ETag': self.etag} if self.etag else {}
+        if self.etag and request.headers.get('if-none-match') == self.etag:
+            return httpx.Response(304, headers=headers)
+        return httpx.Response(200, json=card, headers=headers)
+
+
+class AgentDiscoveryTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the port sweep, backoff and card revalidation."""
+
+    def make_discovery(self, stub: StubAgents, ports: list[int], **kwargs):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(stub))
+        self.addAsyncCleanup(client.aclose)
+        discovery = AgentDiscovery(client, ports=ports, **kwargs)
+        # Ports with a stubbed card accept TCP connections
+        self.open_ports = set(stub.cards)
+        discovery._is_port_open = mock.AsyncMock(
+            side_effect=lambda port: port in self.open_ports
+        )
+        return discovery
+
+    async def test_tcp_probe(self) -> None:
+        """Only ports with a listener are reported open."""
+        server = await asyncio.start_server(
+            lambda reader, writer: writer.close(), 'localhost', 0
+        )
+        port = server.sockets[0].getsockname()[1]
+        async with httpx.AsyncClient() as client:
+            discovery = AgentDiscovery(client, ports=[])
+            self.assertTrue(await discovery._is_port_open(port))
+            server.close()
+            await server.wait_closed()
+            self.assertFalse(await discovery._is_port_open(port))
+
+    async def test_discovers_agents_on_open_ports(self) -> None:
+        stub = StubAgents({10000: CARD})
+        discovery = self.make_discovery(stub, [10000, 10001])
+        agents = await discovery.discover_localhost_agents()
+        self.assertEqual([a.name for a in agents], ['Test Agent'])
+        # The closed port never got an HTTP request
+        self.assertEqual({r.url.port for r in stub.requests}, {10000})
+        # The first endpoint answered, the others were not tried
+        self.assertEqual(len(stub.requests), 1)
+
+    async def test_backoff_grows_and_resets(self) -> None:
+        """Failing ports wait exponentially longer, success clears it."""
+        stub = StubAgents({})
+        discovery = self.make_discovery(
+            stub, [10000], backoff_base=10, backoff_max=35
+        )
+        delays = []
+        with mock.patch(
+            'service.server.agent_discovery.time.monotonic',
+            return_value=1000.0,
+        ):
+            for _ in range(4):
+                await discovery.discover_localhost_agents(force=True)
+                delays.append(discovery._backoff[10000].next_probe_at - 1000)
+            # Skipped while backing off
+            discovery._is_port_open.reset_mock()
+            await discovery.discover_localhost_agents()
+            discovery._is_port_open.assert_not_called()
+        self.assertEqual(delays, [10, 20, 35, 35])
+
+        stub.cards[10000] = CARD
+        self.open_ports.add(10000)
+        agents = await discovery.discover_localhost_agents(force=True)
+        self.assertEqual(len(agents), 1)
+        self.assertNotIn(10000, discovery._backoff)
+
+    async def test_revalidates_cached_card_with_etag(self) -> None:
+        """A known card is revalidated with If-None-Match, 304 keeps it."""
+        stub = StubAgents({10000: CARD}, etag='"v1"')
+        discovery = self.make_discovery(stub, [10000])
+        first = await discovery.discover_localhost_agents()
+        stub.requests.clear()
+
+        again = await discovery.discover_localhost_agents()
+        self.assertIs(again[0], first[0])
+        self.assertEqual(len(stub.requests), 1)
+        self.assertEqual(stub.requests[0].headers['if-none-match'], '"v1"')
+
+        # A changed card is answered with 200 and replaces the cached one
+        stub.etag = '"v2"'
+        stub.cards[10000] = {**CARD, 'name': 'Renamed Agent'}
+        changed = await discovery.discover_localhost_agents()
+        self.assertEqual(changed[0].name, 'Renamed Agent')
+        self.assertEqual(discovery._card_cache[10000].etag, '"v2"')
+
+    async def test_failure_drops_cached_card(self) -> None:
+        stub = StubAgents({10000: CARD}, etag='"v1"')
+        discovery = self.make_discovery(stub, [10000])
+        await discovery.discover_localhost_agents()
+        self.open_ports.clear()
+        self.assertEqual(await discovery.discover_localhost_agents(), [])
+        self.assertNotIn(10000, discovery._card_cache)
+
+
+class RefreshAgentsTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the offline marking of ADKHostManager._refresh_agents."""
+
+    async def asyncSetUp(self) -> None:
+        self.client = httpx.AsyncClient()
+        self.addAsyncCleanup(self.client.aclose)
+        # No initial discovery thread sweeping the real ports
+        with mock.patch('threading.Thread.start'):
+            self.manager = ADKHostManager(self.client)
+        self.discovery = self.manager._agent_discovery
+        self.discovery.ports = [10000]
+        self.discovery._is_port_open = mock.AsyncMock(return_value=False)
+
+    async def register(self, url: str, name: str) -> None:
+        card = AgentCard(**{**CARD, 'name': name, 'url': url})
+        with mock.patch.object(
+            self.manager._card_resolver,
+            'resolve',
+            mock.AsyncMock(return_value=card),
+        ):
+            await self.manager.register_agent(url)
+
+    def usable(self, name: str) -> bool:
+        host = self.manager._host_agent
+        return name in host.cards and name not in host.disabled_agents
+
+    async def test_only_probed_agents_go_offline(self) -> None:
+        """Agents outside the sweep keep their state and stay usable."""
+        await self.register('https://agents.example.com/a2a', 'Remote')
+        await self.register('http://localhost:10500/', 'Other Port')
+        await self.register('http://localhost:10000/', 'Swept')
+        await self.manager._refresh_agents(force=True)
+
+        agents = self.manager._agents
+        self.assertTrue(agents['https://agents.example.com/a2a'].is_online)
+        self.assertTrue(agents['http://localhost:10500/'].is_online)
+        self.assertFalse(agents['http://localhost:10000/'].is_online)
+        self.assertTrue(self.usable('Remote'))
+        self.assertTrue(self.usable('Other Port'))
+        self.assertFalse(self.usable('Swept'))
+
+        # A port in backoff is not probed, nothing changes for it
+        self.manager._agents['http://localhost:10000/'].is_online = True
+        await self.manager._refresh_agents()
+        self.assertTrue(agents['http://localhost:10000/'].is_online)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+import base64
+import unittest
+
+from a2a.types import (
+    Artifact,
+    FilePart,
+    FileWithBytes,
+    Part,
+    TaskArtifactUpdateEvent,
+    TextPart,
+)
+from service.server.artifact_assembler import ArtifactAssembler
+
+
+def text_event(
+    text: str, append: bool, last_chunk: bool | None, artifact_id: str = 'a1'
+) -> TaskArtifactUpdateEvent:
+    return TaskArtifactUpdateEvent(
+        task_id='t1',
+        context_id='c1',
+        append=append,
+        last_chunk=last_chunk,
+        artifact=Artifact(
+            artifact_id=artifact_id,
+            name='answer',
+            parts=[Part(root=TextPart(text=text))],
+        ),
+    )
+
+
+def file_event(
+    data: bytes | str, append: bool, last_chunk: bool
+) -> TaskArtifactUpdateEvent:
+    """A file chunk, str data is sent as is instead of encoded."""
+    if isinstance(data, bytes):
+        data = base64.b64encode(data).decode('ascii')
+    return TaskArtifactUpdateEvent(
+        task_id='t1',
+        context_id='c1',
+        append=append,
+        last_chunk=last_chunk,
+        artifact=Artifact(
+            artifact_id='f1',
+            parts=[
+                Part(
+                    root=FilePart(
+                        file=FileWithBytes(
+                            bytes=data,
+                            mime_type='image/png',
+                        )
+                    )
+                )
+            ],
+        ),
+    )
+
+
+class ArtifactAssemblerTest(unittest.TestCase):
+    """Tests for the chunked artifact assembler."""
+
+    def test_whole_artifact_passes_through(self) -> None:
+        """A single event artifact is returned as is."""
+        assembler = ArtifactAssembler()
+        event = text_event('done', append=False, last_chunk=None)
+        self.assertIs(assembler.add('t1', event), event.artifact)
+        self.assertEqual(len(assembler), 0)
+
+    def test_joins_text_chunks(self) -> None:
+        """Text chunks are merged into a single part."""
+        assembler = ArtifactAssembler()
+        self.assertIsNone(assembler.add('t1', text_event('a', False, False)))
+        self.assertIsNone(assembler.add('t1', text_event('b', True, False)))
+        artifact = assembler.add('t1', text_event('c', True, True))
+        self.assertEqual(artifact.name, 'answer')
+        self.assertEqual(len(artifact.parts), 1)
+        self.assertEqual(artifact.parts[0].root.text, 'abc')
+        self.assertEqual(assembler.pending_bytes, 0)
+
+    def test_joins_file_chunks(self) -> None:
+        """Inline file chunks are joined on their decoded bytes."""
+        assembler = ArtifactAssembler()
+        assembler.add('t1', file_event(b'\x00\x01', False, False))
+        artifact = assembler.add('t1', file_event(b'\x02', True, True))
+        self.assertEqual(
+            base64.b64decode(artifact.parts[0].root.file.bytes),
+            b'\x00\x01\x02',
+        )
+
+    def test_missing_first_chunk(self) -> None:
+        """Chunks arriving before the first one are kept in order."""
+        assembler = ArtifactAssembler()
+        self.assertIsNone(assembler.add('t1', text_event('b', True, False)))
+        self.assertIsNone(assembler.add('t1', text_event('a', False, False)))
+        artifact = assembler.add('t1', text_event('c', True, True))
+        self.assertEqual(artifact.parts[0].root.text, 'abc')
+
+    def test_drops_abandoned_and_oversized_partials(self) -> None:
+        """Expired partials and partials over the cap are dropped."""
+        assembler = ArtifactAssembler(ttl=0)
+        assembler.add('t1', text_event('a', False, False))
+        assembler.add('t1', text_event('x', False, False, artifact_id='a2'))
+        self.assertEqual(len(assembler), 1)
+        self.assertEqual(assembler.dropped, 1)
+        # The rest of a dropped artifact is ignored
+        self.assertIsNone(assembler.add('t1', text_event('b', True, True)))
+
+        assembler = ArtifactAssembler(max_bytes=4)
+        assembler.add('t1', text_event('abc', False, False))
+        assembler.add('t1', text_event('de', True, False))
+        self.assertEqual(len(assembler), 0)
+        self.assertEqual(assembler.pending_bytes, 0)
+
+    def test_undecodable_chunks_are_kept_as_parts(self) -> None:
+        """A bad follow-up chunk does not fail the update or the artifact."""
+        assembler = ArtifactAssembler()
+        self.assertIsNone(assembler.add('t1', file_event(b'abc', False, False)))
+        # Not aligned to a base64 quantum, then malformed padding
+        self.assertIsNone(assembler.add('t1', file_event('ZGV', True, False)))
+        self.assertIsNone(assembler.add('t1', file_event('a=b=', True, False)))
+        artifact = assembler.add('t1', file_event(b'xyz', True, True))
+        files = [p.root.file.bytes for p in artifact.parts]
+        self.assertEqual(
+            files,
+            [base64.b64encode(b'abc').decode(), 'ZGV', 'a=b=', 'eHl6'],
+        )
+        self.assertEqual(len(assembler), 0)
+
+        # Out of order, the first chunk is the undecodable one
+        assembler.add('t1', file_event(b'late', True, False))
+        artifact = assembler.add('t1', file_event('QQ', False, True))
+        self.assertEqual(
+            [p.root.file.bytes for p in artifact.parts], ['QQ', 'bGF0ZQ==']
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
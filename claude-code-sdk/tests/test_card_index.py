@@ -0,0 +1,205 @@
+import asyncio
+import tempfile
+import threading
+import time
+import unittest
+
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+from a2a_mcp.mcp.card_index import (
+    build_card_index,
+    find_agent_response,
+    rank_agents,
+)
+from a2a_mcp.mcp.embedding_cache import EmbeddingCache
+from a2a_mcp.mcp.embeddings import EmbeddingService, HashedNgramEmbedder
+
+
+CARDS = [
+    {
+        'name': 'Air Ticketing Agent',
+        'description': 'Books flights and airline tickets between airports.',
+        'skills': [{'name': 'Book flights', 'tags': ['airfare', 'flight']}],
+    },
+    {
+        'name': 'Hotel Booking Agent',
+        'description': 'Reserves hotel rooms, suites and accommodation.',
+        'skills': [{'name': 'Book hotels', 'tags': ['hotel', 'room']}],
+    },
+    {
+        'name': 'Car Rental Agent',
+        'description': 'Rents cars, SUVs and trucks at the destination.',
+        'skills': [{'name': 'Rent cars', 'tags': ['car', 'rental']}],
+    },
+    {
+        'name': 'Langraph Planner Agent',
+        'description': 'Plans trips and breaks them into tasks.',
+        'skills': [{'name': 'Planning', 'tags': ['plan', 'trip']}],
+    },
+]
+URIS = [f'resource://agent_cards/card_{i}' for i in range(len(CARDS))]
+
+
+class CardIndexTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the local embeddings and the card search matrix."""
+
+    async def asyncSetUp(self) -> None:
+        self.embedder = HashedNgramEmbedder()
+        self.service = EmbeddingService(
+            self.embedder, batch_size=2, max_concurrency=2
+        )
+        self.index = await build_card_index(URIS, CARDS, self.service)
+
+    def best(self, query: str) -> str:
+        position, _ = self.index.search(self.embedder.embed(query))[0]
+        return self.index.cards[position]['name']
+
+    def test_routes_queries_to_the_matching_card(self) -> None:
+        """Queries land on the card that covers them, accents ignored."""
+        self.assertEqual(
+            self.best('Book round-trip economy air tickets to London'),
+            'Air Ticketing Agent',
+        )
+        self.assertEqual(
+            self.best('Reserve a suite room in a hotel'), 'Hotel Booking Agent'
+        )
+        self.assertEqual(self.best('Rent an SUV'), 'Car Rental Agent')
+        self.assertEqual(
+            self.best('Planejar a viagem (trip)'), 'Langraph Planner Agent'
+        )
+
+    def test_scores_are_ranked_cosines(self) -> None:
+        """Rows are unit vectors and top-k returns sorted scores."""
+        norms = np.linalg.norm(self.index.matrix, axis=1)
+        np.testing.assert_allclose(norms, 1.0, rtol=1e-5)
+        matches = self.index.search(self.embedder.embed('hotel room'), k=3)
+        scores = [score for _, score in matches]
+        self.assertEqual(len(matches), 3)
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertLessEqual(scores[0], 1.0 + 1e-6)
+
+    def test_lookup_is_fast(self) -> None:
+        """A query costs one embedding and one matrix product."""
+        query = 'Book a flight from SFO to LHR'
+        start = time.perf_counter()
+        for _ in range(100):
+            self.index.search(self.embedder.embed(query), k=1)
+        self.assertLess((time.perf_counter() - start) / 100, 0.001)
+
+    async def test_batch_search_matches_single_queries(self) -> None:
+        """One matrix product ranks every query like separate searches."""
+        queries = ['Book a flight', 'hotel room', 'quantum chromodynamics']
+        matrix = np.stack([self.embedder.embed(q) for q in queries])
+        batch = self.index.search_many(matrix, k=2)
+        for query, matches in zip(queries, batch):
+            single = self.index.search(self.embedder.embed(query), k=2)
+            self.assertEqual([i for i, _ in matches], [i for i, _ in single])
+            np.testing.assert_allclose(
+                [s for _, s in matches], [s for _, s in single], rtol=1e-5
+            )
+        self.assertEqual(len(self.index.search_many(matrix, k=10)[0]), 4)
+
+    async def test_rank_agents_applies_min_score(self) -> None:
+        """Queries that fit no card get no candidate."""
+        ranked = await rank_agents(
+            self.index,
+            self.service,
+            ['Book round-trip air tickets', 'bake a chocolate cake'],
+            k=3,
+            min_score=0.05,
+        )
+        self.assertEqual(
+            ranked[0][0]['agent_card']['name'], 'Air Ticketing Agent'
+        )
+        self.assertTrue(all(c['confidence'] >= 0.05 for c in ranked[0]))
+        self.assertEqual(ranked[1], [])
+
+    async def test_find_agent_response(self) -> None:
+        """One query answers with its best card, several with results."""
+        single = await find_agent_response(
+            self.index, self.service, 'Book a hotel room', k=2
+        )
+        self.assertEqual(single['agent_card']['name'], 'Hotel Booking Agent')
+        self.assertEqual(single['candidates'][0]['uri'], single['uri'])
+        self.assertLessEqual(len(single['candidates']), 2)
+
+        missing = await find_agent_response(
+            self.index, self.service, 'bake a chocolate cake'
+        )
+        self.assertIn('error', missing)
+        self.assertEqual(missing['candidates'], [])
+
+        batch = await find_agent_response(
+            self.index,
+            self.service,
+            queries=['Rent an SUV', 'bake a chocolate cake'],
+        )
+        self.assertEqual(
+            [r['query'] for r in batch['results']],
+            ['Rent an SUV', 'bake a chocolate cake'],
+        )
+        self.assertEqual(
+            batch['results'][0]['candidates'][0]['agent_card']['name'],
+            'Car Rental Agent',
+        )
+        self.assertEqual(batch['results'][1]['candidates'], [])
+
+    async def test_cached_embeddings_are_reused(self) -> None:
+        """Only cards missing from the cache are embedded."""
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = EmbeddingCache(Path(tmp), self.service.model, 4096)
+            await build_card_index(URIS, CARDS, self.service, cache)
+            changed = [dict(CARDS[0], description='Sells train tickets.')]
+            with mock.patch.object(
+                self.embedder, 'embed_many', wraps=self.embedder.embed_many
+            ) as embed_many:
+                index = await build_card_index(URIS, CARDS, self.service, cache)
+                embed_many.assert_not_called()
+                np.testing.assert_allclose(index.matrix, self.index.matrix)
+                await build_card_index(
+                    URIS, changed + CARDS[1:], self.service, cache
+                )
+                embed_many.assert_called_once()
+                self.assertEqual(len(embed_many.call_args.args[0]), 1)
+
+    async def test_embed_many_is_batched_and_bounded(self) -> None:
+        """Batches keep the input order and at most two run at once."""
+        running = peak = 0
+        lock = threading.Lock()
+        original = self.embedder.embed_many
+
+        def slow_batch(texts):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.02)
+            with lock:
+                running -= 1
+            return original(texts)
+
+        texts = [f'text number {i}' for i in range(9)]
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.001)
+                ticks += 1
+
+        ticking = asyncio.create_task(ticker())
+        with mock.patch.object(self.embedder, 'embed_many', slow_batch):
+            matrix = await self.service.embed_many(texts)
+        ticking.cancel()
+        self.assertEqual(peak, 2)
+        # The loop kept running while the batches were embedded
+        self.assertGreater(ticks, 5)
+        for i, text in enumerate(texts):
+            np.testing.assert_array_equal(matrix[i], self.embedder.embed(text))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import json
+import unittest
+
+from a2a_mcp.mcp.card_registry import CardRegistry
+
+
+CARDS = [
+    {
+        'name': 'Air Ticketing Agent',
+        'url': 'http://localhost:10103/',
+        'skills': [{'name': 'Book flights', 'tags': ['airfare', 'flight']}],
+    },
+    {
+        'name': 'Langraph Planner Agent',
+        'capabilities': ['planning'],
+        'skills': [{'name': 'Planejamento', 'tags': ['trip']}],
+    },
+    {
+        'name': 'Hotel Booking Agent',
+        'skills': [{'name': 'Book hotels', 'tags': ['hotel']}],
+    },
+]
+URIS = [
+    'resource://agent_cards/air_ticketing_agent',
+    'resource://agent_cards/planner_agent',
+    'resource://agent_cards/hotel_booking_agent',
+]
+
+
+class CardRegistryTest(unittest.TestCase):
+    """Tests for the agent card lookup tables."""
+
+    def setUp(self) -> None:
+        self.registry = CardRegistry(URIS, CARDS, {'powered_by': 'test'})
+
+    def test_lookup_by_stem_returns_serialized_response(self) -> None:
+        entry = self.registry.get('planner_agent')
+        self.assertIs(entry.card, CARDS[1])
+        self.assertEqual(
+            json.loads(entry.resource_json),
+            {'agent_card': [CARDS[1]], 'powered_by': 'test'},
+        )
+        self.assertIsNone(self.registry.get('missing'))
+
+    def test_keyword_index(self) -> None:
+        """Names, stems, tags and skills are indexed lowercased."""
+        self.assertEqual(
+            [e.stem for e in self.registry.find('BOOK agent')],
+            ['air_ticketing_agent', 'hotel_booking_agent'],
+        )
+        self.assertEqual(
+            [e.stem for e in self.registry.find('Planner')], ['planner_agent']
+        )
+        self.assertEqual(self.registry.find('flight hotel'), [])
+
+    def test_find_first_falls_back_to_the_card_json(self) -> None:
+        self.assertEqual(
+            self.registry.find_first('Hotel Booking').stem,
+            'hotel_booking_agent',
+        )
+        self.assertEqual(
+            self.registry.find_first('localhost:10103').stem,
+            'air_ticketing_agent',
+        )
+        self.assertIsNone(self.registry.find_first('car rental'))
+
+
+if __name__ == '__main__':
+    unittest.main()
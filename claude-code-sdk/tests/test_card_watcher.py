@@ -0,0 +1,115 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from pathlib import Path
+from unittest import mock
+
+from a2a_mcp.mcp import card_watcher
+from a2a_mcp.mcp.card_watcher import CardDirectoryWatcher
+from a2a_mcp.mcp.embeddings import EmbeddingService
+
+
+def write_card(directory: Path, stem: str, card: dict, bump: int = 0):
+    path = directory / f'{stem}.json'
+    path.write_text(json.dumps(card), encoding='utf-8')
+    if bump:
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + bump))
+
+
+class CardDirectoryWatcherTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the hot reload of the agent card directory."""
+
+    async def asyncSetUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = Path(self.tmp.name)
+        write_card(self.directory, 'flights', {'name': 'Flight Agent'})
+        write_card(self.directory, 'hotels', {'name': 'Hotel Agent'})
+        self.service = EmbeddingService()
+        self.watcher = CardDirectoryWatcher(
+            self.directory, self.service, poll_interval=0.01
+        )
+        self.embedded: list[str] = []
+        embed_many = self.service.embedder.embed_many
+
+        def counting(texts):
+            self.embedded.extend(texts)
+            return embed_many(texts)
+
+        patcher = mock.patch.object(
+            self.service.embedder, 'embed_many', counting
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def asyncTearDown(self) -> None:
+        await self.watcher.stop()
+        self.tmp.cleanup()
+
+    def stems(self, catalog) -> list[str]:
+        return [entry.stem for entry in catalog.registry.entries]
+
+    async def test_reload_only_changed_files(self) -> None:
+        """New and edited cards are parsed and embedded, others reused."""
+        self.assertTrue(await self.watcher.refresh())
+        first = self.watcher.catalog
+        self.assertEqual(len(self.embedded), 2)
+        self.assertFalse(await self.watcher.refresh())
+
+        write_card(self.directory, 'cars', {'name': 'Car Agent'})
+        write_card(
+            self.directory, 'hotels', {'name': 'Hotel Agent v2'}, bump=10**9
+        )
+        self.embedded.clear()
+        self.assertTrue(await self.watcher.refresh())
+        second = self.watcher.catalog
+        self.assertEqual(len(self.embedded), 2)
+        self.assertEqual(self.stems(second), ['cars', 'flights', 'hotels'])
+        self.assertIs(
+            second.registry.get('flights'), first.registry.get('flights')
+        )
+        self.assertEqual(
+            second.registry.get('hotels').card['name'], 'Hotel Agent v2'
+        )
+        # The old snapshot is untouched for readers still holding it
+        self.assertEqual(self.stems(first), ['flights', 'hotels'])
+        self.assertEqual(len(first.index), 2)
+
+        (self.directory / 'cars.json').unlink()
+        self.assertTrue(await self.watcher.refresh())
+        self.assertEqual(
+            self.stems(self.watcher.catalog), ['flights', 'hotels']
+        )
+
+    async def test_broken_file_keeps_last_good_version(self) -> None:
+        await self.watcher.refresh()
+        (self.directory / 'hotels.json').write_text('{', encoding='utf-8')
+        with mock.patch.object(
+            card_watcher, '_read_cards', wraps=card_watcher._read_cards
+        ) as read_cards:
+            self.assertFalse(await self.watcher.refresh())
+            self.assertFalse(await self.watcher.refresh())
+        self.assertEqual(read_cards.call_args_list[1].args[1], [])
+        self.assertEqual(
+            self.watcher.catalog.registry.get('hotels').card['name'],
+            'Hotel Agent',
+        )
+
+    async def test_polling_picks_up_new_cards(self) -> None:
+        """Without watchfiles the directory is polled."""
+        with mock.patch.object(card_watcher, 'watchfiles', None):
+            catalog = await self.watcher.current()
+            self.assertEqual(len(catalog), 2)
+            write_card(self.directory, 'cars', {'name': 'Car Agent'})
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                if len(self.watcher.catalog) == 3:
+                    break
+        self.assertEqual(len(self.watcher.catalog), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import asyncio
+import tempfile
+import unittest
+
+from pathlib import Path
+
+import numpy as np
+
+from a2a_mcp.mcp.embedding_cache import EmbeddingCache
+from a2a_mcp.mcp.embeddings import EmbeddingService
+
+
+DIM = 8
+
+
+def vectors(*values: float) -> np.ndarray:
+    return np.array([[v] * DIM for v in values], dtype=np.float32)
+
+
+class EmbeddingCacheTest(unittest.TestCase):
+    """Tests for the memory mapped embedding cache."""
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = Path(self.tmp.name) / 'cache'
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def open(self, model: str = 'model-v1') -> EmbeddingCache:
+        return EmbeddingCache(self.directory, model, DIM)
+
+    def test_survives_a_restart(self) -> None:
+        """Vectors written by one instance are read by the next one."""
+        self.open().put_many(['a', 'b'], vectors(1, 2))
+        self.open().put_many(['c'], vectors(3))
+        matrix, missing = self.open().get_many(['c', 'x', 'a'])
+        self.assertEqual(missing, [1])
+        np.testing.assert_array_equal(matrix[[0, 2]], vectors(3, 1))
+
+    def test_keyed_by_model(self) -> None:
+        """Another model version starts from an empty cache."""
+        self.open().put_many(['a'], vectors(1))
+        self.assertEqual(self.open('model-v2').get_many(['a'])[1], [0])
+        self.assertIn('a', self.open())
+
+    def test_retain_compacts_dead_rows(self) -> None:
+        """Dropped keys are forgotten and the data file shrinks."""
+        cache = self.open()
+        cache.put_many(['a', 'b', 'c'], vectors(1, 2, 3))
+        cache.retain(['b'])
+        self.assertEqual(len(cache), 1)
+        data_files = list(self.directory.glob('*.f32'))
+        self.assertEqual(len(data_files), 1)
+        self.assertEqual(data_files[0].stat().st_size, DIM * 4)
+        matrix, missing = self.open().get_many(['a', 'b'])
+        self.assertEqual(missing, [0])
+        np.testing.assert_array_equal(matrix[1], vectors(2)[0])
+
+    def test_corrupt_sidecar_is_discarded(self) -> None:
+        """An unreadable sidecar means an empty cache, not an error."""
+        self.open().put_many(['a'], vectors(1))
+        (self.directory / 'model-v1.json').write_text('{', encoding='utf-8')
+        self.assertEqual(len(self.open()), 0)
+
+
+class QueryCacheTest(unittest.TestCase):
+    """Tests for the query embedding LRU."""
+
+    def test_lru_eviction(self) -> None:
+        service = EmbeddingService(query_cache_size=2)
+
+        async def embed_all():
+            first = await service.embed('one')
+            again = await service.embed('one')
+            await service.embed('two')
+            await service.embed('three')
+            return first, again
+
+        first, again = asyncio.run(embed_all())
+        self.assertIs(first, again)
+        self.assertFalse(first.flags.writeable)
+        self.assertEqual(list(service._queries), ['two', 'three'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+import bisect
+import random
+import unittest
+
+from unittest import mock
+
+from a2a.types import Message, Part, Role, TextPart
+from service.server import event_log
+from service.server.event_log import EventLog, _OrderedSegment
+from service.types import Event
+
+
+def make_event(
+    event_id: str, timestamp: float, context_id: str = 'c1', actor: str = 'user'
+) -> Event:
+    return Event(
+        id=event_id,
+        actor=actor,
+        content=Message(
+            role=Role.user,
+            parts=[Part(root=TextPart(text=event_id))],
+            message_id=event_id,
+            context_id=context_id,
+        ),
+        timestamp=timestamp,
+    )
+
+
+def ids(events: list[Event]) -> list[str]:
+    return [e.id for e in events]
+
+
+class EventLogTest(unittest.TestCase):
+    """Tests for the ordered event log."""
+
+    def test_keeps_timestamp_order(self) -> None:
+        """Late events are inserted at their timestamp position."""
+        log = EventLog()
+        log.append(make_event('a', 1.0))
+        log.append(make_event('c', 3.0))
+        log.append(make_event('b', 2.0))
+        events, total = log.page()
+        self.assertEqual(ids(events), ['a', 'b', 'c'])
+        self.assertEqual(total, 3)
+
+    def test_pages_and_filters(self) -> None:
+        """Pages honour offset, limit, since_timestamp and the filters."""
+        log = EventLog()
+        for i in range(10):
+            log.append(
+                make_event(
+                    f'e{i}',
+                    float(i),
+                    context_id='c1' if i % 2 else 'c2',
+                    actor='agent' if i % 3 else 'user',
+                )
+            )
+        events, total = log.page(offset=2, limit=3)
+        self.assertEqual(ids(events), ['e2', 'e3', 'e4'])
+        self.assertEqual(total, 10)
+        events, total = log.page(since_timestamp=6.0)
+        self.assertEqual(ids(events), ['e7', 'e8', 'e9'])
+        self.assertEqual(total, 3)
+        events, _ = log.page(context_id='c1', limit=2)
+        self.assertEqual(ids(events), ['e1', 'e3'])
+        events, _ = log.page(actor='user')
+        self.assertEqual(ids(events), ['e0', 'e3', 'e6', 'e9'])
+        events, total = log.page(context_id='c1', actor='user')
+        self.assertEqual(ids(events), ['e3', 'e9'])
+        self.assertEqual(total, 2)
+
+    def test_descending_pages(self) -> None:
+        """Descending pages start from the newest event."""
+        log = EventLog()
+        for i in range(10):
+            log.append(
+                make_event(f'e{i}', float(i), context_id='c1' if i % 2 else 'c2')
+            )
+        events, total = log.page(limit=3, descending=True)
+        self.assertEqual(ids(events), ['e9', 'e8', 'e7'])
+        self.assertEqual(total, 10)
+        events, _ = log.page(offset=8, limit=3, descending=True)
+        self.assertEqual(ids(events), ['e1', 'e0'])
+        events, _ = log.page(context_id='c1', limit=2, descending=True)
+        self.assertEqual(ids(events), ['e9', 'e7'])
+        events, _ = log.page(offset=20, limit=3, descending=True)
+        self.assertEqual(events, [])
+
+    def test_evicts_oldest_events(self) -> None:
+        """The log never holds more than max_events events."""
+        log = EventLog(max_events=3)
+        for i in range(5):
+            log.append(make_event(f'e{i}', float(i), context_id=f'c{i}'))
+        self.assertEqual(len(log), 3)
+        self.assertEqual(ids(log.page()[0]), ['e2', 'e3', 'e4'])
+        self.assertEqual(log.page(context_id='c0'), ([], 0))
+
+    def test_evicts_out_of_order_events(self) -> None:
+        """Late events evicted from the middle of the time index."""
+        log = EventLog(max_events=3)
+        for i, timestamp in enumerate([5.0, 1.0, 4.0, 2.0, 3.0, 0.5]):
+            log.append(make_event(f'e{i}', timestamp))
+        self.assertEqual(len(log), 3)
+        self.assertEqual(ids(log.page()[0]), ['e5', 'e3', 'e4'])
+        self.assertEqual(ids(log.page(offset=1, limit=1)[0]), ['e3'])
+        self.assertEqual(ids(log.page(since_timestamp=1.0)[0]), ['e3', 'e4'])
+        self.assertEqual(ids(log.page(descending=True)[0]), ['e4', 'e3', 'e5'])
+        self.assertEqual(log.page(context_id='c1')[1], 3)
+
+    def test_since_cursor(self) -> None:
+        """Cursor reads return only the events appended after it."""
+        log = EventLog()
+        log.append(make_event('a', 1.0))
+        cursor = log.cursor
+        log.append(make_event('b', 2.0))
+        events, new_cursor = log.since(cursor)
+        self.assertEqual(ids(events), ['b'])
+        self.assertEqual(log.since(new_cursor)[0], [])
+
+    def test_cursor_of_previous_process(self) -> None:
+        """A cursor of another log returns the full history."""
+        old = EventLog()
+        old.append(make_event('old', 1.0))
+        log = EventLog()
+        for i in range(3):
+            log.append(make_event(f'e{i}', float(i)))
+        events, cursor = log.since(old.cursor)
+        self.assertEqual(ids(events), ['e0', 'e1', 'e2'])
+        self.assertEqual(log.since(cursor)[0], [])
+
+
+class OrderedSegmentTest(unittest.TestCase):
+    """Tests for the sorted array behind the event log indexes."""
+
+    def test_matches_a_sorted_list(self) -> None:
+        """Random inserts and out-of-order removals read like a list."""
+        rng = random.Random(7)
+        with mock.patch.object(event_log, '_COMPACT_THRESHOLD', 4):
+            segment = _OrderedSegment()
+            expected: list[tuple[float, object]] = []
+            for step in range(2000):
+                if expected and rng.random() < 0.45:
+                    # Half from the head, half anywhere
+                    index = 0
+                    if rng.random() < 0.5:
+                        index = rng.randrange(len(expected))
+                    entry = expected.pop(index)
+                    segment.remove(entry[1])
+                else:
+                    key = float(rng.randrange(100))
+                    item = object()
+                    segment.insert(key, item)
+                    index = bisect.bisect_right([k for k, _ in expected], key)
+                    expected.insert(index, (key, item))
+                items = [item for _, item in expected]
+                self.assertEqual(len(segment), len(items))
+                if not items:
+                    continue
+                self.assertIs(segment.first(), items[0])
+                start = rng.randrange(len(items))
+                stop = rng.randrange(start, len(items) + 1)
+                self.assertEqual(
+                    segment.slice(start, stop), items[start:stop], step
+                )
+                key = float(rng.randrange(100))
+                self.assertEqual(
+                    segment.index_after(key),
+                    bisect.bisect_right([k for k, _ in expected], key),
+                )
+
+
+if __name__ == '__main__':
+    unittest.main()
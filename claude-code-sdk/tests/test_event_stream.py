@@ -0,0 +1,140 @@
+import asyncio
+import json
+import os
+import threading
+import unittest
+
+from unittest import mock
+
+from fastapi import FastAPI
+from service.server.event_stream import EventBroadcaster
+from service.server.server import ConversationServer
+
+
+class FakeRequest:
+    """The parts of a starlette Request used by the SSE endpoint."""
+
+    def __init__(self, query_params: dict[str, str] | None = None):
+        self.query_params = query_params or {}
+        self.disconnected = False
+
+    async def is_disconnected(self) -> bool:
+        return self.disconnected
+
+
+def parse_sse(chunk: str) -> tuple[str, object]:
+    fields = dict(
+        line.split(': ', 1) for line in chunk.strip().splitlines()
+    )
+    return fields['event'], json.loads(fields['data'])
+
+
+class EventBroadcasterTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the state delta fan-out."""
+
+    async def test_publish_reaches_every_subscriber(self) -> None:
+        """Each subscriber gets every item, in publish order."""
+        broadcaster = EventBroadcaster()
+        first = broadcaster.subscribe()
+        second = broadcaster.subscribe()
+        broadcaster.publish('task', 1)
+        broadcaster.publish('message', 2)
+        for subscription in (first, second):
+            self.assertEqual(await subscription.get(), (1, 'task', 1))
+            self.assertEqual(await subscription.get(), (2, 'message', 2))
+
+    async def test_closed_subscription_stops_receiving(self) -> None:
+        """Leaving the context unsubscribes."""
+        broadcaster = EventBroadcaster()
+        with broadcaster.subscribe():
+            self.assertEqual(broadcaster.subscriber_count, 1)
+        self.assertEqual(broadcaster.subscriber_count, 0)
+        # No subscribers, nothing is queued or numbered
+        broadcaster.publish('task', 1)
+
+    async def test_overflow_collapses_into_sync(self) -> None:
+        """A subscriber that falls behind gets a single 'sync'."""
+        broadcaster = EventBroadcaster(max_queue_size=2)
+        subscription = broadcaster.subscribe()
+        for i in range(5):
+            broadcaster.publish('task', i)
+        seq, kind, data = await subscription.get()
+        self.assertEqual((kind, data), ('sync', None))
+        # Items published after the overflow arrive normally
+        broadcaster.publish('task', 'next')
+        self.assertEqual((await subscription.get())[1:], ('task', 'next'))
+
+    async def test_publish_from_another_thread(self) -> None:
+        """Items published off the loop are handed over to it."""
+        broadcaster = EventBroadcaster()
+        subscription = broadcaster.subscribe()
+        thread = threading.Thread(
+            target=broadcaster.publish, args=('task', 'threaded')
+        )
+        thread.start()
+        thread.join()
+        item = await asyncio.wait_for(subscription.get(), timeout=1)
+        self.assertEqual(item[1:], ('task', 'threaded'))
+
+
+class StreamEventsEndpointTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the /events/stream SSE endpoint."""
+
+    def setUp(self) -> None:
+        with mock.patch.dict(os.environ, {'A2A_HOST': 'fake'}):
+            self.server = ConversationServer(FastAPI(), None)
+        self.manager = self.server.manager
+
+    async def open_stream(self, request: FakeRequest):
+        response = await self.server._stream_events(request)
+        self.assertEqual(response.media_type, 'text/event-stream')
+        return response.body_iterator
+
+    async def test_sync_on_connect(self) -> None:
+        """A new connection starts with a full 'sync'."""
+        stream = await self.open_stream(FakeRequest())
+        self.assertEqual(parse_sse(await anext(stream)), ('sync', None))
+        self.assertEqual(self.manager.event_stream.subscriber_count, 1)
+        await stream.aclose()
+        self.assertEqual(self.manager.event_stream.subscriber_count, 0)
+
+    async def test_streams_published_deltas(self) -> None:
+        """Deltas published by the manager are pushed as SSE messages."""
+        stream = await self.open_stream(FakeRequest())
+        await anext(stream)
+        conversation = self.manager.create_conversation()
+        kind, data = parse_sse(await anext(stream))
+        self.assertEqual(kind, 'conversation')
+        self.assertEqual(
+            data['conversation_id'], conversation.conversation_id
+        )
+        await stream.aclose()
+
+    async def test_kinds_filter(self) -> None:
+        """Only the requested kinds, and 'sync', are forwarded."""
+        stream = await self.open_stream(FakeRequest({'kinds': 'pending'}))
+        await anext(stream)
+        self.manager.create_conversation()
+        self.manager.event_stream.publish('task_ignored', None)
+        self.manager.event_stream.publish('pending', [['m1', '']])
+        self.manager.event_stream.publish('sync', None)
+        self.assertEqual(
+            parse_sse(await anext(stream)), ('pending', [['m1', '']])
+        )
+        self.assertEqual(parse_sse(await anext(stream)), ('sync', None))
+        await stream.aclose()
+
+    async def test_stops_when_client_disconnects(self) -> None:
+        """The stream ends and unsubscribes once the client is gone."""
+        request = FakeRequest()
+        stream = await self.open_stream(request)
+        await anext(stream)
+        request.disconnected = True
+        self.manager.event_stream.publish('pending', [])
+        with self.assertRaises(StopAsyncIteration):
+            await anext(stream)
+        self.assertEqual(self.manager.event_stream.subscriber_count, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
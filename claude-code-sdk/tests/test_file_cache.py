@@ -0,0 +1,223 @@
+import asyncio
+import base64
+import os
+import tempfile
+import unittest
+
+from unittest import mock
+
+from a2a.types import FilePart, FileWithBytes, Message, Part, Role
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from service.server import server as server_module
+from service.server.file_cache import FileCache
+from service.server.server import ConversationServer, parse_range
+
+
+class ParseRangeTest(unittest.TestCase):
+    """Tests for the Range header parsing of /message/file."""
+
+    def test_whole_file(self) -> None:
+        """No header, or a unit other than bytes, means the whole file."""
+        self.assertIsNone(parse_range(None, 100))
+        self.assertIsNone(parse_range('items=0-1', 100))
+        self.assertIsNone(parse_range('bytes=a-b', 100))
+
+    def test_closed_range(self) -> None:
+        self.assertEqual(parse_range('bytes=10-19', 100), (10, 19))
+        # The end is clamped to the last byte
+        self.assertEqual(parse_range('bytes=90-500', 100), (90, 99))
+
+    def test_open_ended_range(self) -> None:
+        self.assertEqual(parse_range('bytes=40-', 100), (40, 99))
+
+    def test_suffix_range(self) -> None:
+        """'-N' is the last N bytes, the whole file when N exceeds it."""
+        self.assertEqual(parse_range('bytes=-10', 100), (90, 99))
+        self.assertEqual(parse_range('bytes=-500', 100), (0, 99))
+
+    def test_only_first_range_is_served(self) -> None:
+        self.assertEqual(parse_range('bytes=0-4, 10-14', 100), (0, 4))
+
+    def test_unsatisfiable(self) -> None:
+        self.assertEqual(parse_range('bytes=100-', 100), 'invalid')
+        self.assertEqual(parse_range('bytes=20-10', 100), 'invalid')
+        self.assertEqual(parse_range('bytes=-0', 100), 'invalid')
+
+
+class FileCacheTest(unittest.TestCase):
+    """Tests for the content addressed FileCache."""
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_identical_payloads_share_a_digest(self) -> None:
+        cache = FileCache(self.directory.name)
+        first = cache.put(b'same', 'text/plain')
+        self.assertEqual(cache.put(b'same', 'text/plain'), first)
+        self.assertEqual(cache.memory_bytes, 4)
+        self.assertIsNone(cache.get('not-a-digest'))
+        self.assertIsNone(cache.get('0' * 64))
+
+    def test_memory_is_bounded(self) -> None:
+        """Past the budget the least recently used files leave memory."""
+        cache = FileCache(self.directory.name, memory_budget=20)
+        a = cache.put(b'a' * 8, 'text/plain')
+        b = cache.put(b'b' * 8, 'image/png')
+        cache.get(a)
+        c = cache.put(b'c' * 8, 'text/plain')
+        self.assertEqual(list(cache._memory), [a, c])
+        self.assertEqual(cache.memory_bytes, 16)
+        # The evicted file, and its MIME type, are read back from disk
+        cached = cache.get(b)
+        self.assertEqual(cached.mime_type, 'image/png')
+        self.assertEqual(b''.join(cached.iter_range()), b'b' * 8)
+        self.assertEqual(list(cache._memory), [c, b])
+
+    def test_large_files_stay_on_disk(self) -> None:
+        cache = FileCache(self.directory.name, max_memory_item=4)
+        digest = cache.put(b'0123456789', 'application/pdf')
+        self.assertEqual(cache.memory_bytes, 0)
+        cached = cache.get(digest)
+        self.assertIsNone(cached.data)
+        self.assertEqual(cached.mime_type, 'application/pdf')
+        self.assertEqual(b''.join(cached.iter_range(2, 5)), b'2345')
+
+    def test_mime_types_are_evicted_with_the_bytes(self) -> None:
+        """Nothing per digest outlives the memory budget."""
+        cache = FileCache(self.directory.name, memory_budget=8)
+        for i in range(50):
+            cache.put(b'%08d' % i, 'text/plain')
+        self.assertEqual(len(cache._memory), 1)
+
+    def test_disk_is_bounded(self) -> None:
+        """Past the disk budget the least recently used files are deleted."""
+        cache = FileCache(self.directory.name, disk_budget=20)
+        a = cache.put(b'a' * 8, 'text/plain')
+        b = cache.put(b'b' * 8, 'image/png')
+        cache.get(a)
+        c = cache.put(b'c' * 8, 'text/plain')
+        self.assertEqual(cache.disk_bytes, 16)
+        self.assertFalse(os.path.exists(cache._path(b)))
+        self.assertFalse(os.path.exists(cache._path(b) + '.type'))
+        self.assertIsNone(cache.get(b))
+        self.assertEqual(cache.get(a).mime_type, 'text/plain')
+        self.assertEqual(b''.join(cache.get(c).iter_range()), b'c' * 8)
+
+    def test_files_of_earlier_runs_count(self) -> None:
+        """A new cache indexes the files on disk and prunes the oldest."""
+        cache = FileCache(self.directory.name)
+        old = cache.put(b'old data', 'text/plain')
+        new = cache.put(b'new data', 'text/plain')
+        os.utime(cache._path(old), (1, 1))
+        # Left behind by a write that never finished
+        leftover = os.path.join(
+            os.path.dirname(cache._path(new)), '.tmpabc'
+        )
+        open(leftover, 'wb').close()
+        cache = FileCache(self.directory.name, disk_budget=10)
+        self.assertEqual(cache.disk_bytes, 8)
+        self.assertIsNone(cache.get(old))
+        self.assertEqual(cache.get(new).mime_type, 'text/plain')
+        self.assertFalse(os.path.exists(leftover))
+
+
+class CacheFilesTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for caching the file parts of listed messages."""
+
+    async def test_large_payloads_are_cached_off_the_loop(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        with mock.patch.dict(
+            os.environ,
+            {'A2A_HOST': 'fake', 'A2A_UI_FILE_CACHE_DIR': directory.name},
+        ):
+            server = ConversationServer(FastAPI(), None)
+        payload = bytes(range(256)) * 4
+        message = Message(
+            message_id='m1',
+            role=Role.agent,
+            metadata={'message_id': 'm1'},
+            parts=[
+                Part(
+                    root=FilePart(
+                        file=FileWithBytes(
+                            bytes=base64.b64encode(payload).decode(),
+                            mime_type='image/png',
+                        )
+                    )
+                )
+            ],
+        )
+        with (
+            mock.patch.object(server_module, 'OFFLOAD_FILE_SIZE', 100),
+            mock.patch.object(
+                server_module.asyncio, 'to_thread', wraps=asyncio.to_thread
+            ) as to_thread,
+        ):
+            await server.cache_files([message])
+        to_thread.assert_called_once()
+        # cache_content reuses the stored digest
+        with mock.patch.object(server._file_cache, 'put') as put:
+            (cached,) = server.cache_content([message])
+        put.assert_not_called()
+        digest = cached.parts[0].root.file.uri.rsplit('/', 1)[1]
+        stored = server._file_cache.get(digest)
+        self.assertEqual(b''.join(stored.iter_range()), payload)
+
+
+class FileEndpointTest(unittest.TestCase):
+    """Tests for ETag and Range handling of /message/file/{id}."""
+
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        app = FastAPI()
+        with mock.patch.dict(
+            os.environ,
+            {'A2A_HOST': 'fake', 'A2A_UI_FILE_CACHE_DIR': directory.name},
+        ):
+            server = ConversationServer(app, None)
+        self.client = TestClient(app)
+        self.payload = bytes(range(100))
+        self.digest = server._file_cache.put(self.payload, 'image/png')
+        self.url = f'/message/file/{self.digest}'
+
+    def test_full_response(self) -> None:
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, self.payload)
+        self.assertEqual(response.headers['etag'], f'"{self.digest}"')
+        self.assertEqual(response.headers['content-type'], 'image/png')
+        self.assertIn('immutable', response.headers['cache-control'])
+
+    def test_not_modified(self) -> None:
+        response = self.client.get(
+            self.url, headers={'If-None-Match': f'"{self.digest}"'}
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        stale = self.client.get(self.url, headers={'If-None-Match': '"x"'})
+        self.assertEqual(stale.status_code, 200)
+
+    def test_partial_content(self) -> None:
+        response = self.client.get(self.url, headers={'Range': 'bytes=-10'})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.content, self.payload[-10:])
+        self.assertEqual(
+            response.headers['content-range'], 'bytes 90-99/100'
+        )
+
+    def test_range_not_satisfiable(self) -> None:
+        response = self.client.get(self.url, headers={'Range': 'bytes=200-'})
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response.headers['content-range'], 'bytes */100')
+
+    def test_unknown_file(self) -> None:
+        response = self.client.get('/message/file/' + '0' * 64)
+        self.assertEqual(response.status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
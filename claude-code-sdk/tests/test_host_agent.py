@@ -0,0 +1,129 @@
+import json
+import threading
+import unittest
+
+import httpx
+
+from a2a.types import AgentCapabilities, AgentCard
+from hosts.multiagent.host_agent import HostAgent
+
+
+def make_card(name: str, description: str = '') -> AgentCard:
+    return AgentCard(
+        name=name,
+        description=description or f'{name} agent',
+        url=f'http://localhost/{name}',
+        version='1.0.0',
+        capabilities=AgentCapabilities(),
+        default_input_modes=['text'],
+        default_output_modes=['text'],
+        skills=[],
+    )
+
+
+def names(agents: str) -> list[str]:
+    return [json.loads(line)['name'] for line in agents.splitlines()]
+
+
+class HostAgentTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for in place agent changes of the HostAgent."""
+
+    async def asyncSetUp(self) -> None:
+        self.client = httpx.AsyncClient()
+        self.host = HostAgent([], self.client)
+
+    async def asyncTearDown(self) -> None:
+        await self.client.aclose()
+
+    async def test_register_and_replace(self) -> None:
+        """Replacing a card keeps the connections of the other agents."""
+        self.host.register_agent_card(make_card('a'))
+        self.host.register_agent_card(make_card('b'))
+        connection_a = self.host.remote_agent_connections['a']
+        connection_b = self.host.remote_agent_connections['b']
+
+        # Registering an identical card is a no-op
+        cards = self.host.cards
+        self.host.register_agent_card(make_card('a'))
+        self.assertIs(self.host.cards, cards)
+
+        self.host.register_agent_card(make_card('a', 'changed'))
+        self.assertIsNot(self.host.remote_agent_connections['a'], connection_a)
+        self.assertIs(self.host.remote_agent_connections['b'], connection_b)
+        self.assertEqual(self.host.cards['a'].description, 'changed')
+
+    async def test_remove_agent_card(self) -> None:
+        self.host.register_agent_card(make_card('a'))
+        self.host.register_agent_card(make_card('b'))
+        self.host.set_agent_enabled('a', False)
+        self.assertTrue(self.host.remove_agent_card('a'))
+        self.assertEqual(list(self.host.cards), ['b'])
+        self.assertEqual(list(self.host.remote_agent_connections), ['b'])
+        self.assertNotIn('a', self.host.disabled_agents)
+        self.assertFalse(self.host.remove_agent_card('a'))
+
+    async def test_set_enabled(self) -> None:
+        """Disabled agents are hidden from the model, not disconnected."""
+        self.host.register_agent_card(make_card('a'))
+        self.host.register_agent_card(make_card('b'))
+        self.host.set_agent_enabled('a', False)
+        self.assertEqual(self.host.disabled_agents, {'a'})
+        self.assertEqual(
+            [x['name'] for x in self.host.list_remote_agents()], ['b']
+        )
+        self.assertIn('a', self.host.remote_agent_connections)
+
+        # Repeating a state keeps the same set, the description stays cached
+        disabled = self.host.disabled_agents
+        self.host.set_agent_enabled('a', False)
+        self.assertIs(self.host.disabled_agents, disabled)
+
+        self.host.set_agent_enabled('a', True)
+        self.assertEqual(self.host.disabled_agents, set())
+        self.assertEqual(
+            [x['name'] for x in self.host.list_remote_agents()], ['a', 'b']
+        )
+
+    async def test_agents_description_is_lazy(self) -> None:
+        """The description is built once and rebuilt after each change."""
+        self.host.register_agent_card(make_card('a'))
+        first = self.host.agents
+        self.assertEqual(names(first), ['a'])
+        self.assertIs(self.host.agents, first)
+
+        self.host.register_agent_card(make_card('b'))
+        self.assertEqual(names(self.host.agents), ['a', 'b'])
+        self.host.set_agent_enabled('a', False)
+        self.assertEqual(names(self.host.agents), ['b'])
+        self.host.remove_agent_card('b')
+        self.assertEqual(self.host.agents, '')
+
+    async def test_changes_from_another_thread(self) -> None:
+        """Readers iterate a stable snapshot while a thread registers."""
+        stop = threading.Event()
+
+        def register():
+            i = 0
+            while not stop.is_set():
+                name = f'agent{i % 50}'
+                self.host.register_agent_card(make_card(name, str(i)))
+                self.host.set_agent_enabled(name, i % 2 == 0)
+                if i % 7 == 0:
+                    self.host.remove_agent_card(name)
+                i += 1
+
+        thread = threading.Thread(target=register)
+        thread.start()
+        try:
+            for _ in range(2000):
+                # Iterating a dict changed by another thread would raise
+                listed = self.host.list_remote_agents()
+                self.assertLessEqual(len(listed), 50)
+                names(self.host.agents)
+        finally:
+            stop.set()
+            thread.join()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import asyncio
+import time
+import unittest
+
+from service.client import http_pool
+
+
+class HttpPoolTest(unittest.TestCase):
+    """Tests for the per-loop httpx client pool of the UI."""
+
+    def tearDown(self) -> None:
+        http_pool._clients.clear()
+
+    def test_scoped_client_is_dropped_with_its_loop(self) -> None:
+        """Short-lived loops leave no pooled client behind."""
+
+        async def handler():
+            async with http_pool.scoped_http_client() as client:
+                # Nested callers share the scoped client
+                self.assertIs(http_pool.get_http_client(), client)
+                return client
+
+        clients = [asyncio.run(handler()) for _ in range(5)]
+        self.assertEqual(len(http_pool._clients), 0)
+        self.assertTrue(all(client.is_closed for client in clients))
+
+    def test_scope_keeps_an_existing_client_open(self) -> None:
+        """A scope on a loop that already pools a client leaves it open."""
+
+        async def main():
+            pooled = http_pool.get_http_client()
+            async with http_pool.scoped_http_client() as client:
+                self.assertIs(client, pooled)
+            self.assertFalse(pooled.is_closed)
+            self.assertIs(http_pool.get_http_client(), pooled)
+            await http_pool.close_http_clients()
+            return pooled
+
+        pooled = asyncio.run(main())
+        self.assertTrue(pooled.is_closed)
+        self.assertEqual(len(http_pool._clients), 0)
+
+    def test_clients_of_closed_loops_are_dropped(self) -> None:
+        """Unscoped clients do not accumulate across closed loops."""
+
+        async def unscoped():
+            return http_pool.get_http_client()
+
+        clients = [asyncio.run(unscoped()) for _ in range(5)]
+        # Only the client of the last loop is left until the next lookup
+        self.assertEqual(len(http_pool._clients), 1)
+        asyncio.run(unscoped())
+        self.assertEqual(len(http_pool._clients), 1)
+        # Dropped clients are closed, not just forgotten
+        deadline = time.monotonic() + 5
+        while not all(c.is_closed for c in clients):
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def test_decorated_handlers_close_their_client(self) -> None:
+        """scoped_http_client() also works as a decorator."""
+
+        @http_pool.scoped_http_client()
+        async def handler():
+            return http_pool.get_http_client()
+
+        clients = [asyncio.run(handler()) for _ in range(3)]
+        self.assertTrue(all(client.is_closed for client in clients))
+        self.assertEqual(len(http_pool._clients), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
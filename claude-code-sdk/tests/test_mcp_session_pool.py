@@ -0,0 +1,99 @@
+import asyncio
+import unittest
+
+from contextlib import asynccontextmanager
+
+from a2a_mcp.mcp.session_pool import MCPSessionPool
+
+
+class FakeSession:
+    def __init__(self, number: int):
+        self.number = number
+        self.broken = False
+        self.pings = 0
+
+    async def send_ping(self):
+        self.pings += 1
+        if self.broken:
+            raise ConnectionError('ping failed')
+
+    async def call(self):
+        if self.broken:
+            raise ConnectionError('stream closed')
+        return self.number
+
+
+class MCPSessionPoolTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the pooled MCP client sessions."""
+
+    async def asyncSetUp(self) -> None:
+        self.opened: list[FakeSession] = []
+        self.closed: list[FakeSession] = []
+
+        @asynccontextmanager
+        async def connect(host, port, transport):
+            await asyncio.sleep(0)
+            session = FakeSession(len(self.opened))
+            self.opened.append(session)
+            try:
+                yield session
+            finally:
+                self.closed.append(session)
+
+        self.connect = connect
+
+    async def call(self, session: FakeSession) -> int:
+        return await session.call()
+
+    async def test_reuses_sessions(self) -> None:
+        """Sequential calls share one initialized session."""
+        pool = MCPSessionPool('localhost', 1, 'sse', connect=self.connect)
+        for _ in range(5):
+            self.assertEqual(await pool.call(self.call), 0)
+        self.assertEqual(len(self.opened), 1)
+        await pool.close()
+        self.assertEqual(self.closed, self.opened)
+
+    async def test_bounds_concurrent_sessions(self) -> None:
+        """Concurrent callers open at most max_sessions sessions."""
+        pool = MCPSessionPool(
+            'localhost', 1, 'sse', max_sessions=2, connect=self.connect
+        )
+
+        async def slow(session: FakeSession) -> int:
+            await asyncio.sleep(0.01)
+            return session.number
+
+        await asyncio.gather(*(pool.call(slow) for _ in range(6)))
+        self.assertEqual(len(self.opened), 2)
+        await pool.close()
+
+    async def test_reconnects_after_transport_failure(self) -> None:
+        """A broken session is replaced and the call retried."""
+        pool = MCPSessionPool('localhost', 1, 'sse', connect=self.connect)
+        await pool.call(self.call)
+        self.opened[0].broken = True
+        self.assertEqual(await pool.call(self.call), 1)
+        self.assertIn(self.opened[0], self.closed)
+        await pool.close()
+
+    async def test_health_check_on_idle_sessions(self) -> None:
+        """Idle sessions are pinged and dropped when the ping fails."""
+        pool = MCPSessionPool(
+            'localhost',
+            1,
+            'sse',
+            health_check_interval=0,
+            connect=self.connect,
+        )
+        await pool.call(self.call)
+        await pool.call(self.call)
+        self.assertEqual(self.opened[0].pings, 1)
+        self.opened[0].broken = True
+        self.assertEqual(await pool.call(self.call), 1)
+        self.assertEqual(len(self.opened), 2)
+        await pool.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
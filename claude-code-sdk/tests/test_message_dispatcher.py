@@ -0,0 +1,66 @@
+import asyncio
+import unittest
+
+from a2a.types import Message, Part, Role, TextPart
+from service.server.message_dispatcher import (
+    DispatcherFullError,
+    MessageDispatcher,
+)
+
+
+def make_message(message_id: str, context_id: str) -> Message:
+    return Message(
+        role=Role.user,
+        parts=[Part(root=TextPart(text=message_id))],
+        message_id=message_id,
+        context_id=context_id,
+    )
+
+
+class MessageDispatcherTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the bounded message dispatcher."""
+
+    async def test_orders_messages_per_conversation(self) -> None:
+        """Messages of one conversation never overlap and keep their order."""
+        processed: list[str] = []
+        running: set[str] = set()
+
+        async def handler(message: Message) -> None:
+            self.assertNotIn(message.context_id, running)
+            running.add(message.context_id)
+            await asyncio.sleep(0.01)
+            processed.append(message.message_id)
+            running.discard(message.context_id)
+
+        dispatcher = MessageDispatcher(handler, max_concurrency=4)
+        for i in range(3):
+            dispatcher.submit(make_message(f"a{i}", "a"))
+            dispatcher.submit(make_message(f"b{i}", "b"))
+        while dispatcher.metrics()["processed"] < 6:
+            await asyncio.sleep(0.01)
+        await dispatcher.stop()
+
+        self.assertEqual([x for x in processed if x[0] == "a"], ["a0", "a1", "a2"])
+        self.assertEqual([x for x in processed if x[0] == "b"], ["b0", "b1", "b2"])
+
+    async def test_rejects_when_full(self) -> None:
+        """Submitting beyond the queue size raises DispatcherFullError."""
+        release = asyncio.Event()
+
+        async def handler(message: Message) -> None:
+            await release.wait()
+
+        dispatcher = MessageDispatcher(
+            handler, max_concurrency=1, max_queue_size=2
+        )
+        dispatcher.submit(make_message("m0", "c"))
+        dispatcher.submit(make_message("m1", "c"))
+        with self.assertRaises(DispatcherFullError):
+            dispatcher.submit(make_message("m2", "c"))
+        self.assertEqual(dispatcher.metrics()["rejected"], 1)
+        release.set()
+        await dispatcher.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
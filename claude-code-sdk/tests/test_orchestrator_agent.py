@@ -0,0 +1,121 @@
+import asyncio
+import json
+import time
+import unittest
+
+from types import SimpleNamespace
+from unittest import mock
+
+from a2a_mcp.agents.orchestrator_agent import (
+    OrchestratorAgent,
+    OrchestratorSession,
+)
+
+
+class FakeModels:
+    def __init__(self):
+        self.calls = 0
+
+    async def generate_content_stream(self, model, contents, config):
+        self.calls += 1
+
+        async def chunks():
+            for text in ('Your trip ', '', 'is booked.'):
+                await asyncio.sleep(0.01)
+                yield SimpleNamespace(text=text)
+
+        return chunks()
+
+    async def generate_content(self, model, contents, config):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return SimpleNamespace(
+            text=json.dumps({'can_answer': 'yes', 'answer': 'economy'})
+        )
+
+
+class OrchestratorAgentTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the orchestrator's model calls."""
+
+    def setUp(self) -> None:
+        self.agent = OrchestratorAgent()
+        self.models = FakeModels()
+        self.agent._llm = SimpleNamespace(
+            aio=SimpleNamespace(models=self.models)
+        )
+
+    async def test_summary_is_streamed(self) -> None:
+        """Partial chunks first, the whole summary as the final result."""
+        session = OrchestratorSession(results=['flight'])
+        items = [item async for item in self.agent.stream_summary(session)]
+        self.assertEqual(
+            [item['content'] for item in items],
+            ['Your trip ', 'is booked.', 'Your trip is booked.'],
+        )
+        self.assertEqual(
+            [item['is_task_complete'] for item in items], [False, False, True]
+        )
+        self.assertTrue(all(item['response_type'] == 'text' for item in items))
+
+    async def test_model_calls_do_not_block_the_loop(self) -> None:
+        """Other tasks keep running while the model answers."""
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.001)
+                ticks += 1
+
+        ticking = asyncio.create_task(ticker())
+        session = OrchestratorSession()
+        answers = await asyncio.gather(
+            *(
+                self.agent.answer_user_question(session, 'Which class?')
+                for _ in range(3)
+            )
+        )
+        ticking.cancel()
+        self.assertEqual(json.loads(answers[0])['answer'], 'economy')
+        self.assertGreater(ticks, 3)
+        # One client reused by every call
+        self.assertIs(self.agent.llm.aio.models, self.models)
+        self.assertEqual(self.models.calls, 3)
+
+    async def test_contexts_run_independently(self) -> None:
+        """Conversations run concurrently, each on its own state."""
+        runs = []
+
+        async def run(session, query, context_id, task_id):
+            session.query_history.append(query)
+            runs.append((context_id, time.monotonic()))
+            await asyncio.sleep(0.05)
+            yield {'content': list(session.query_history)}
+
+        async def collect(query, context_id):
+            return [
+                item
+                async for item in self.agent.stream(query, context_id, 'task')
+            ]
+
+        with mock.patch.object(self.agent, '_run', run):
+            start = time.monotonic()
+            a, b = await asyncio.gather(
+                collect('a1', 'ctx-a'), collect('b1', 'ctx-b')
+            )
+            self.assertLess(time.monotonic() - start, 0.09)
+            self.assertEqual(a[0]['content'], ['a1'])
+            self.assertEqual(b[0]['content'], ['b1'])
+
+            # The same conversation is serialized and keeps its history
+            start = time.monotonic()
+            first, second = await asyncio.gather(
+                collect('a2', 'ctx-a'), collect('a3', 'ctx-a')
+            )
+            self.assertGreaterEqual(time.monotonic() - start, 0.1)
+            self.assertEqual(second[0]['content'], ['a1', 'a2', 'a3'])
+        self.assertEqual(len(self.agent.sessions), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
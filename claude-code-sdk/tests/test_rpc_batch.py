@@ -0,0 +1,139 @@
+import os
+import unittest
+
+from unittest import mock
+
+from a2a.types import Message, Part, Role, TextPart
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from service.server.server import ConversationServer
+
+
+class RpcBatchTest(unittest.TestCase):
+    """Tests for the /rpc/batch endpoint of the ConversationServer."""
+
+    def setUp(self) -> None:
+        app = FastAPI()
+        with mock.patch.dict(os.environ, {'A2A_HOST': 'fake'}):
+            self.server = ConversationServer(app, None)
+        self.client = TestClient(app)
+        self.conversation = self.server.manager.create_conversation()
+
+    def post(self, body) -> list | dict:
+        response = self.client.post('/rpc/batch', json=body)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_one_response_per_call_in_order(self) -> None:
+        """Responses keep the ids and the order of the calls."""
+        responses = self.post(
+            [
+                {'jsonrpc': '2.0', 'id': 'a', 'method': 'task/list'},
+                {
+                    'jsonrpc': '2.0',
+                    'id': 'b',
+                    'method': 'message/list',
+                    'params': {
+                        'conversation_id': self.conversation.conversation_id
+                    },
+                },
+                {'jsonrpc': '2.0', 'id': 'c', 'method': 'conversation/list'},
+                {'jsonrpc': '2.0', 'id': 'd', 'method': 'message/pending'},
+            ]
+        )
+        self.assertEqual([r['id'] for r in responses], ['a', 'b', 'c', 'd'])
+        self.assertTrue(all('error' not in r for r in responses))
+        self.assertEqual(
+            [c['conversation_id'] for c in responses[2]['result']],
+            [self.conversation.conversation_id],
+        )
+        self.assertEqual(responses[1]['result'], [])
+
+    def test_mixed_valid_and_invalid_calls(self) -> None:
+        """Invalid calls get their own error, the others still succeed."""
+        responses = self.post(
+            [
+                {'jsonrpc': '2.0', 'id': 1, 'method': 'conversation/list'},
+                {'jsonrpc': '2.0', 'id': 2, 'method': 'message/send'},
+                'not a call',
+                {'jsonrpc': '2.0', 'id': 4},
+                {
+                    'jsonrpc': '2.0',
+                    'id': 5,
+                    'method': 'task/list',
+                    'params': {'offset': 'not a number'},
+                },
+                {'jsonrpc': '2.0', 'id': 6, 'method': 'task/list'},
+            ]
+        )
+        self.assertEqual(len(responses), 6)
+        self.assertIn('result', responses[0])
+        self.assertEqual(responses[1]['error']['code'], -32601)
+        self.assertEqual(responses[1]['id'], 2)
+        self.assertEqual(responses[2]['error']['code'], -32600)
+        self.assertEqual(responses[3]['error']['code'], -32600)
+        self.assertEqual(responses[4]['error']['code'], -32603)
+        self.assertEqual(responses[4]['id'], 5)
+        self.assertEqual(responses[5]['id'], 6)
+        self.assertNotIn('error', responses[5])
+
+    def test_empty_batch(self) -> None:
+        """An empty batch is a single Invalid Request error."""
+        response = self.post([])
+        self.assertEqual(response['error']['code'], -32600)
+        self.assertIsNone(response.get('id'))
+
+    def test_not_a_list(self) -> None:
+        """A single call object is not a batch."""
+        response = self.post({'jsonrpc': '2.0', 'method': 'task/list'})
+        self.assertEqual(response['error']['code'], -32600)
+
+    def test_parse_error(self) -> None:
+        """A body that is not JSON is a single Parse error."""
+        response = self.client.post(
+            '/rpc/batch',
+            content=b'[{"method": ',
+            headers={'Content-Type': 'application/json'},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['error']['code'], -32700)
+
+    def test_conversation_delta_carries_message_ids(self) -> None:
+        """A conversation delta ships ids, message/list ships the messages."""
+        manager = self.server.manager
+        conversation_id = self.conversation.conversation_id
+
+        def call(method: str, params: dict) -> dict:
+            call = {'jsonrpc': '2.0', 'id': 1, 'method': method}
+            return self.post([{**call, 'params': params}])[0]
+
+        def append(message_id: str) -> None:
+            manager._store.append_conversation_message(
+                self.conversation,
+                Message(
+                    role=Role.user,
+                    parts=[Part(root=TextPart(text=message_id))],
+                    message_id=message_id,
+                    context_id=conversation_id,
+                ),
+            )
+
+        append('m1')
+        listed = call('conversation/list', {})
+        message_cursor = call(
+            'message/list', {'conversation_id': conversation_id}
+        )['cursor']
+        append('m2')
+        delta = call('conversation/list', {'since': listed['cursor']})
+        self.assertEqual(len(delta['result']), 1)
+        self.assertNotIn('messages', delta['result'][0])
+        self.assertEqual(delta['result'][0]['message_ids'], ['m1', 'm2'])
+        messages = call(
+            'message/list',
+            {'conversation_id': conversation_id, 'since': message_cursor},
+        )
+        self.assertEqual([m['messageId'] for m in messages['result']], ['m2'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+from a2a_mcp.common.session_table import SessionTable
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class SessionTableTest(unittest.TestCase):
+    """Tests for the per-context session LRU."""
+
+    def setUp(self) -> None:
+        self.clock = Clock()
+        self.busy: set[int] = set()
+        self.table = SessionTable(
+            dict,
+            max_sessions=2,
+            ttl=10,
+            busy=lambda session: id(session) in self.busy,
+            clock=self.clock,
+        )
+
+    def test_sessions_are_per_key(self) -> None:
+        a = self.table.get('a')
+        a['x'] = 1
+        self.assertIs(self.table.get('a'), a)
+        self.assertEqual(self.table.get('b'), {})
+
+    def test_least_recently_used_is_dropped(self) -> None:
+        a = self.table.get('a')
+        self.table.get('b')
+        self.table.get('a')
+        self.table.get('c')
+        self.assertNotIn('b', self.table)
+        self.assertIs(self.table.get('a'), a)
+
+    def test_idle_sessions_expire(self) -> None:
+        a = self.table.get('a')
+        self.clock.now = 5
+        self.table.get('b')
+        self.clock.now = 12
+        self.assertIsNot(self.table.get('a'), a)
+        self.assertIn('b', self.table)
+
+    def test_busy_sessions_are_kept(self) -> None:
+        a = self.table.get('a')
+        self.busy.add(id(a))
+        self.clock.now = 20
+        self.table.get('b')
+        self.table.get('c')
+        self.assertIs(self.table.get('a'), a)
+        self.assertNotIn('b', self.table)
+
+
+if __name__ == '__main__':
+    unittest.main()
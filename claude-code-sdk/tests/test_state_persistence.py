@@ -0,0 +1,237 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from a2a.types import Message, Part, Role, Task, TaskState, TaskStatus, TextPart
+from service.server.persistence import StatePersistence
+from service.server.state_store import StateStore
+from service.types import Conversation
+
+
+def make_message(message_id: str, context_id: str) -> Message:
+    return Message(
+        role=Role.user,
+        parts=[Part(root=TextPart(text=message_id))],
+        message_id=message_id,
+        context_id=context_id,
+    )
+
+
+class StatePersistenceTest(unittest.TestCase):
+    """Tests for the SQLite backed StateStore."""
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'state.db')
+        self.persistence = StatePersistence(self.path)
+
+    def tearDown(self) -> None:
+        self.persistence.close()
+        self.directory.cleanup()
+
+    def reopen(self, max_loaded_conversations: int = 100) -> StateStore:
+        self.persistence.close()
+        self.persistence = StatePersistence(self.path)
+        store = StateStore(
+            self.persistence, max_loaded_conversations=max_loaded_conversations
+        )
+        store.load()
+        return store
+
+    def add_conversation(self, store: StateStore, conversation_id: str):
+        conversation = Conversation(
+            conversation_id=conversation_id, is_active=True
+        )
+        store.add_conversation(conversation)
+        store.append_conversation_message(
+            conversation, make_message(f'm-{conversation_id}', conversation_id)
+        )
+        store.add_task(
+            Task(
+                id=f't-{conversation_id}',
+                context_id=conversation_id,
+                status=TaskStatus(state=TaskState.working),
+            )
+        )
+        store.attach_message_to_task(
+            f'm-{conversation_id}', f't-{conversation_id}'
+        )
+
+    def test_restores_state(self) -> None:
+        """Conversations, messages and tasks survive a restart."""
+        store = StateStore(self.persistence)
+        self.add_conversation(store, 'c1')
+        store = self.reopen()
+        conversation = store.get_conversation('c1')
+        self.assertEqual(
+            [m.message_id for m in conversation.messages], ['m-c1']
+        )
+        self.assertEqual(store.get_task('t-c1').status.state, TaskState.working)
+        self.assertEqual(store.task_id_for_message('m-c1'), 't-c1')
+
+    def test_evicts_and_reloads_histories(self) -> None:
+        """Only the messages of the most recent conversations stay."""
+        evicted: list[str] = []
+        store = StateStore(
+            self.persistence,
+            max_loaded_conversations=1,
+            on_evict=evicted.append,
+        )
+        self.add_conversation(store, 'c1')
+        self.add_conversation(store, 'c2')
+        self.assertEqual(evicted, ['c1'])
+        self.assertEqual(store.conversations[0].messages, [])
+        # Tasks are never evicted, listings and totals keep them
+        self.assertEqual([t.id for t in store.tasks], ['t-c1', 't-c2'])
+        self.assertEqual(store.page_tasks(limit=1)[1], 2)
+        self.assertEqual(len(store.tasks_since(None)[0]), 2)
+        self.assertEqual(store.tasks_for_context('c1')[0].id, 't-c1')
+        self.assertEqual(store.task_id_for_message('m-c1'), 't-c1')
+        conversation = store.get_conversation('c1')
+        self.assertEqual(
+            [m.message_id for m in conversation.messages], ['m-c1']
+        )
+
+    def test_lazy_history_on_restart(self) -> None:
+        """A restart only loads the histories of recent conversations."""
+        store = StateStore(self.persistence)
+        self.add_conversation(store, 'c1')
+        self.add_conversation(store, 'c2')
+        store = self.reopen(max_loaded_conversations=1)
+        self.assertEqual(len(store.conversations), 2)
+        self.assertEqual(store.conversations[0].messages, [])
+        # Task bodies and the message index are read on first access
+        self.assertEqual(len(store._task_bodies), 0)
+        self.assertEqual([t.id for t in store.tasks], ['t-c1', 't-c2'])
+        self.assertEqual(store.task_id_for_message('m-c1'), 't-c1')
+        self.assertEqual(len(store.get_conversation('c1').messages), 1)
+
+    def test_evicts_task_bodies(self) -> None:
+        """Only recent task bodies stay, states answer the filters."""
+        store = StateStore(self.persistence, max_loaded_tasks=2)
+        for i in range(5):
+            state = TaskState.completed if i < 3 else TaskState.working
+            store.add_task(
+                Task(
+                    id=f't{i}',
+                    context_id='c1' if i % 2 else 'c2',
+                    status=TaskStatus(state=state),
+                )
+            )
+        self.assertEqual(list(store._task_bodies), ['t3', 't4'])
+        # Evicted bodies are read back from the write queue
+        self.assertEqual(store.get_task('t0').status.state, TaskState.completed)
+        self.assertEqual(list(store._task_bodies), ['t4', 't0'])
+        tasks, total = store.page_tasks(limit=1, state='completed')
+        self.assertEqual(([t.id for t in tasks], total), (['t0'], 3))
+        tasks, total = store.page_tasks(context_id='c1', descending=True)
+        self.assertEqual(([t.id for t in tasks], total), (['t3', 't1'], 2))
+        # Listings do not push the recently used bodies out
+        self.assertEqual(len(store.tasks), 5)
+        self.assertEqual(list(store._task_bodies), ['t4', 't0'])
+
+        self.persistence.flush()
+        self.assertEqual(store.get_task('t2').id, 't2')
+        self.assertIsNone(store.get_task('unknown'))
+        self.assertFalse(store.has_task('unknown'))
+
+    def test_message_index_lives_in_sqlite(self) -> None:
+        store = StateStore(self.persistence)
+        store.attach_message_to_task('m1', 't1')
+        self.assertEqual(store.task_id_for_message('m1'), 't1')
+        self.persistence.flush()
+        self.assertEqual(store.task_id_for_message('m1'), 't1')
+        store.clear_message_index()
+        # The clear is still queued, the committed row is hidden already
+        self.assertIsNone(store.task_id_for_message('m1'))
+        self.persistence.flush()
+        self.assertIsNone(store.task_id_for_message('m1'))
+        self.assertEqual(store._message_tasks, {})
+
+    def test_task_change_log_is_capped(self) -> None:
+        """A cursor older than the kept changes gets a full sync."""
+        store = StateStore(self.persistence, max_task_changes=2)
+        task = Task(
+            id='t0', context_id='c', status=TaskStatus(state=TaskState.working)
+        )
+        store.add_task(task)
+        cursor = store.cursor
+        for i in range(1, 4):
+            store.add_task(
+                Task(
+                    id=f't{i}',
+                    context_id='c',
+                    status=TaskStatus(state=TaskState.working),
+                )
+            )
+        self.assertEqual(len(store.tasks_since(cursor)[0]), 4)
+        cursor = store.cursor
+        store.update_task(task)
+        self.assertEqual(
+            [t.id for t in store.tasks_since(cursor)[0]], ['t0']
+        )
+
+    def test_migrates_task_state_column(self) -> None:
+        """Databases without the state column get it from the JSON."""
+        self.persistence.close()
+        os.remove(self.path)
+        task = Task(
+            id='t1', context_id='c1', status=TaskStatus(state=TaskState.working)
+        )
+        conn = sqlite3.connect(self.path)
+        conn.execute(
+            'CREATE TABLE tasks (id TEXT PRIMARY KEY, context_id TEXT, '
+            'updated_at REAL NOT NULL, data TEXT NOT NULL)'
+        )
+        conn.execute(
+            'INSERT INTO tasks VALUES (?, ?, 0, ?)',
+            ('t1', 'c1', task.model_dump_json()),
+        )
+        conn.commit()
+        conn.close()
+        self.persistence = StatePersistence(self.path)
+        self.assertEqual(
+            self.persistence.load_task_states(), [('t1', 'c1', 'working')]
+        )
+
+    def test_reload_includes_queued_writes(self) -> None:
+        """An evicted history still in the write queue is read back."""
+        self.persistence.close()
+        # Nothing is committed before close()
+        self.persistence = StatePersistence(self.path, flush_interval=60)
+        store = StateStore(self.persistence, max_loaded_conversations=1)
+        self.add_conversation(store, 'c1')
+        store.append_conversation_message(
+            store.conversations[0], make_message('m2-c1', 'c1')
+        )
+        self.add_conversation(store, 'c2')
+        self.assertEqual(store.conversations[0].messages, [])
+        self.assertEqual(
+            self.persistence._query('SELECT COUNT(*) FROM messages'), [(0,)]
+        )
+        conversation = store.get_conversation('c1')
+        self.assertEqual(
+            [m.message_id for m in conversation.messages], ['m-c1', 'm2-c1']
+        )
+        # close() commits at once instead of waiting a full interval
+        self.persistence._flush_interval = 0
+
+    def test_load_conversation_off_the_loop(self) -> None:
+        store = StateStore(self.persistence, max_loaded_conversations=1)
+        self.add_conversation(store, 'c1')
+        self.add_conversation(store, 'c2')
+        self.assertEqual(store.conversations[0].messages, [])
+        asyncio.run(store.load_conversation('c1'))
+        self.assertEqual(
+            [m.message_id for m in store.conversations[0].messages], ['m-c1']
+        )
+        # c2 made room for it, unknown ids are ignored
+        self.assertEqual(store.conversations[1].messages, [])
+        asyncio.run(store.load_conversation('unknown'))
+        asyncio.run(store.load_conversation(None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import unittest
+
+from a2a.types import Message, Part, Role, Task, TaskState, TaskStatus, TextPart
+from service.server.state_store import StateStore
+from service.types import Conversation
+
+
+def make_task(task_id: str, context_id: str) -> Task:
+    return Task(
+        id=task_id,
+        context_id=context_id,
+        status=TaskStatus(state=TaskState.submitted),
+    )
+
+
+class StateStoreTest(unittest.TestCase):
+    """Tests for the indexed StateStore used by ADKHostManager."""
+
+    def setUp(self) -> None:
+        self.store = StateStore()
+
+    def test_get_conversation(self) -> None:
+        """Conversations are found by id and keep insertion order."""
+        first = Conversation(conversation_id="c1", is_active=True)
+        second = Conversation(conversation_id="c2", is_active=True)
+        self.store.add_conversation(first)
+        self.store.add_conversation(second)
+        self.assertIs(self.store.get_conversation("c2"), second)
+        self.assertIsNone(self.store.get_conversation("missing"))
+        self.assertIsNone(self.store.get_conversation(None))
+        self.assertEqual(self.store.conversations, [first, second])
+
+    def test_update_task_replaces_and_reindexes(self) -> None:
+        """Updating a task replaces it and moves it between contexts."""
+        self.store.add_task(make_task("t1", "c1"))
+        updated = make_task("t1", "c2")
+        self.assertTrue(self.store.update_task(updated))
+        self.assertIs(self.store.get_task("t1"), updated)
+        self.assertEqual(self.store.tasks_for_context("c1"), [])
+        self.assertEqual(self.store.tasks_for_context("c2"), [updated])
+        self.assertFalse(self.store.update_task(make_task("t2", "c1")))
+        self.assertEqual(len(self.store.tasks), 1)
+
+    def test_page_tasks(self) -> None:
+        """Task pages honour the filters, the order and the bounds."""
+        for i in range(5):
+            task = make_task(f"t{i}", "c1" if i % 2 else "c2")
+            if i >= 3:
+                task.status = TaskStatus(state=TaskState.completed)
+            self.store.add_task(task)
+        tasks, total = self.store.page_tasks(offset=1, limit=2)
+        self.assertEqual([t.id for t in tasks], ["t1", "t2"])
+        self.assertEqual(total, 5)
+        tasks, total = self.store.page_tasks(context_id="c1", descending=True)
+        self.assertEqual([t.id for t in tasks], ["t3", "t1"])
+        self.assertEqual(total, 2)
+        tasks, total = self.store.page_tasks(state="completed")
+        self.assertEqual([t.id for t in tasks], ["t3", "t4"])
+        self.assertEqual(total, 2)
+
+    def test_message_index(self) -> None:
+        """Messages resolve to the task they were attached to."""
+        task = make_task("t1", "c1")
+        self.store.add_task(task)
+        self.store.attach_message_to_task("m1", "t1")
+        self.assertEqual(self.store.task_id_for_message("m1"), "t1")
+        self.assertIs(self.store.task_for_message("m1"), task)
+        self.store.clear_message_index()
+        self.assertIsNone(self.store.task_for_message("m1"))
+
+    def test_changes_since_cursor(self) -> None:
+        """Only records changed after the cursor are returned."""
+        self.store.add_task(make_task("t1", "c1"))
+        self.store.add_task(make_task("t2", "c1"))
+        tasks, cursor = self.store.tasks_since(None)
+        self.assertEqual([t.id for t in tasks], ["t1", "t2"])
+
+        self.store.update_task(make_task("t1", "c1"))
+        tasks, new_cursor = self.store.tasks_since(cursor)
+        self.assertEqual([t.id for t in tasks], ["t1"])
+        self.assertNotEqual(new_cursor, cursor)
+        self.assertEqual(self.store.tasks_since(new_cursor)[0], [])
+
+    def test_messages_since_cursor(self) -> None:
+        """Messages are tracked per conversation."""
+        conversation = Conversation(conversation_id="c1", is_active=True)
+        self.store.add_conversation(conversation)
+        _, cursor = self.store.messages_since("c1", None)
+        message = Message(
+            role=Role.user,
+            parts=[Part(root=TextPart(text="hi"))],
+            message_id="m1",
+            context_id="c1",
+        )
+        self.store.append_conversation_message(conversation, message)
+        messages, _ = self.store.messages_since("c1", cursor)
+        self.assertEqual(messages, [message])
+        conversations, _ = self.store.conversations_since(cursor)
+        self.assertEqual(conversations, [conversation])
+
+    def test_cursor_from_future_returns_everything(self) -> None:
+        """A cursor past the current version triggers a full sync."""
+        self.store.add_task(make_task("t1", "c1"))
+        _, cursor = self.store.tasks_since(None)
+        epoch = cursor.partition(".")[0]
+        tasks, new_cursor = self.store.tasks_since(f"{epoch}.1000")
+        self.assertEqual(len(tasks), 1)
+        self.assertEqual(new_cursor, self.store.cursor)
+
+    def test_cursor_of_previous_process_returns_everything(self) -> None:
+        """After a restart an old cursor gets a full sync, not a delta."""
+        old = StateStore()
+        for i in range(3):
+            old.add_task(make_task(f"old{i}", "c1"))
+        _, old_cursor = old.tasks_since(None)
+
+        # The new process has passed the version of the old cursor
+        for i in range(10):
+            self.store.add_task(make_task(f"t{i}", "c1"))
+        self.assertGreater(self.store.version, old.version)
+        tasks, cursor = self.store.tasks_since(old_cursor)
+        self.assertEqual(len(tasks), 10)
+        conversations, _ = self.store.conversations_since(old_cursor)
+        self.assertEqual(conversations, self.store.conversations)
+        # The cursor handed back is one of the new process
+        self.assertEqual(self.store.tasks_since(cursor)[0], [])
+        # Integer cursors of older clients are never read as a version
+        self.assertEqual(len(self.store.tasks_since("5")[0]), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
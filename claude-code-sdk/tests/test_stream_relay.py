@@ -0,0 +1,82 @@
+import unittest
+
+from a2a.types import (
+    Artifact,
+    Message,
+    Part,
+    Role,
+    TaskArtifactUpdateEvent,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+from service.server.stream_relay import StreamRelay
+
+
+def status_event(text: str) -> TaskStatusUpdateEvent:
+    return TaskStatusUpdateEvent(
+        task_id='t1',
+        context_id='c1',
+        final=False,
+        status=TaskStatus(
+            state=TaskState.working,
+            message=Message(
+                role=Role.agent,
+                parts=[Part(root=TextPart(text=text))],
+                message_id='s1',
+            ),
+        ),
+    )
+
+
+def artifact_event(text: str, append: bool) -> TaskArtifactUpdateEvent:
+    return TaskArtifactUpdateEvent(
+        task_id='t1',
+        context_id='c1',
+        append=append,
+        lastChunk=False,
+        artifact=Artifact(
+            artifactId='a1', parts=[Part(root=TextPart(text=text))]
+        ),
+    )
+
+
+class StreamRelayTest(unittest.TestCase):
+    """Tests for the streamed text relay."""
+
+    def setUp(self) -> None:
+        self.relay = StreamRelay()
+
+    def apply(self, current: str, event) -> str:
+        delta = self.relay.feed('m1', event)
+        if delta is None:
+            return current
+        return current[: delta.offset] + delta.text
+
+    def test_artifact_chunks_are_appended(self) -> None:
+        """Appended artifact chunks become pure append deltas."""
+        text = ''
+        text = self.apply(text, status_event('Working'))
+        text = self.apply(text, artifact_event('Hel', append=False))
+        delta = self.relay.feed('m1', artifact_event('lo', append=True))
+        self.assertEqual((delta.offset, delta.text), (3, 'lo'))
+        text = text[: delta.offset] + delta.text
+        self.assertEqual(text, 'Hello')
+        self.assertEqual(self.relay.text('m1'), 'Hello')
+        # Status messages no longer override the artifact stream
+        self.assertIsNone(self.relay.feed('m1', status_event('Done')))
+
+    def test_cumulative_status_sends_suffix(self) -> None:
+        """Status text extending the previous one only ships the suffix."""
+        self.relay.feed('m1', status_event('Look'))
+        delta = self.relay.feed('m1', status_event('Looking up'))
+        self.assertEqual((delta.offset, delta.text), (4, 'ing up'))
+        delta = self.relay.feed('m1', status_event('Converting'))
+        self.assertEqual((delta.offset, delta.text), (0, 'Converting'))
+        self.relay.discard('m1')
+        self.assertIsNone(self.relay.text('m1'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,262 @@
+import asyncio
+import json
+import time
+import unittest
+
+from types import SimpleNamespace
+from unittest import mock
+
+from a2a.types import (
+    SendStreamingMessageResponse,
+    SendStreamingMessageSuccessResponse,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+)
+from a2a_mcp.common import workflow
+from a2a_mcp.common.workflow import Status, WorkflowGraph, WorkflowNode
+
+
+def status_chunk(state: TaskState) -> SendStreamingMessageResponse:
+    return SendStreamingMessageResponse(
+        root=SendStreamingMessageSuccessResponse(
+            id='1',
+            result=TaskStatusUpdateEvent(
+                task_id='task',
+                context_id='context',
+                status=TaskStatus(state=state),
+                final=state != TaskState.working,
+            ),
+        )
+    )
+
+
+class FakeNode(WorkflowNode):
+    def __init__(self, task: str, delay: float = 0.05, asks: bool = False):
+        super().__init__(task)
+        self.delay = delay
+        self.asks = asks
+        self.runs = 0
+
+    async def run_node(self, query, task_id, context_id, httpx_client=None):
+        self.runs += 1
+        yield status_chunk(TaskState.working)
+        await asyncio.sleep(self.delay)
+        if self.asks and self.runs == 1:
+            yield status_chunk(TaskState.input_required)
+            return
+        yield status_chunk(TaskState.completed)
+
+
+def node_ids(chunks: list[SendStreamingMessageResponse]) -> list[str]:
+    return [c.root.result.metadata['workflow_node_id'] for c in chunks]
+
+
+class WorkflowGraphTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the concurrent workflow scheduler."""
+
+    def build(self, *nodes: FakeNode, max_parallelism: int = 4):
+        graph = WorkflowGraph(
+            httpx_client=object(), max_parallelism=max_parallelism
+        )
+        for node in nodes:
+            graph.add_node(node)
+        return graph
+
+    async def collect(self, graph: WorkflowGraph, **kwargs) -> list:
+        return [c async for c in graph.run_workflow(**kwargs)]
+
+    async def test_independent_nodes_run_concurrently(self) -> None:
+        """Branches run at the same time, chunks are tagged by node."""
+        root = FakeNode('plan', delay=0)
+        branches = [FakeNode(f'task {i}') for i in range(3)]
+        graph = self.build(root, *branches)
+        for node in branches:
+            graph.add_edge(root.id, node.id)
+        start = time.monotonic()
+        chunks = await self.collect(graph)
+        self.assertLess(time.monotonic() - start, 0.12)
+        self.assertEqual(graph.state, Status.COMPLETED)
+        self.assertEqual(len(chunks), 8)
+        self.assertEqual(node_ids(chunks)[:2], [root.id, root.id])
+        self.assertEqual(
+            set(node_ids(chunks)[2:]), {node.id for node in branches}
+        )
+
+    async def test_max_parallelism_and_dependencies(self) -> None:
+        """A node waits for all its predecessors and the parallelism cap."""
+        a, b, c, d = (FakeNode(x) for x in 'abcd')
+        graph = self.build(a, b, c, d, max_parallelism=1)
+        graph.add_edge(a.id, b.id)
+        graph.add_edge(a.id, c.id)
+        graph.add_edge(b.id, d.id)
+        graph.add_edge(c.id, d.id)
+        chunks = await self.collect(graph)
+        order = list(dict.fromkeys(node_ids(chunks)))
+        self.assertEqual(order[0], a.id)
+        self.assertEqual(order[-1], d.id)
+        self.assertEqual(len(chunks), 8)
+
+    async def test_pause_and_resume(self) -> None:
+        """A paused node stops the graph, resuming runs what was left."""
+        root = FakeNode('plan', delay=0)
+        asking = FakeNode('asks', delay=0.01, asks=True)
+        slow = FakeNode('slow', delay=0.05)
+        last = FakeNode('last', delay=0)
+        other = FakeNode('other', delay=0)
+        graph = self.build(root, asking, slow, last, other, max_parallelism=2)
+        graph.add_edge(root.id, asking.id)
+        graph.add_edge(root.id, slow.id)
+        graph.add_edge(root.id, other.id)
+        graph.add_edge(asking.id, last.id)
+        chunks = await self.collect(graph)
+        self.assertEqual(graph.state, Status.PAUSED)
+        self.assertEqual(graph.paused_node_id, asking.id)
+        self.assertEqual(
+            chunks[-1].root.result.status.state, TaskState.completed
+        )
+        # The running sibling finished, the queued one never started
+        self.assertEqual(slow.state, Status.COMPLETED)
+        self.assertEqual(other.runs, 0)
+        await self.collect(graph, start_node_id=asking.id)
+        self.assertEqual(graph.state, Status.COMPLETED)
+        self.assertEqual((asking.runs, other.runs, last.runs), (2, 1, 1))
+        self.assertEqual(slow.runs, 1)
+
+    async def test_concurrent_pauses_are_asked_in_turn(self) -> None:
+        """A second question waits for the first pause to be answered."""
+        first = FakeNode('first', delay=0.01, asks=True)
+        second = FakeNode('second', delay=0.03, asks=True)
+        after = FakeNode('after', delay=0)
+        graph = self.build(first, second, after)
+        graph.add_edge(second.id, after.id)
+
+        def questions(chunks):
+            return [
+                c.root.result.metadata['workflow_node_id']
+                for c in chunks
+                if c.root.result.status.state == TaskState.input_required
+            ]
+
+        chunks = await self.collect(graph)
+        self.assertEqual(questions(chunks), [first.id])
+        self.assertEqual(graph.paused_node_id, first.id)
+        self.assertEqual(second.runs, 1)
+        # Answering the first asks the second, which is not run again
+        chunks = await self.collect(graph, start_node_id=first.id)
+        self.assertEqual(questions(chunks), [second.id])
+        self.assertEqual(node_ids(chunks)[-1], second.id)
+        self.assertEqual(graph.state, Status.PAUSED)
+        self.assertEqual(graph.paused_node_id, second.id)
+        self.assertEqual((first.runs, second.runs, after.runs), (2, 1, 0))
+        chunks = await self.collect(graph, start_node_id=second.id)
+        self.assertEqual(questions(chunks), [])
+        self.assertEqual(graph.state, Status.COMPLETED)
+        self.assertEqual((first.runs, second.runs, after.runs), (2, 2, 1))
+
+    async def test_closed_while_paused(self) -> None:
+        """Nodes cancelled by closing the generator run again on resume."""
+        asking = FakeNode('asks', delay=0, asks=True)
+        slow = FakeNode('slow', delay=0.05)
+        graph = self.build(asking, slow)
+        stream = graph.run_workflow()
+        async for chunk in stream:
+            if chunk.root.result.status.state == TaskState.input_required:
+                break
+        await stream.aclose()
+        self.assertEqual(graph.state, Status.PAUSED)
+        self.assertEqual(graph.interrupted_node_ids, [slow.id])
+        await self.collect(graph, start_node_id=asking.id)
+        self.assertEqual(graph.state, Status.COMPLETED)
+        self.assertEqual((asking.runs, slow.runs), (2, 2))
+        self.assertEqual(slow.state, Status.COMPLETED)
+
+    async def test_resolve_agents_in_one_call(self) -> None:
+        """All task nodes are matched by a single batched find_agent."""
+        planner = WorkflowNode('plan', node_key='planner')
+        tasks = [WorkflowNode(f'task {i}') for i in range(3)]
+        graph = self.build(planner, *tasks)
+        calls = []
+
+        class Pool:
+            async def call(self, fn, queries):
+                calls.append((fn, queries))
+                results = [
+                    {
+                        'query': q,
+                        'candidates': [
+                            {
+                                'agent_card': {
+                                    'name': f'agent for {q}',
+                                    'description': '',
+                                    'url': 'http://localhost:1/',
+                                    'version': '1',
+                                    'capabilities': {},
+                                    'default_input_modes': [],
+                                    'default_output_modes': [],
+                                    'skills': [],
+                                },
+                                'confidence': 0.5,
+                                'uri': 'resource://agent_cards/x',
+                            }
+                        ]
+                        if q != 'task 1'
+                        else [],
+                    }
+                    for q in queries
+                ]
+                text = json.dumps({'results': results})
+                return SimpleNamespace(content=[SimpleNamespace(text=text)])
+
+        config = SimpleNamespace(host='localhost', port=1, transport='sse')
+        with (
+            mock.patch.object(
+                workflow, 'get_mcp_server_config', return_value=config
+            ),
+            mock.patch.object(
+                workflow, 'get_session_pool', return_value=Pool()
+            ),
+        ):
+            resolved = await graph.resolve_agents()
+        self.assertEqual(resolved, 2)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(calls[0][1], ['task 0', 'task 1', 'task 2'])
+        self.assertIsNone(planner.agent_card)
+        self.assertEqual(tasks[0].agent_card.name, 'agent for task 0')
+        # No candidate above the threshold, not looked up again
+        self.assertIsNone(tasks[1].agent_card)
+        self.assertTrue(tasks[1].agent_missing)
+        self.assertFalse(tasks[0].agent_missing)
+
+    async def test_node_without_agent_fails_alone(self) -> None:
+        """A task with no agent fails its node, the others finish."""
+        missing = WorkflowNode('book a rocket')
+        missing.agent_missing = True
+        after = FakeNode('after', delay=0)
+        others = [FakeNode(f'task {i}') for i in range(2)]
+        graph = self.build(missing, after, *others)
+        graph.add_edge(missing.id, after.id)
+        with mock.patch.object(
+            WorkflowNode, 'find_agent_for_task'
+        ) as find_agent:
+            chunks = await self.collect(graph)
+        find_agent.assert_not_called()
+        self.assertEqual(graph.state, Status.COMPLETED)
+        self.assertEqual(missing.state, Status.FAILED)
+        self.assertEqual(after.runs, 0)
+        self.assertTrue(all(n.state == Status.COMPLETED for n in others))
+        failed = [
+            c.root.result
+            for c in chunks
+            if c.root.result.status.state == TaskState.failed
+        ]
+        self.assertEqual(len(failed), 1)
+        self.assertFalse(failed[0].final)
+        self.assertEqual(failed[0].metadata['workflow_node_id'], missing.id)
+        self.assertIn(
+            'book a rocket', failed[0].status.message.parts[0].root.text
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
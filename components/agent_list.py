@@ -3,6 +3,7 @@ import mesop as me
 import pandas as pd
 
 from a2a.types import AgentCard
+from service.client.http_pool import scoped_http_client
 from state.agent_state import AgentState
 from state.host_agent_service import RemoveRemoteAgent
 
@@ -113,8 +114,14 @@ def add_agent(e: me.ClickEvent):  # pylint: disable=unused-argument
 def remove_agent(e: me.ClickEvent, agent_url: str):  # pylint: disable=unused-argument
     """Remove agent button handler."""
     try:
-        asyncio.run(RemoveRemoteAgent(agent_url))
+        asyncio.run(_remove_remote_agent(agent_url))
         # Força atualização da página recarregando
         # A UI será atualizada automaticamente na próxima busca
     except Exception as ex:
         print(f"Erro ao remover agente {agent_url}: {ex}")
+
+
+async def _remove_remote_agent(agent_url: str):
+    # Loop of asyncio.run: its pooled client must not outlive it
+    async with scoped_http_client():
+        await RemoveRemoteAgent(agent_url)
@@ -1,7 +1,7 @@
 import mesop as me
 import pandas as pd
 
-from state.host_agent_service import CreateConversation
+from state.host_agent_service import CreateConversation, UpdateAppState
 from state.state import AppState, StateConversation
 
 
@@ -87,10 +87,12 @@ async def add_conversation(e: me.ClickEvent):  # pylint: disable=unused-argument
     yield
 
 
-def on_click(e: me.TableClickEvent):
+async def on_click(e: me.TableClickEvent):
     state = me.state(AppState)
     conversation = state.conversations[e.row_index]
     state.current_conversation_id = conversation.conversation_id
+    # The event stream only pushes new deltas, load this conversation now
+    await UpdateAppState(state, conversation.conversation_id)
     me.query_params.update({'conversation_id': conversation.conversation_id})
     me.navigate('/conversation', query_params=me.query_params)
     yield
@@ -0,0 +1,57 @@
+import {
+  LitElement,
+  html,
+} from 'https://cdn.jsdelivr.net/gh/lit/dist@3/core/lit-core.min.js';
+
+class EventStream extends LitElement {
+  static properties = {
+    triggerEvent: {type: String},
+    url: {type: String},
+    kinds: {type: Array},
+  };
+
+  render() {
+    return html`<div></div>`;
+  }
+
+  firstUpdated() {
+    this.open();
+  }
+
+  disconnectedCallback() {
+    this.close();
+    super.disconnectedCallback();
+  }
+
+  open() {
+    if (this.source || !this.url) {
+      return;
+    }
+    const kinds = this.kinds || [];
+    const url = kinds.length
+      ? `${this.url}?kinds=${encodeURIComponent(kinds.join(','))}`
+      : this.url;
+    // EventSource reconnects on its own, the server answers every new
+    // connection with a 'sync' so missed deltas are recovered.
+    this.source = new EventSource(url);
+    for (const kind of ['sync', ...kinds]) {
+      this.source.addEventListener(kind, (event) => {
+        this.dispatchEvent(
+          new MesopEvent(this.triggerEvent, {
+            kind: kind,
+            data: JSON.parse(event.data),
+          }),
+        );
+      });
+    }
+  }
+
+  close() {
+    if (this.source) {
+      this.source.close();
+      this.source = null;
+    }
+  }
+}
+
+customElements.define('event-stream-component', EventStream);
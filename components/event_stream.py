@@ -0,0 +1,39 @@
+from collections.abc import Callable
+from typing import Any
+
+import mesop.labs as mel
+
+
+STATE_STREAM_KINDS = ['conversation', 'message', 'task', 'pending', 'delta']
+
+
+@mel.web_component(path='./event_stream.js')
+def event_stream(
+    *,
+    trigger_event: Callable[[mel.WebEvent], Any],
+    url: str = '/events/stream',
+    kinds: list[str] | None = None,
+    key: str | None = None,
+):
+    """Creates an invisible component subscribed to the server event stream.
+
+    The component keeps an EventSource open against the ConversationServer
+    `/events/stream` endpoint and forwards every pushed delta to
+    `trigger_event` as `{'kind': ..., 'data': ...}`. A 'sync' kind is sent
+    when the connection is (re)established and means the full state should
+    be reloaded.
+
+    Returns:
+      The web component that was created.
+    """
+    return mel.insert_web_component(
+        name='event-stream-component',
+        key=key,
+        events={
+            'triggerEvent': trigger_event,
+        },
+        properties={
+            'url': url,
+            'kinds': kinds if kinds is not None else STATE_STREAM_KINDS,
+        },
+    )
@@ -1,9 +1,15 @@
-import asyncio
-
 import mesop as me
-import pandas as pd
 
-from state.host_agent_service import GetEvents, convert_event_to_state
+from components.paged_table import RowCache, paged_table
+from service.types import Event
+from state.host_agent_service import GetEventPage, convert_event_to_state
+from state.state import EventTableState
+
+
+COLUMNS = ['Conversation ID', 'Actor', 'Role', 'Id', 'Content']
+
+# Events never change once logged, rows are cached by event id
+_row_cache = RowCache()
 
 
 def flatten_content(content: list[tuple[str, str]]) -> str:
@@ -17,39 +23,94 @@ def flatten_content(content: list[tuple[str, str]]) -> str:
     return '\n'.join(parts)
 
 
-@me.component
-def event_list():
-    """Events list component"""
-    df_data = {
-        'Conversation ID': [],
-        'Actor': [],
-        'Role': [],
-        'Id': [],
-        'Content': [],
-    }
-    events = asyncio.run(GetEvents())
-    for e in events:
+def event_row(e: Event) -> dict[str, str]:
+    def build() -> dict[str, str]:
         event = convert_event_to_state(e)
-        df_data['Conversation ID'].append(event.context_id)
-        df_data['Role'].append(event.role)
-        df_data['Id'].append(event.id)
-        df_data['Content'].append(flatten_content(event.content))
-        df_data['Actor'].append(event.actor)
-    if not df_data['Conversation ID']:
-        me.text(
-            "🎉 Nenhum evento no histórico por enquanto.",
-            style=me.Style(
-                text_align='center',
-                font_size=16,
-                color='#666',
-                margin=me.Margin.all(32)
-            )
+        return {
+            'Conversation ID': event.context_id,
+            'Actor': event.actor,
+            'Role': event.role,
+            'Id': event.id,
+            'Content': flatten_content(event.content),
+        }
+
+    return _row_cache.get(e.id, build)
+
+
+async def load_event_page(state: EventTableState):
+    """Fetch the page at state.offset with the current filters."""
+    events, total = await GetEventPage(
+        offset=state.offset,
+        limit=state.page_size,
+        context_id=state.context_filter or None,
+        actor=state.actor_filter or None,
+        descending=state.newest_first,
+    )
+    if not events and total and state.offset >= total:
+        # The page emptied out under us (events evicted), go back one page
+        state.offset = max(total - state.page_size, 0)
+        events, total = await GetEventPage(
+            offset=state.offset,
+            limit=state.page_size,
+            context_id=state.context_filter or None,
+            actor=state.actor_filter or None,
+            descending=state.newest_first,
         )
+    state.rows = [event_row(e) for e in events]
+    state.total = total
+
+
+async def previous_page(e: me.ClickEvent):  # pylint: disable=unused-argument
+    state = me.state(EventTableState)
+    state.offset = max(state.offset - state.page_size, 0)
+    await load_event_page(state)
+    yield
+
+
+async def next_page(e: me.ClickEvent):  # pylint: disable=unused-argument
+    state = me.state(EventTableState)
+    state.offset += state.page_size
+    await load_event_page(state)
+    yield
+
+
+async def refresh(e: me.ClickEvent):  # pylint: disable=unused-argument
+    await load_event_page(me.state(EventTableState))
+    yield
+
+
+async def filter_context(e: me.InputBlurEvent):
+    state = me.state(EventTableState)
+    if e.value.strip() == state.context_filter:
         return
-    df = pd.DataFrame(
-        pd.DataFrame(df_data),
-        columns=['Conversation ID', 'Actor', 'Role', 'Id', 'Content'],
-    )
+    state.context_filter = e.value.strip()
+    state.offset = 0
+    await load_event_page(state)
+    yield
+
+
+async def filter_actor(e: me.InputBlurEvent):
+    state = me.state(EventTableState)
+    if e.value.strip() == state.actor_filter:
+        return
+    state.actor_filter = e.value.strip()
+    state.offset = 0
+    await load_event_page(state)
+    yield
+
+
+async def toggle_order(e: me.CheckboxChangeEvent):
+    state = me.state(EventTableState)
+    state.newest_first = e.checked
+    state.offset = 0
+    await load_event_page(state)
+    yield
+
+
+@me.component
+def event_list():
+    """Events list component"""
+    state = me.state(EventTableState)
     with me.box(
         style=me.Style(
             display='flex',
@@ -57,14 +118,29 @@ def event_list():
             flex_direction='column',
         )
     ):
-        me.table(
-            df,
-            header=me.TableHeader(sticky=True),
-            columns={
-                'Conversation ID': me.TableColumn(sticky=True),
-                'Actor': me.TableColumn(sticky=True),
-                'Role': me.TableColumn(sticky=True),
-                'Id': me.TableColumn(sticky=True),
-                'Content': me.TableColumn(sticky=True),
-            },
+        with me.box(
+            style=me.Style(display='flex', align_items='center', gap=12)
+        ):
+            me.input(
+                label='Conversation ID',
+                value=state.context_filter,
+                on_blur=filter_context,
+            )
+            me.input(
+                label='Actor', value=state.actor_filter, on_blur=filter_actor
+            )
+            me.checkbox(
+                'Mais recentes primeiro',
+                checked=state.newest_first,
+                on_change=toggle_order,
+            )
+            me.button('Atualizar', on_click=refresh)
+        paged_table(
+            rows=state.rows,
+            columns=COLUMNS,
+            offset=state.offset,
+            total=state.total,
+            on_previous=previous_page,
+            on_next=next_page,
+            empty_text='🎉 Nenhum evento no histórico por enquanto.',
         )
@@ -1,7 +1,7 @@
 import mesop as me
 import mesop.labs as mel
 
-from state.host_agent_service import UpdateAppState
+from state.host_agent_service import ApplyStreamEvent, UpdateAppState
 from state.state import AppState
 from styles.styles import (
     MAIN_COLUMN_STYLE,
@@ -11,15 +11,18 @@ from styles.styles import (
     SIDENAV_MIN_WIDTH,
 )
 
-from .async_poller import AsyncAction, async_poller
+from .event_stream import event_stream
 from .side_nav import sidenav
 
 
-async def refresh_app_state(e: mel.WebEvent):  # pylint: disable=unused-argument
-    """Refresh app state event handler"""
-    yield
+async def apply_stream_event(e: mel.WebEvent):
+    """Apply a delta pushed by the server event stream"""
     app_state = me.state(AppState)
-    await UpdateAppState(app_state, app_state.current_conversation_id)
+    if e.value['kind'] == 'sync':
+        yield
+        await UpdateAppState(app_state, app_state.current_conversation_id)
+    else:
+        ApplyStreamEvent(app_state, e.value['kind'], e.value['data'])
     yield
 
 
@@ -27,14 +30,7 @@ async def refresh_app_state(e: mel.WebEvent):  # pylint: disable=unused-argument
 def page_scaffold():
     """Page scaffold component"""
     app_state = me.state(AppState)
-    action = (
-        AsyncAction(
-            value=app_state, duration_seconds=app_state.polling_interval
-        )
-        if app_state
-        else None
-    )
-    async_poller(action=action, trigger_event=refresh_app_state)
+    event_stream(trigger_event=apply_stream_event, key='app_event_stream')
 
     sidenav('')
 
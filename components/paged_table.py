@@ -0,0 +1,74 @@
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+
+import mesop as me
+import pandas as pd
+
+
+class RowCache:
+    """LRU of formatted table rows.
+
+    Flattening message contents and artifacts is the expensive part of a
+    table render, rows are formatted once per key and reused by later page
+    loads.
+    """
+
+    def __init__(self, max_rows: int = 2000):
+        self._max_rows = max_rows
+        self._rows: OrderedDict[Hashable, dict[str, str]] = OrderedDict()
+
+    def get(
+        self, key: Hashable, build: Callable[[], dict[str, str]]
+    ) -> dict[str, str]:
+        row = self._rows.get(key)
+        if row is None:
+            row = build()
+            self._rows[key] = row
+            if len(self._rows) > self._max_rows:
+                self._rows.popitem(last=False)
+        else:
+            self._rows.move_to_end(key)
+        return row
+
+
+@me.component
+def paged_table(
+    rows: list[dict[str, str]],
+    columns: list[str],
+    offset: int,
+    total: int,
+    on_previous: Callable,
+    on_next: Callable,
+    empty_text: str,
+):
+    """Table over the rows of one page, with previous/next controls."""
+    if not rows:
+        me.text(
+            empty_text,
+            style=me.Style(
+                text_align='center',
+                font_size=16,
+                color='#666',
+                margin=me.Margin.all(32),
+            ),
+        )
+        return
+    me.table(
+        pd.DataFrame(rows, columns=columns),
+        header=me.TableHeader(sticky=True),
+        columns=dict([(c, me.TableColumn(sticky=True)) for c in columns]),
+    )
+    with me.box(
+        style=me.Style(
+            display='flex',
+            justify_content='flex-end',
+            align_items='center',
+            gap=8,
+            margin=me.Margin.symmetric(vertical=8),
+        )
+    ):
+        me.text(f'{offset + 1}-{offset + len(rows)} de {total}')
+        me.button('Anterior', on_click=on_previous, disabled=offset <= 0)
+        me.button(
+            'Próxima', on_click=on_next, disabled=offset + len(rows) >= total
+        )
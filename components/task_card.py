@@ -1,9 +1,19 @@
 import json
 
 import mesop as me
-import pandas as pd
 
-from state.state import ContentPart, SessionTask, StateTask, AppState
+from a2a.types import Task, TaskState
+
+from components.paged_table import RowCache, paged_table
+from state.host_agent_service import GetTaskPage, convert_task_to_state
+from state.state import ContentPart, StateTask, TaskTableState
+
+
+COLUMNS = ['Conversation ID', 'Task ID', 'Description', 'Status', 'Output']
+
+# Tasks change as they progress, a row is reused while the task keeps the
+# same state and artifacts.
+_row_cache = RowCache()
 
 
 def message_string(content: ContentPart) -> str:
@@ -12,53 +22,130 @@ def message_string(content: ContentPart) -> str:
     return json.dumps(content)
 
 
+def task_row(task: Task) -> dict[str, str]:
+    def build() -> dict[str, str]:
+        state_task = convert_task_to_state(task)
+        return {
+            'Conversation ID': task.context_id or '',
+            'Task ID': state_task.task_id or '',
+            'Description': '\n'.join(
+                message_string(x[0]) for x in state_task.message.content
+            ),
+            'Status': state_task.state or '',
+            'Output': flatten_artifacts(state_task),
+        }
+
+    key = (
+        task.id,
+        task.status.state,
+        len(task.artifacts or []),
+        len(task.history or []),
+    )
+    return _row_cache.get(key, build)
+
+
+async def load_task_page(state: TaskTableState):
+    """Fetch the page at state.offset with the current filters."""
+    tasks, total = await GetTaskPage(
+        offset=state.offset,
+        limit=state.page_size,
+        context_id=state.context_filter or None,
+        state=state.state_filter or None,
+        descending=state.newest_first,
+    )
+    state.rows = [task_row(t) for t in tasks]
+    state.total = total
+
+
+async def previous_page(e: me.ClickEvent):  # pylint: disable=unused-argument
+    state = me.state(TaskTableState)
+    state.offset = max(state.offset - state.page_size, 0)
+    await load_task_page(state)
+    yield
+
+
+async def next_page(e: me.ClickEvent):  # pylint: disable=unused-argument
+    state = me.state(TaskTableState)
+    state.offset += state.page_size
+    await load_task_page(state)
+    yield
+
+
+async def refresh(e: me.ClickEvent):  # pylint: disable=unused-argument
+    await load_task_page(me.state(TaskTableState))
+    yield
+
+
+async def filter_context(e: me.InputBlurEvent):
+    state = me.state(TaskTableState)
+    if e.value.strip() == state.context_filter:
+        return
+    state.context_filter = e.value.strip()
+    state.offset = 0
+    await load_task_page(state)
+    yield
+
+
+async def filter_state(e: me.SelectSelectionChangeEvent):
+    state = me.state(TaskTableState)
+    state.state_filter = e.value
+    state.offset = 0
+    await load_task_page(state)
+    yield
+
+
+async def toggle_order(e: me.CheckboxChangeEvent):
+    state = me.state(TaskTableState)
+    state.newest_first = e.checked
+    state.offset = 0
+    await load_task_page(state)
+    yield
+
+
 @me.component
-def task_card(tasks: list[SessionTask]):
+def task_card():
     """Task card component"""
-    columns = ['Conversation ID', 'Task ID', 'Description', 'Status', 'Output']
-    df_data: dict[str, list[str]] = dict([(c, []) for c in columns])
-    for task in tasks:
-        df_data['Conversation ID'].append(task.context_id)
-        df_data['Task ID'].append(task.task.task_id or '')
-        df_data['Description'].append(
-            '\n'.join(message_string(x[0]) for x in task.task.message.content)
+    state = me.state(TaskTableState)
+    with me.box(
+        style=me.Style(
+            display='flex',
+            justify_content='space-between',
+            flex_direction='column',
         )
-        df_data['Status'].append(task.task.state)
-        df_data['Output'].append(flatten_artifacts(task.task))
-    df = pd.DataFrame(pd.DataFrame(df_data), columns=columns)
-    
-    # Tabela de tarefas
-    if len(tasks) > 0:
+    ):
         with me.box(
-            style=me.Style(
-                display='flex',
-                justify_content='space-between',
-            )
+            style=me.Style(display='flex', align_items='center', gap=12)
         ):
-            me.table(
-                df,
-                header=me.TableHeader(sticky=True),
-                columns=dict([(c, me.TableColumn(sticky=True)) for c in columns]),
+            me.input(
+                label='Conversation ID',
+                value=state.context_filter,
+                on_blur=filter_context,
             )
-    else:
-        with me.box(
-            style=me.Style(
-                display='flex',
-                justify_content='center',
-                align_items='center',
-                flex_direction='column',
-                min_height='200px'
+            me.select(
+                label='Status',
+                options=[me.SelectOption(label='Todos', value='')]
+                + [
+                    me.SelectOption(label=s.value, value=s.value)
+                    for s in TaskState
+                ],
+                value=state.state_filter,
+                on_selection_change=filter_state,
             )
-        ):
-            me.text(
-                "🎉 Nenhuma tarefa no histórico por enquanto.",
-                style=me.Style(
-                    text_align='center',
-                    font_size=16,
-                    color='#666',
-                    margin=me.Margin.all(32)
-                )
+            me.checkbox(
+                'Mais recentes primeiro',
+                checked=state.newest_first,
+                on_change=toggle_order,
             )
+            me.button('Atualizar', on_click=refresh)
+        paged_table(
+            rows=state.rows,
+            columns=COLUMNS,
+            offset=state.offset,
+            total=state.total,
+            on_previous=previous_page,
+            on_next=next_page,
+            empty_text='🎉 Nenhuma tarefa no histórico por enquanto.',
+        )
 
 
 def flatten_artifacts(task: StateTask) -> str:
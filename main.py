@@ -15,7 +15,9 @@ import httpx
 import mesop as me
 
 from components.api_key_dialog import api_key_dialog
+from components.event_viewer import load_event_page
 from components.page_scaffold import page_scaffold
+from components.task_card import load_task_page
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.wsgi import WSGIMiddleware
@@ -26,9 +28,10 @@ from pages.event_list import event_list_page
 from pages.home import home_page_content
 from pages.settings import settings_page_content
 from pages.task_list import task_list_page
+from service.client.http_pool import close_http_clients, get_http_client
 from service.server.server import ConversationServer
 from state import host_agent_service
-from state.state import AppState
+from state.state import AppState, EventTableState, TaskTableState
 
 
 load_dotenv()
@@ -64,6 +67,38 @@ def on_load(e: me.LoadEvent):  # pylint: disable=unused-argument
         state.api_key_dialog_open = True
 
 
+async def on_conversation_load(e: me.LoadEvent):
+    """Loads the messages of the conversation in the query params"""
+    on_load(e)
+    state = me.state(AppState)
+    if (
+        state.current_conversation_id
+        and state.current_conversation_id != state.synced_conversation_id
+    ):
+        await host_agent_service.UpdateAppState(
+            state, state.current_conversation_id
+        )
+    yield
+
+
+async def on_event_list_load(e: me.LoadEvent):
+    """Loads the first page of the event table"""
+    on_load(e)
+    state = me.state(EventTableState)
+    state.offset = 0
+    await load_event_page(state)
+    yield
+
+
+async def on_task_list_load(e: me.LoadEvent):
+    """Loads the first page of the task table"""
+    on_load(e)
+    state = me.state(TaskTableState)
+    state.offset = 0
+    await load_task_page(state)
+    yield
+
+
 # Policy to allow the lit custom element to load
 security_policy = me.SecurityPolicy(
     allowed_script_srcs=[
@@ -102,7 +137,7 @@ def agents_page():
 @me.page(
     path='/conversation',
     title='Conversation',
-    on_load=on_load,
+    on_load=on_conversation_load,
     security_policy=security_policy,
 )
 def chat_page():
@@ -114,7 +149,7 @@ def chat_page():
 @me.page(
     path='/event_list',
     title='Event List',
-    on_load=on_load,
+    on_load=on_event_list_load,
     security_policy=security_policy,
 )
 def event_page():
@@ -138,7 +173,7 @@ def settings_page():
 @me.page(
     path='/task_list',
     title='Task List',
-    on_load=on_load,
+    on_load=on_task_list_load,
     security_policy=security_policy,
 )
 def task_page():
@@ -155,11 +190,13 @@ class HTTPXClientWrapper:
 
     def start(self):
         """Instantiate the client. Call from the FastAPI startup hook."""
-        self.async_client = httpx.AsyncClient(timeout=30)
+        # The server loop shares the pooled client with ConversationClient.
+        self.async_client = get_http_client()
 
     async def stop(self):
         """Gracefully shutdown. Call from FastAPI shutdown hook."""
-        await self.async_client.aclose()
+        # Closes this loop's client along with the ones opened by UI handlers.
+        await close_http_clients()
         self.async_client = None
 
     def __call__(self):
@@ -189,6 +226,7 @@ async def lifespan(app: FastAPI):
     )
     app.setup()
     yield
+    await agent_server.stop()
     await httpx_client_wrapper.stop()
 
 
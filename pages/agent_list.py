@@ -6,10 +6,11 @@ from components.agent_list import agents_list
 from components.dialog import dialog, dialog_actions
 from components.header import header
 from components.page_scaffold import page_frame, page_scaffold
+from service.client.http_pool import scoped_http_client
 from state.agent_state import AgentState
 from state.host_agent_service import AddRemoteAgent, ListRemoteAgents
 from state.state import AppState
-from utils.agent_card import get_agent_card
+from utils.agent_card import resolve_agent_card
 
 
 def agent_list_page(app_state: AppState):
@@ -19,7 +20,7 @@ def agent_list_page(app_state: AppState):
         with page_frame():
             with header('Remote Agents', 'smart_toy'):
                 pass
-            agents = asyncio.run(ListRemoteAgents())
+            agents = asyncio.run(list_remote_agents())
             agents_list(agents)
             with dialog(state.agent_dialog_open):
                 with me.box(
@@ -65,16 +66,26 @@ def agent_list_page(app_state: AppState):
                     me.button('Cancel', on_click=cancel_agent_dialog)
 
 
+async def list_remote_agents():
+    # Loop of asyncio.run: its pooled client must not outlive it
+    async with scoped_http_client():
+        return await ListRemoteAgents()
+
+
 def set_agent_address(e: me.InputBlurEvent):
     state = me.state(AgentState)
     state.agent_address = e.value
 
 
-def load_agent_info(e: me.ClickEvent):
+async def load_agent_info(e: me.ClickEvent):
     state = me.state(AgentState)
     try:
         state.error = None
-        agent_card_response = get_agent_card(state.agent_address)
+        # Scoped to the loop of this handler
+        async with scoped_http_client():
+            agent_card_response = await resolve_agent_card(
+                state.agent_address
+            )
         state.agent_name = agent_card_response.name
         state.agent_description = agent_card_response.description
         state.agent_framework_type = (
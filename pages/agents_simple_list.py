@@ -8,10 +8,11 @@ import mesop as me
 from components.dialog import dialog, dialog_actions
 from components.header import header
 from components.page_scaffold import page_frame, page_scaffold
+from service.client.http_pool import scoped_http_client
 from state.agent_state import AgentState
 from state.host_agent_service import AddRemoteAgent, ListRemoteAgents
 from state.state import AppState
-from utils.agent_card import get_agent_card
+from utils.agent_card import resolve_agent_card
 
 
 def agent_list_page_simple(app_state: AppState):
@@ -182,11 +183,15 @@ def set_agent_address(e: me.InputBlurEvent):
     state.agent_address = e.value
 
 
-def load_agent_info(e: me.ClickEvent):
+async def load_agent_info(e: me.ClickEvent):
     state = me.state(AgentState)
     try:
         state.error = None
-        agent_card_response = get_agent_card(state.agent_address)
+        # Scoped to the loop of this handler
+        async with scoped_http_client():
+            agent_card_response = await resolve_agent_card(
+                state.agent_address
+            )
         state.agent_name = agent_card_response.name
         state.agent_description = agent_card_response.description
         state.agent_framework_type = (
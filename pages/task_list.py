@@ -10,4 +10,4 @@ def task_list_page(app_state: AppState):
         with page_frame():
             with header('Task List', 'task'):
                 pass
-            task_card(app_state.task_list)
+            task_card()
@@ -4,6 +4,7 @@ from typing import Any
 
 import httpx
 
+from service.client.http_pool import get_http_client
 from service.types import (
     AgentClientHTTPError,
     AgentClientJSONError,
@@ -32,8 +33,10 @@ from service.types import (
 
 
 class ConversationClient:
-    def __init__(self, base_url):
+    def __init__(self, base_url, http_client: httpx.AsyncClient | None = None):
         self.base_url = base_url.rstrip('/')
+        # Defaults to the pooled client of the running event loop
+        self._http_client = http_client
 
     async def send_message(
         self, payload: SendMessageRequest
@@ -41,22 +44,44 @@ class ConversationClient:
         return SendMessageResponse(**await self._send_request(payload))
 
     async def _send_request(self, request: JSONRPCRequest) -> dict[str, Any]:
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    self.base_url + '/' + request.method,
-                    json=request.model_dump(mode='json', exclude_none=True),
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                print('http error', e)
-                raise AgentClientHTTPError(
-                    e.response.status_code, str(e)
-                ) from e
-            except json.JSONDecodeError as e:
-                print('decode error', e)
-                raise AgentClientJSONError(str(e)) from e
+        return await self._post(
+            '/' + request.method,
+            request.model_dump(mode='json', exclude_none=True),
+        )
+
+    async def batch(self, requests: list[JSONRPCRequest]) -> list[dict[str, Any]]:
+        """Send read-only requests to /rpc/batch in a single round-trip.
+
+        Returns the raw JSON-RPC responses in the order of `requests`, ready
+        to be parsed into the matching response types.
+        """
+        results = await self._post(
+            '/rpc/batch',
+            [r.model_dump(mode='json', exclude_none=True) for r in requests],
+        )
+        if not isinstance(results, list):
+            raise AgentClientJSONError(f'Invalid batch response: {results}')
+        by_id = {r.get('id'): r for r in results}
+        return [
+            by_id.get(
+                r.id,
+                {'id': r.id, 'error': {'code': -32603, 'message': 'No response'}},
+            )
+            for r in requests
+        ]
+
+    async def _post(self, path: str, payload: Any) -> Any:
+        client = self._http_client or get_http_client()
+        try:
+            response = await client.post(self.base_url + path, json=payload)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            print('http error', e)
+            raise AgentClientHTTPError(e.response.status_code, str(e)) from e
+        except json.JSONDecodeError as e:
+            print('decode error', e)
+            raise AgentClientJSONError(str(e)) from e
 
     async def create_conversation(
         self, payload: CreateConversationRequest
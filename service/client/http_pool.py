@@ -0,0 +1,143 @@
+"""Shared, long-lived httpx clients for the UI process.
+
+httpx.AsyncClient connections are bound to the event loop that opened them,
+so the pool keeps one client per running loop. Within a loop every caller
+reuses the same keep-alive connections instead of paying a new TCP (and TLS)
+handshake per request.
+
+A client is pooled for as long as its loop lives. Mesop runs every UI
+handler on its own short-lived loop, so the entry points the handlers call
+are wrapped in scoped_http_client(), used as a context manager or as a
+decorator, which closes and drops the loop's client on exit. Clients of
+loops that were closed without that are closed by the next
+get_http_client().
+
+Configuration through environment variables:
+  A2A_UI_HTTP_MAX_CONNECTIONS     maximum open connections (default 100)
+  A2A_UI_HTTP_MAX_KEEPALIVE       idle keep-alive connections (default 20)
+  A2A_UI_HTTP_KEEPALIVE_EXPIRY    idle connection lifetime in s (default 30)
+  A2A_UI_HTTP_TIMEOUT             request timeout in seconds (default 30)
+  A2A_UI_HTTP2                    'true' to negotiate HTTP/2, needs `h2`
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+import threading
+
+import httpx
+
+
+logger = logging.getLogger(__name__)
+
+# event loop -> shared client of that loop. A client references its loop,
+# so entries are dropped explicitly, never by garbage collection.
+_clients: dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+_lock = threading.Lock()
+
+
+def _http2_enabled() -> bool:
+    if os.environ.get('A2A_UI_HTTP2', '').lower() != 'true':
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning('A2A_UI_HTTP2 is set but h2 is not installed')
+        return False
+    return True
+
+
+def create_http_client(**kwargs) -> httpx.AsyncClient:
+    """Create an AsyncClient with the configured pool limits."""
+    limits = httpx.Limits(
+        max_connections=int(
+            os.environ.get('A2A_UI_HTTP_MAX_CONNECTIONS', '100')
+        ),
+        max_keepalive_connections=int(
+            os.environ.get('A2A_UI_HTTP_MAX_KEEPALIVE', '20')
+        ),
+        keepalive_expiry=float(
+            os.environ.get('A2A_UI_HTTP_KEEPALIVE_EXPIRY', '30')
+        ),
+    )
+    kwargs.setdefault(
+        'timeout', float(os.environ.get('A2A_UI_HTTP_TIMEOUT', '30'))
+    )
+    return httpx.AsyncClient(limits=limits, http2=_http2_enabled(), **kwargs)
+
+
+async def _close_abandoned(client: httpx.AsyncClient):
+    """Close a client whose event loop is closed.
+
+    aclose() releases the sockets, then fails to schedule the transport
+    callbacks on the closed loop.
+    """
+    try:
+        await client.aclose()
+    except RuntimeError as e:
+        logger.debug(f'Closed http client of a closed loop: {e}')
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client of the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        abandoned = [
+            _clients.pop(other) for other in list(_clients) if other.is_closed()
+        ]
+        client = _clients.get(loop)
+        if client is None or client.is_closed:
+            client = create_http_client()
+            _clients[loop] = client
+    for old in abandoned:
+        # On a loop of its own, the running one may be short-lived as well
+        threading.Thread(
+            target=asyncio.run,
+            args=(_close_abandoned(old),),
+            name='http-client-close',
+            daemon=True,
+        ).start()
+    return client
+
+
+@contextlib.asynccontextmanager
+async def scoped_http_client():
+    """Share one client within the block, closed and dropped on exit.
+
+    Nested get_http_client() calls on the same loop get this client. When
+    the loop already had a pooled client it is reused and left open.
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        owned = loop not in _clients
+    client = get_http_client()
+    try:
+        yield client
+    finally:
+        if owned:
+            with _lock:
+                if _clients.get(loop) is client:
+                    del _clients[loop]
+            await client.aclose()
+
+
+async def close_http_clients():
+    """Close every pooled client. Call from the application shutdown hook."""
+    current = asyncio.get_running_loop()
+    with _lock:
+        clients = list(_clients.items())
+        _clients.clear()
+    for loop, client in clients:
+        if client.is_closed:
+            continue
+        if loop is current:
+            await client.aclose()
+        elif loop.is_running():
+            future = asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            try:
+                await asyncio.wrap_future(future)
+            except Exception as e:
+                logger.warning(f'Failed to close pooled http client: {e}')
+        else:
+            await _close_abandoned(client)
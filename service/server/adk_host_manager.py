@@ -9,7 +9,6 @@ import httpx
 
 from a2a.types import (
     AgentCard,
-    Artifact,
     DataPart,
     FilePart,
     FileWithBytes,
@@ -35,10 +34,20 @@ from hosts.multiagent.host_agent import HostAgent
 from hosts.multiagent.remote_agent_connection import (
     TaskCallbackArg,
 )
-from utils.agent_card import get_agent_card
+from utils.agent_card import AgentCardResolver
 
 from service.server.application_manager import ApplicationManager
+from service.server.artifact_assembler import ArtifactAssembler
 from service.server.agent_discovery import AgentDiscovery, auto_discover_and_register
+from service.server.event_log import EventLog
+from service.server.event_stream import EventBroadcaster
+from service.server.persistence import (
+    StatePersistence,
+    configured_cache_conversations,
+    configured_cache_tasks,
+)
+from service.server.state_store import StateStore
+from service.server.stream_relay import StreamRelay
 from service.types import Conversation, Event, AgentInfo, AgentStatus
 
 
@@ -55,14 +64,30 @@ class ADKHostManager(ApplicationManager):
         http_client: httpx.AsyncClient,
         api_key: str = '',
         uses_vertex_ai: bool = False,
+        persistence: StatePersistence | None = None,
     ):
-        self._conversations: list[Conversation] = []
-        self._messages: list[Message] = []
-        self._tasks: list[Task] = []
-        self._events: dict[str, Event] = {}
+        # Durable copy of the state below, None keeps everything in memory
+        self._persistence = persistence
+        # Conversations, messages, tasks and the message id -> task id map
+        self._store = StateStore(
+            persistence,
+            max_loaded_conversations=configured_cache_conversations(),
+            on_evict=self._forget_session,
+            max_loaded_tasks=configured_cache_tasks(),
+        )
+        # Pushes state changes to the /events/stream subscribers
+        self._event_stream = EventBroadcaster()
+        self._event_log = EventLog()
         self._pending_message_ids: list[str] = []
+        # pending message id -> conversation id
+        self._pending_contexts: dict[str, str | None] = {}
+        # Assembles the streamed output of every pending message
+        self._stream_relay = StreamRelay()
+        # task id -> pending message id its stream is relayed to
+        self._streaming_tasks: dict[str, str] = {}
         self._agents: dict[str, AgentInfo] = {}  # URL -> AgentInfo
-        self._artifact_chunks: dict[str, list[Artifact]] = {}
+        # Chunked artifacts being streamed, keyed by task and artifact id
+        self._artifact_assembler = ArtifactAssembler()
         self._session_service = InMemorySessionService()
         self._artifact_service = InMemoryArtifactService()
         self._memory_service = InMemoryMemoryService()
@@ -78,6 +103,7 @@ class ADKHostManager(ApplicationManager):
         
         # Inicializar sistema de descoberta de agentes
         self._agent_discovery = AgentDiscovery(http_client)
+        self._card_resolver = AgentCardResolver(http_client)
         self._auto_discovery_enabled = True
 
         # Set environment variables based on auth method
@@ -89,6 +115,7 @@ class ADKHostManager(ApplicationManager):
             os.environ['GOOGLE_GENAI_USE_VERTEXAI'] = 'FALSE'
             os.environ['GOOGLE_API_KEY'] = self.api_key
 
+        self._load_state()
         self._initialize_host()
         
         # Descobrir e registrar agentes automaticamente (sem bloquear inicialização)
@@ -101,13 +128,51 @@ class ADKHostManager(ApplicationManager):
         except Exception as e:
             print(f"Erro ao iniciar descoberta inicial: {e}")
 
-        # Map of message id to task id
-        self._task_map: dict[str, str] = {}
         # Map to manage 'lost' message ids until protocol level id is introduced
         self._next_id: dict[
             str, str
         ] = {}  # dict[str, str]: previous message to next message
 
+    def _load_state(self):
+        """Restaura o estado persistido da execução anterior"""
+        if not self._persistence:
+            return
+        self._store.load()
+        for event in self._persistence.load_events(self._event_log.max_events):
+            self._event_log.append(event)
+        self._agents = self._persistence.load_agents()
+        for agent_info in self._agents.values():
+            # Agentes locais voltam a ficar online quando forem redescobertos
+            if agent_info.is_local:
+                agent_info.is_online = False
+
+    def _persist_agent(self, url: str):
+        if not self._persistence:
+            return
+        agent_info = self._agents.get(url)
+        if agent_info is None:
+            self._persistence.delete('agent', url)
+        else:
+            self._persistence.put('agent', url, (url, agent_info))
+
+    def _forget_session(self, conversation_id: str):
+        """Drop the ADK session of a conversation whose history left memory.
+
+        The history stays in the database, the session is created again if
+        the conversation receives a new message.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        loop.create_task(
+            self._session_service.delete_session(
+                app_name=self.app_name,
+                user_id=self.user_id,
+                session_id=conversation_id,
+            )
+        )
+
     def _initialize_host(self):
         # Coletar apenas agentes habilitados para registrar no host
         enabled_agent_cards = []
@@ -130,13 +195,32 @@ class ADKHostManager(ApplicationManager):
             memory_service=self._memory_service,
         )
 
+    def _sync_host_agent(
+        self, agent_info: AgentInfo, previous_card: AgentCard | None = None
+    ):
+        """Mirror one agent's state into the running host agent in place.
+
+        Unlike _initialize_host this keeps the HostAgent, the Runner and the
+        connections of every other agent, so in-flight runs are unaffected.
+        Safe from the discovery thread: the HostAgent swaps in new
+        collections instead of changing the ones the runner iterates.
+        """
+        card = agent_info.agent_card
+        if previous_card and previous_card.name != card.name:
+            self._host_agent.remove_agent_card(previous_card.name)
+        self._host_agent.register_agent_card(card)
+        self._host_agent.set_agent_enabled(
+            card.name, agent_info.enabled and agent_info.is_online
+        )
+
     async def create_conversation(self) -> Conversation:
         session = await self._session_service.create_session(
             app_name=self.app_name, user_id=self.user_id
         )
         conversation_id = session.id
         c = Conversation(conversation_id=conversation_id, is_active=True)
-        self._conversations.append(c)
+        self._store.add_conversation(c)
+        self._event_stream.publish('conversation', c)
         return c
 
     def update_api_key(self, api_key: str):
@@ -151,7 +235,7 @@ class ADKHostManager(ApplicationManager):
                 self._initialize_host()
 
                 # Map of message id to task id
-                self._task_map = {}
+                self._store.clear_message_index()
 
     def sanitize_message(self, message: Message) -> Message:
         if message.context_id:
@@ -161,12 +245,7 @@ class ADKHostManager(ApplicationManager):
             # Check if the last event in the conversation was tied to a task.
             if conversation.messages:
                 task_id = conversation.messages[-1].task_id
-                if task_id and task_still_open(
-                    next(
-                        filter(lambda x: x and x.id == task_id, self._tasks),
-                        None,
-                    )
-                ):
+                if task_id and task_still_open(self._store.get_task(task_id)):
                     message.task_id = task_id
         return message
 
@@ -174,11 +253,14 @@ class ADKHostManager(ApplicationManager):
         message_id = message.message_id
         if message_id:
             self._pending_message_ids.append(message_id)
+            self._pending_contexts[message_id] = message.context_id
         context_id = message.context_id
+        await self.load_conversation(context_id)
         conversation = self.get_conversation(context_id)
-        self._messages.append(message)
         if conversation:
-            conversation.messages.append(message)
+            self._store.append_conversation_message(conversation, message)
+            self._event_stream.publish('message', message)
+        self._publish_pending()
         self.add_event(
             Event(
                 id=str(uuid.uuid4()),
@@ -192,6 +274,13 @@ class ADKHostManager(ApplicationManager):
         session = await self._session_service.get_session(
             app_name='A2A', user_id='test_user', session_id=context_id
         )
+        if session is None:
+            # Conversation restored from the database or evicted from memory
+            session = await self._session_service.create_session(
+                app_name=self.app_name,
+                user_id=self.user_id,
+                session_id=context_id,
+            )
         task_id = message.task_id
         # Update state must happen in an event
         state_update = {
@@ -241,22 +330,72 @@ class ADKHostManager(ApplicationManager):
             response = await self.adk_content_to_message(
                 final_event.content, context_id, task_id
             )
-            self._messages.append(response)
 
         if conversation and response:
-            conversation.messages.append(response)
+            self._store.append_conversation_message(conversation, response)
+            self._event_stream.publish('message', response)
         self._pending_message_ids.remove(message_id)
+        self._finish_stream(message_id)
+        self._publish_pending()
 
     def add_task(self, task: Task):
-        self._tasks.append(task)
+        self._store.add_task(task)
 
     def update_task(self, task: Task):
-        for i, t in enumerate(self._tasks):
-            if t.id == task.id:
-                self._tasks[i] = task
-                return
+        self._store.update_task(task)
 
     def task_callback(self, task: TaskCallbackArg, agent_card: AgentCard):
+        current_task = self._apply_task_update(task, agent_card)
+        self._relay_stream(task)
+        if (
+            isinstance(task, TaskArtifactUpdateEvent)
+            and task.append
+            and not task.last_chunk
+        ):
+            # Mid-stream chunk, the delta already carries it to the UI
+            return current_task
+        if current_task:
+            self._event_stream.publish('task', current_task)
+        self._publish_pending()
+        return current_task
+
+    def _relay_stream(self, task: TaskCallbackArg):
+        """Push the text of a streamed chunk to the UI as a delta."""
+        if not isinstance(
+            task, (TaskStatusUpdateEvent, TaskArtifactUpdateEvent)
+        ):
+            return
+        message_id = self._pending_message_for_task(task)
+        if not message_id:
+            return
+        delta = self._stream_relay.feed(message_id, task)
+        if delta:
+            self._event_stream.publish('delta', delta.to_dict())
+
+    def _pending_message_for_task(
+        self, task: TaskStatusUpdateEvent | TaskArtifactUpdateEvent
+    ) -> str | None:
+        message_id = self._streaming_tasks.get(task.task_id)
+        if message_id in self._pending_contexts:
+            return message_id
+        for message_id in reversed(self._pending_message_ids):
+            if (
+                self._store.task_id_for_message(message_id) == task.task_id
+                or self._pending_contexts.get(message_id) == task.context_id
+            ):
+                self._streaming_tasks[task.task_id] = message_id
+                return message_id
+        return None
+
+    def _finish_stream(self, message_id: str):
+        self._pending_contexts.pop(message_id, None)
+        self._stream_relay.discard(message_id)
+        for task_id in [
+            k for k, v in self._streaming_tasks.items() if v == message_id
+        ]:
+            del self._streaming_tasks[task_id]
+
+    def _apply_task_update(self, task: TaskCallbackArg, agent_card: AgentCard):
         self.emit_event(task, agent_card)
         if isinstance(task, TaskStatusUpdateEvent):
             current_task = self.add_or_get_task(task)
@@ -271,7 +410,7 @@ class ADKHostManager(ApplicationManager):
             self.update_task(current_task)
             return current_task
         # Otherwise this is a Task, either new or updated
-        if not any(filter(lambda x: x and x.id == task.id, self._tasks)):
+        if not self._store.has_task(task.id):
             self.attach_message_to_task(task.status.message, task.id)
             self.add_task(task)
             return task
@@ -334,7 +473,7 @@ class ADKHostManager(ApplicationManager):
 
     def attach_message_to_task(self, message: Message | None, task_id: str):
         if message:
-            self._task_map[message.message_id] = task_id
+            self._store.attach_message_to_task(message.message_id, task_id)
 
     def insert_message_history(self, task: Task, message: Message | None):
         if not message:
@@ -369,9 +508,7 @@ class ADKHostManager(ApplicationManager):
             task_id = event.task_id
         if not task_id:
             task_id = str(uuid.uuid4())
-        current_task = next(
-            filter(lambda x: x.id == task_id, self._tasks), None
-        )
+        current_task = self._store.get_task(task_id)
         if not current_task:
             context_id = event.context_id
             current_task = Task(
@@ -389,61 +526,44 @@ class ADKHostManager(ApplicationManager):
     def process_artifact_event(
         self, current_task: Task, task_update_event: TaskArtifactUpdateEvent
     ):
-        artifact = task_update_event.artifact
-        if not task_update_event.append:
-            # received the first chunk or entire payload for an artifact
-            if (
-                task_update_event.lastChunk is None
-                or task_update_event.lastChunk
-            ):
-                # lastChunk bit is missing or is set to true, so this is the entire payload
-                # add this to artifacts
-                if not current_task.artifacts:
-                    current_task.artifacts = []
-                current_task.artifacts.append(artifact)
-            else:
-                # this is a chunk of an artifact, stash it in temp store for assembling
-                if artifact.artifactId not in self._artifact_chunks:
-                    self._artifact_chunks[artifact.artifactId] = []
-                self._artifact_chunks[artifact.artifactId].append(artifact)
+        artifact = self._artifact_assembler.add(
+            current_task.id, task_update_event
+        )
+        if artifact is None:
+            return
+        if current_task.artifacts:
+            current_task.artifacts.append(artifact)
         else:
-            # we received an append chunk, add to the existing temp artifact
-            current_temp_artifact = self._artifact_chunks[artifact.artifactId][
-                -1
-            ]
-            # TODO handle if current_temp_artifact is missing
-            current_temp_artifact.parts.extend(artifact.parts)
-            if task_update_event.lastChunk:
-                if current_task.artifacts:
-                    current_task.artifacts.append(current_temp_artifact)
-                else:
-                    current_task.artifacts = [current_temp_artifact]
-                del self._artifact_chunks[artifact.artifactId][-1]
+            current_task.artifacts = [artifact]
 
     def add_event(self, event: Event):
-        self._events[event.id] = event
+        self._event_log.append(event)
+        if self._persistence:
+            self._persistence.put('event', event.id, event)
+        self._event_stream.publish('event', event)
+
+    def _publish_pending(self):
+        if self._event_stream.subscriber_count:
+            self._event_stream.publish('pending', self.get_pending_messages())
 
     def get_conversation(
         self, conversation_id: str | None
     ) -> Conversation | None:
-        if not conversation_id:
-            return None
-        return next(
-            filter(
-                lambda c: c and c.conversation_id == conversation_id,
-                self._conversations,
-            ),
-            None,
-        )
+        return self._store.get_conversation(conversation_id)
+
+    async def load_conversation(self, conversation_id: str | None):
+        await self._store.load_conversation(conversation_id)
 
     def get_pending_messages(self) -> list[tuple[str, str]]:
         rval = []
         for message_id in self._pending_message_ids:
-            if message_id in self._task_map:
-                task_id = self._task_map[message_id]
-                task = next(
-                    filter(lambda x: x.id == task_id, self._tasks), None
-                )
+            streamed = self._stream_relay.text(message_id)
+            if streamed:
+                rval.append((message_id, streamed))
+                continue
+            task_id = self._store.task_id_for_message(message_id)
+            if task_id is not None:
+                task = self._store.get_task(task_id)
                 if not task:
                     rval.append((message_id, ''))
                 elif task.history and task.history[-1].parts:
@@ -521,41 +641,56 @@ class ADKHostManager(ApplicationManager):
                 can_be_removed=False  # Agentes locais não podem ser removidos
             )
             self._agents[url] = agent_info
+            self._persist_agent(url)
             print(f"🔍 Novo agente local descoberto: {agent_card.name} ({url})")
-            # Reinicializar host com novos agentes
-            self._initialize_host()
+            # Registrar no host agent sem recriá-lo
+            self._sync_host_agent(agent_info)
         else:
             # Agente já conhecido, atualizar status
             existing = self._agents[url]
+            previous_card = existing.agent_card
+            was_online = existing.is_online
             existing.last_seen = datetime.datetime.now()
             existing.is_online = True
             existing.agent_card = agent_card  # Atualizar dados
+            self._persist_agent(url)
+            if not was_online or previous_card != agent_card:
+                self._sync_host_agent(existing, previous_card)
 
-    async def _refresh_agents(self):
+    async def _refresh_agents(self, force: bool = False):
         """Força nova descoberta e atualiza status dos agentes"""
         try:
             # Descobrir agentes ativos
-            discovered = await self._agent_discovery.discover_localhost_agents()
+            discovered = await self._agent_discovery.discover_localhost_agents(
+                force=force
+            )
             discovered_urls = {agent.url for agent in discovered}
             
             # Adicionar novos agentes descobertos
             for agent_card in discovered:
                 await self._add_discovered_agent(agent_card)
             
-            # Marcar agentes não encontrados como offline
+            # Marcar como offline só os agentes cujas portas foram testadas;
+            # remotos e portas fora da varredura ou em backoff ficam como estão
             for url, agent_info in self._agents.items():
-                if url not in discovered_urls:
+                if (
+                    url not in discovered_urls
+                    and agent_info.is_online
+                    and self._agent_discovery.was_probed(url)
+                ):
                     agent_info.is_online = False
+                    self._persist_agent(url)
+                    self._sync_host_agent(agent_info)
                     
             return len(discovered)
         except Exception as e:
             print(f"Erro no refresh: {e}")
             return 0
 
-    def register_agent(self, url):
+    async def register_agent(self, url):
         """Registra um agente remoto manualmente"""
         try:
-            agent_data = get_agent_card(url)
+            agent_data = await self._card_resolver.resolve(url)
             if not agent_data.url:
                 agent_data.url = url
             
@@ -572,8 +707,12 @@ class ADKHostManager(ApplicationManager):
                 can_be_removed=not is_local  # Apenas agentes remotos podem ser removidos
             )
             
+            previous = self._agents.get(url)
             self._agents[url] = agent_info
-            self._initialize_host()
+            self._persist_agent(url)
+            self._sync_host_agent(
+                agent_info, previous.agent_card if previous else None
+            )
             
         except Exception as e:
             print(f"Erro ao registrar agente {url}: {e}")
@@ -593,7 +732,8 @@ class ADKHostManager(ApplicationManager):
                 else:
                     agent_info.status = AgentStatus.LOCAL_DISABLED
                 
-                self._initialize_host()
+                self._persist_agent(url)
+                self._sync_host_agent(agent_info)
                 return True
         return False
 
@@ -605,6 +745,8 @@ class ADKHostManager(ApplicationManager):
             # Só permite remoção completa de agentes remotos
             if not agent_info.is_local and agent_info.can_be_removed:
                 del self._agents[url]
+                self._persist_agent(url)
+                self._host_agent.remove_agent_card(agent_info.agent_card.name)
                 print(f"🗑️ Agente remoto removido: {agent_info.agent_card.name} ({url})")
             else:
                 print(f"⚠️ Agente local não pode ser removido, apenas desabilitado: {url}")
@@ -612,8 +754,8 @@ class ADKHostManager(ApplicationManager):
                 if agent_info.is_local:
                     agent_info.enabled = False
                     agent_info.status = AgentStatus.LOCAL_DISABLED
-            
-            self._initialize_host()
+                    self._persist_agent(url)
+                    self._sync_host_agent(agent_info)
 
     @property
     def agents(self) -> list[AgentInfo]:
@@ -622,15 +764,65 @@ class ADKHostManager(ApplicationManager):
 
     @property
     def conversations(self) -> list[Conversation]:
-        return self._conversations
+        return self._store.conversations
 
     @property
     def tasks(self) -> list[Task]:
-        return self._tasks
+        return self._store.tasks
 
     @property
     def events(self) -> list[Event]:
-        return sorted(self._events.values(), key=lambda x: x.timestamp)
+        return self._event_log.page()[0]
+
+    def conversations_since(
+        self, since: str | None
+    ) -> tuple[list[Conversation], str]:
+        return self._store.conversations_since(since)
+
+    def messages_since(
+        self, conversation_id: str, since: str | None
+    ) -> tuple[list[Message], str]:
+        return self._store.messages_since(conversation_id, since)
+
+    def tasks_since(self, since: str | None) -> tuple[list[Task], str]:
+        return self._store.tasks_since(since)
+
+    def events_since(self, since: str | None) -> tuple[list[Event], str]:
+        return self._event_log.since(since)
+
+    def page_events(
+        self,
+        offset: int = 0,
+        limit: int | None = None,
+        since_timestamp: float | None = None,
+        context_id: str | None = None,
+        actor: str | None = None,
+        descending: bool = False,
+    ) -> tuple[list[Event], int, str]:
+        # Read the cursor first, events appended while paging are then
+        # returned again by the next `since` call instead of being skipped.
+        cursor = self._event_log.cursor
+        events, total = self._event_log.page(
+            offset, limit, since_timestamp, context_id, actor, descending
+        )
+        return events, total, cursor
+
+    def page_tasks(
+        self,
+        offset: int = 0,
+        limit: int | None = None,
+        context_id: str | None = None,
+        state: str | None = None,
+        descending: bool = False,
+    ) -> tuple[list[Task], int, str]:
+        tasks, total = self._store.page_tasks(
+            offset, limit, context_id, state, descending
+        )
+        return tasks, total, self._store.cursor
+
+    @property
+    def event_stream(self) -> EventBroadcaster:
+        return self._event_stream
 
     def adk_content_from_message(self, message: Message) -> types.Content:
         parts: list[types.Part] = []
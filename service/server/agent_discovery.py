@@ -3,12 +3,23 @@ Agent Discovery Service - Auto-descoberta de agentes localhost
 
 Este serviço automaticamente descobrir e registra agentes A2A rodando em localhost
 nas portas padrão, mantendo-os sempre disponíveis na lista de Remote Agents.
+
+Cada varredura testa as portas em paralelo com uma conexão TCP barata antes de
+qualquer requisição HTTP, para no primeiro endpoint que devolve um agent card
+válido, revalida cards já conhecidos com ETag/If-None-Match e aplica backoff
+exponencial em portas que não respondem.
+
+As portas podem ser configuradas com a variável de ambiente
+A2A_DISCOVERY_PORTS, por exemplo "10000-10100,11000,12000".
 """
 
 import asyncio
 import json
 import logging
-from typing import List, Optional
+import os
+import time
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
 
 import httpx
 from a2a.types import AgentCard
@@ -25,7 +36,7 @@ DEFAULT_AGENT_PORTS = [
     # Não incluir 12000 (UI) na descoberta para evitar auto-descoberta
 ]
 
-# Endpoints possíveis para agent cards
+# Endpoints possíveis para agent cards, em ordem de preferência
 AGENT_CARD_ENDPOINTS = [
     "/.well-known/agent.json",
     "/agent-card",
@@ -34,26 +45,94 @@ AGENT_CARD_ENDPOINTS = [
 ]
 
 
+def parse_port_spec(spec: str) -> List[int]:
+    """Converte "10000-10100,12000" em uma lista ordenada de portas"""
+    ports = set()
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        if "-" in item:
+            start, end = item.split("-", 1)
+            ports.update(range(int(start), int(end) + 1))
+        else:
+            ports.add(int(item))
+    return sorted(ports)
+
+
+def configured_ports() -> List[int]:
+    """Portas da variável A2A_DISCOVERY_PORTS ou as portas padrão"""
+    spec = os.environ.get("A2A_DISCOVERY_PORTS", "")
+    return parse_port_spec(spec) if spec else list(DEFAULT_AGENT_PORTS)
+
+
+@dataclass
+class _CachedCard:
+    """Último card válido de uma porta e o endpoint que o respondeu"""
+    endpoint: str
+    card: AgentCard
+    etag: Optional[str] = None
+
+
+@dataclass
+class _PortBackoff:
+    """Estado de backoff de uma porta que não respondeu"""
+    failures: int = 0
+    next_probe_at: float = 0.0
+
+
 class AgentDiscovery:
     """Serviço de descoberta automática de agentes localhost"""
     
-    def __init__(self, http_client: httpx.AsyncClient, timeout: float = 5.0):
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient,
+        timeout: float = 5.0,
+        ports: Optional[Iterable[int]] = None,
+        connect_timeout: float = 0.3,
+        max_concurrency: int = 64,
+        backoff_base: float = 60.0,
+        backoff_max: float = 1800.0,
+    ):
         self.http_client = http_client
         self.timeout = timeout
+        self.ports = list(ports) if ports is not None else configured_ports()
+        self.connect_timeout = connect_timeout
+        self.max_concurrency = max_concurrency
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
         self.discovered_agents: List[AgentCard] = []
+        # Duração da última varredura em segundos
+        self.last_sweep_seconds: float = 0.0
+        self._card_cache: dict[int, _CachedCard] = {}
+        self._backoff: dict[int, _PortBackoff] = {}
+        # Portas testadas na última varredura, as outras não dizem nada
+        # sobre os agentes que escutam nelas
+        self.last_probed_ports: set[int] = set()
         
-    async def discover_localhost_agents(self) -> List[AgentCard]:
-        """Descobre todos os agentes rodando em localhost"""
-        tasks = []
-        
-        for port in DEFAULT_AGENT_PORTS:
-            for endpoint in AGENT_CARD_ENDPOINTS:
-                url = f"http://localhost:{port}{endpoint}"
-                task = asyncio.create_task(self._check_agent_endpoint(url, port))
-                tasks.append(task)
-        
+    async def discover_localhost_agents(self, force: bool = False) -> List[AgentCard]:
+        """Descobre todos os agentes rodando em localhost
+
+        Args:
+            force: ignora o backoff e testa todas as portas configuradas
+        """
+        started = time.monotonic()
+        now = time.monotonic()
+        ports = [
+            port for port in self.ports
+            if force or port not in self._backoff
+            or self._backoff[port].next_probe_at <= now
+        ]
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def probe(port: int) -> Optional[AgentCard]:
+            async with semaphore:
+                return await self._probe_port(port)
+
         # Executar todas as verificações em paralelo
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        results = await asyncio.gather(
+            *(probe(port) for port in ports), return_exceptions=True
+        )
         
         # Filtrar resultados válidos
         valid_agents = []
@@ -65,32 +144,121 @@ class AgentDiscovery:
                     logger.info(f"Descoberto agente: {result.name} em {result.url}")
         
         self.discovered_agents = valid_agents
+        self.last_probed_ports = set(ports)
+        self.last_sweep_seconds = time.monotonic() - started
+        logger.info(
+            f"Varredura de {len(ports)}/{len(self.ports)} portas concluída em "
+            f"{self.last_sweep_seconds:.3f}s ({len(valid_agents)} agentes)"
+        )
         return valid_agents
+
+    def was_probed(self, url: str) -> bool:
+        """Se a URL aponta para uma porta localhost testada na última varredura"""
+        try:
+            parsed = httpx.URL(url)
+        except (httpx.InvalidURL, TypeError):
+            return False
+        return (
+            parsed.host in ("localhost", "127.0.0.1")
+            and parsed.port in self.last_probed_ports
+        )
+
+    async def _probe_port(self, port: int) -> Optional[AgentCard]:
+        """Testa uma porta: conexão TCP, card em cache e depois os endpoints"""
+        if not await self._is_port_open(port):
+            self._record_failure(port)
+            return None
+
+        card = await self._revalidate_cached_card(port)
+        if card is None:
+            for endpoint in AGENT_CARD_ENDPOINTS:
+                url = f"http://localhost:{port}{endpoint}"
+                card = await self._check_agent_endpoint(url, port)
+                if card:
+                    break
+
+        if card is None:
+            self._record_failure(port)
+        else:
+            self._backoff.pop(port, None)
+        return card
+
+    async def _is_port_open(self, port: int) -> bool:
+        """Conexão TCP rápida para evitar requisições HTTP a portas fechadas"""
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection("localhost", port),
+                timeout=self.connect_timeout,
+            )
+        except (OSError, asyncio.TimeoutError):
+            return False
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return True
+
+    def _record_failure(self, port: int):
+        """Agenda a próxima tentativa com backoff exponencial"""
+        state = self._backoff.setdefault(port, _PortBackoff())
+        delay = min(self.backoff_base * 2 ** state.failures, self.backoff_max)
+        state.failures += 1
+        state.next_probe_at = time.monotonic() + delay
+        self._card_cache.pop(port, None)
+
+    async def _revalidate_cached_card(self, port: int) -> Optional[AgentCard]:
+        """Revalida o card em cache com If-None-Match"""
+        cached = self._card_cache.get(port)
+        if not cached:
+            return None
+        headers = {"If-None-Match": cached.etag} if cached.etag else {}
+        url = f"http://localhost:{port}{cached.endpoint}"
+        try:
+            response = await self.http_client.get(
+                url, headers=headers, timeout=self.timeout
+            )
+        except (httpx.RequestError, httpx.TimeoutException):
+            return None
+        if response.status_code == 304:
+            return cached.card
+        return self._card_from_response(response, port, cached.endpoint)
     
     async def _check_agent_endpoint(self, url: str, port: int) -> Optional[AgentCard]:
         """Verifica um endpoint específico para agent card"""
         try:
             response = await self.http_client.get(url, timeout=self.timeout)
-            
-            if response.status_code == 200:
-                try:
-                    data = response.json()
-                    
-                    # Verificar se é um agent card válido
-                    if self._is_valid_agent_card(data):
-                        agent_card = self._parse_agent_card(data, port)
-                        return agent_card
-                        
-                except (json.JSONDecodeError, ValueError):
-                    # Tentar parsing como health check
-                    if "status" in response.text and "healthy" in response.text:
-                        return self._create_basic_agent_card(port, "Health Check Agent")
-                        
         except (httpx.RequestError, httpx.TimeoutException):
             # Agente não disponível nesta porta/endpoint
-            pass
+            return None
+        return self._card_from_response(response, port, httpx.URL(url).path)
+
+    def _card_from_response(
+        self, response: httpx.Response, port: int, endpoint: str
+    ) -> Optional[AgentCard]:
+        """Extrai o agent card de uma resposta e guarda no cache"""
+        if response.status_code != 200:
+            return None
+        agent_card = None
+        try:
+            data = response.json()
             
-        return None
+            # Verificar se é um agent card válido
+            if self._is_valid_agent_card(data):
+                agent_card = self._parse_agent_card(data, port)
+                
+        except (json.JSONDecodeError, ValueError):
+            # Tentar parsing como health check
+            if "status" in response.text and "healthy" in response.text:
+                agent_card = self._create_basic_agent_card(port, "Health Check Agent")
+
+        if agent_card:
+            self._card_cache[port] = _CachedCard(
+                endpoint=endpoint,
+                card=agent_card,
+                etag=response.headers.get("etag"),
+            )
+        return agent_card
     
     def _is_valid_agent_card(self, data: dict) -> bool:
         """Verifica se os dados representam um agent card válido"""
@@ -177,12 +345,7 @@ class AgentDiscovery:
     
     async def get_agent_by_port(self, port: int) -> Optional[AgentCard]:
         """Busca um agente específico por porta"""
-        for endpoint in AGENT_CARD_ENDPOINTS:
-            url = f"http://localhost:{port}{endpoint}"
-            agent = await self._check_agent_endpoint(url, port)
-            if agent:
-                return agent
-        return None
+        return await self._probe_port(port)
     
     def get_discovered_agents(self) -> List[AgentCard]:
         """Retorna lista de agentes descobertos"""
@@ -227,7 +390,7 @@ async def auto_discover_and_register(discovery: AgentDiscovery, manager) -> List
         # Registrar cada agente encontrado
         for agent in agents:
             try:
-                manager.register_agent(agent.url)
+                await manager.register_agent(agent.url)
                 logger.info(f"Agente registrado automaticamente: {agent.name} ({agent.url})")
             except Exception as e:
                 logger.warning(f"Falha ao registrar agente {agent.name}: {e}")
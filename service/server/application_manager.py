@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 
 from a2a.types import AgentCard, Message, Task
 
+from service.server.event_stream import EventBroadcaster
 from service.types import Conversation, Event
 
 
@@ -19,7 +20,7 @@ class ApplicationManager(ABC):
         pass
 
     @abstractmethod
-    def register_agent(self, url: str):
+    async def register_agent(self, url: str):
         pass
 
     @abstractmethod
@@ -36,6 +37,14 @@ class ApplicationManager(ABC):
     ) -> Conversation | None:
         pass
 
+    @abstractmethod
+    async def load_conversation(self, conversation_id: str | None):
+        """Bring the messages of a conversation into memory.
+
+        Awaited on the event loop before the synchronous accessors, so a
+        conversation evicted from memory is read without blocking the loop.
+        """
+
     @property
     @abstractmethod
     def conversations(self) -> list[Conversation]:
@@ -55,3 +64,51 @@ class ApplicationManager(ABC):
     @abstractmethod
     def events(self) -> list[Event]:
         pass
+
+    @property
+    @abstractmethod
+    def event_stream(self) -> EventBroadcaster:
+        pass
+
+    @abstractmethod
+    def conversations_since(
+        self, since: str | None
+    ) -> tuple[list[Conversation], str]:
+        """Conversations changed after the cursor, plus the new cursor."""
+
+    @abstractmethod
+    def messages_since(
+        self, conversation_id: str, since: str | None
+    ) -> tuple[list[Message], str]:
+        """Messages of a conversation changed after the cursor."""
+
+    @abstractmethod
+    def tasks_since(self, since: str | None) -> tuple[list[Task], str]:
+        """Tasks changed after the cursor, plus the new cursor."""
+
+    @abstractmethod
+    def events_since(self, since: str | None) -> tuple[list[Event], str]:
+        """Events recorded after the cursor, plus the new cursor."""
+
+    @abstractmethod
+    def page_events(
+        self,
+        offset: int = 0,
+        limit: int | None = None,
+        since_timestamp: float | None = None,
+        context_id: str | None = None,
+        actor: str | None = None,
+        descending: bool = False,
+    ) -> tuple[list[Event], int, str]:
+        """A page of events in timestamp order, the total and the cursor."""
+
+    @abstractmethod
+    def page_tasks(
+        self,
+        offset: int = 0,
+        limit: int | None = None,
+        context_id: str | None = None,
+        state: str | None = None,
+        descending: bool = False,
+    ) -> tuple[list[Task], int, str]:
+        """A page of tasks in creation order, the total and the cursor."""
@@ -0,0 +1,283 @@
+"""Assembly of chunked artifacts streamed by remote agents.
+
+A TaskArtifactUpdateEvent with `append` set adds parts to the artifact
+started by an earlier event with the same artifact_id, `last_chunk`
+closes it. Chunks are accumulated in per-part builders instead of lists of
+pydantic parts: contiguous text is joined once at the end and inline file
+bytes are decoded into a bytearray, so a large artifact costs one copy of
+its payload rather than one Part per chunk.
+
+Partial artifacts that stop receiving chunks are dropped after `ttl`
+seconds, and the total buffered size is capped by `max_bytes`, the least
+recently updated partials are dropped first.
+
+A file chunk whose bytes do not decode (malformed base64, or a chunk cut
+in the middle of a base64 quantum) is not merged, it is kept as its own
+part so one bad chunk never fails the task update.
+"""
+
+import base64
+import binascii
+import logging
+import time
+
+from collections import OrderedDict
+from typing import Any
+
+from a2a.types import (
+    Artifact,
+    FilePart,
+    FileWithBytes,
+    Part,
+    TaskArtifactUpdateEvent,
+    TextPart,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class _TextBuilder:
+    def __init__(self, text: str):
+        self._chunks = [text]
+        self.size = len(text)
+
+    def accepts(self, part: Part) -> bool:
+        return part.root.kind == 'text'
+
+    def add(self, part: Part):
+        self._chunks.append(part.root.text)
+        self.size += len(part.root.text)
+
+    def prepend(self, part: Part):
+        self._chunks.insert(0, part.root.text)
+        self.size += len(part.root.text)
+
+    def build(self) -> Part:
+        return Part(root=TextPart(text=''.join(self._chunks)))
+
+
+class _BytesBuilder:
+    def __init__(self, file: FileWithBytes):
+        self._mime_type = file.mime_type
+        self._name = file.name
+        self._data = bytearray(base64.b64decode(file.bytes))
+        self.size = len(self._data)
+
+    def accepts(self, part: Part) -> bool:
+        return (
+            isinstance(part.root, FilePart)
+            and isinstance(part.root.file, FileWithBytes)
+            and part.root.file.mime_type == self._mime_type
+            and part.root.file.name in (None, self._name)
+        )
+
+    def add(self, part: Part):
+        chunk = base64.b64decode(part.root.file.bytes)
+        self._data += chunk
+        self.size += len(chunk)
+
+    def prepend(self, part: Part):
+        chunk = base64.b64decode(part.root.file.bytes)
+        self._data[0:0] = chunk
+        self.size += len(chunk)
+
+    def build(self) -> Part:
+        return Part(
+            root=FilePart(
+                file=FileWithBytes(
+                    bytes=base64.b64encode(memoryview(self._data)).decode(
+                        'ascii'
+                    ),
+                    mime_type=self._mime_type,
+                    name=self._name,
+                )
+            )
+        )
+
+
+class _PartHolder:
+    """Parts that are not merged with their neighbours (data, file uris)."""
+
+    def __init__(self, part: Part):
+        self._part = part
+        self.size = len(part.model_dump_json())
+
+    def accepts(self, part: Part) -> bool:
+        return False
+
+    def build(self) -> Part:
+        return self._part
+
+
+def _builder_for(part: Part):
+    if part.root.kind == 'text':
+        return _TextBuilder(part.root.text)
+    if isinstance(part.root, FilePart) and isinstance(
+        part.root.file, FileWithBytes
+    ):
+        try:
+            return _BytesBuilder(part.root.file)
+        except (binascii.Error, ValueError):
+            pass
+    return _PartHolder(part)
+
+
+def _merge(merge, part: Part) -> bool:
+    """Merge a part into a builder, False if its bytes do not decode."""
+    try:
+        merge(part)
+    except (binascii.Error, ValueError) as e:
+        logger.warning(f'Keeping undecodable file chunk as its own part: {e}')
+        return False
+    return True
+
+
+class _PartialArtifact:
+    def __init__(self, artifact: Artifact, has_first_chunk: bool):
+        self.has_first_chunk = has_first_chunk
+        self.builders: list[Any] = []
+        self.size = 0
+        self.updated_at = time.monotonic()
+        self._set_header(artifact)
+
+    def _set_header(self, artifact: Artifact):
+        self.header = artifact.model_copy(update={'parts': []})
+
+    def append(self, parts: list[Part]):
+        for part in parts:
+            last = self.builders[-1] if self.builders else None
+            if last is not None and last.accepts(part):
+                before = last.size
+                if _merge(last.add, part):
+                    self.size += last.size - before
+                    continue
+            builder = _builder_for(part)
+            self.builders.append(builder)
+            self.size += builder.size
+
+    def prepend_first_chunk(self, artifact: Artifact):
+        """The first chunk arrived after some of the appended ones."""
+        self._set_header(artifact)
+        self.has_first_chunk = True
+        for part in reversed(artifact.parts):
+            first = self.builders[0] if self.builders else None
+            if first is not None and first.accepts(part):
+                before = first.size
+                if _merge(first.prepend, part):
+                    self.size += first.size - before
+                    continue
+            builder = _builder_for(part)
+            self.builders.insert(0, builder)
+            self.size += builder.size
+
+    def build(self) -> Artifact:
+        return self.header.model_copy(
+            update={'parts': [b.build() for b in self.builders]}
+        )
+
+
+class ArtifactAssembler:
+    """Collects artifact chunks per (task id, artifact id)."""
+
+    def __init__(
+        self, ttl: float = 300.0, max_bytes: int = 256 * 1024 * 1024
+    ):
+        self._ttl = ttl
+        self._max_bytes = max_bytes
+        # Least recently updated first
+        self._partials: OrderedDict[tuple[str, str], _PartialArtifact] = (
+            OrderedDict()
+        )
+        self._size = 0
+        self.dropped = 0
+        # Recently dropped partials, their remaining chunks are ignored
+        # instead of being assembled into a truncated artifact.
+        self._dropped_keys: OrderedDict[tuple[str, str], None] = OrderedDict()
+
+    def add(
+        self, task_id: str, event: TaskArtifactUpdateEvent
+    ) -> Artifact | None:
+        """Add a chunk, returns the artifact once it is complete."""
+        artifact = event.artifact
+        key = (task_id, artifact.artifact_id)
+        self._expire()
+        if event.append and key in self._dropped_keys:
+            if event.last_chunk:
+                del self._dropped_keys[key]
+            return None
+        self._dropped_keys.pop(key, None)
+        partial = self._partials.get(key)
+        if not event.append:
+            if partial is not None and not partial.has_first_chunk:
+                # Out of order, the appended chunks arrived first
+                self._size -= partial.size
+                partial.prepend_first_chunk(artifact)
+                self._size += partial.size
+            else:
+                if partial is not None:
+                    # A new artifact with the same id replaces the old one
+                    self._discard(key)
+                    partial = None
+                if event.last_chunk is None or event.last_chunk:
+                    # The whole artifact in one event, nothing to assemble
+                    return artifact
+                partial = _PartialArtifact(artifact, has_first_chunk=True)
+                partial.append(artifact.parts)
+                self._partials[key] = partial
+                self._size += partial.size
+        else:
+            if partial is None:
+                logger.warning(
+                    f'Chunk for artifact {artifact.artifact_id} of task '
+                    f'{task_id} arrived before its first chunk'
+                )
+                partial = _PartialArtifact(artifact, has_first_chunk=False)
+                self._partials[key] = partial
+            self._size -= partial.size
+            partial.append(artifact.parts)
+            self._size += partial.size
+        partial.updated_at = time.monotonic()
+        self._partials.move_to_end(key)
+        if event.last_chunk or (not event.append and event.last_chunk is None):
+            self._discard(key)
+            return partial.build()
+        self._enforce_cap()
+        return None
+
+    def _discard(self, key: tuple[str, str]):
+        partial = self._partials.pop(key, None)
+        if partial is not None:
+            self._size -= partial.size
+
+    def _expire(self):
+        deadline = time.monotonic() - self._ttl
+        while self._partials:
+            key, partial = next(iter(self._partials.items()))
+            if partial.updated_at > deadline:
+                break
+            logger.warning(f'Dropping abandoned partial artifact {key}')
+            self._drop(key)
+
+    def _enforce_cap(self):
+        while self._size > self._max_bytes and self._partials:
+            key = next(iter(self._partials))
+            logger.warning(
+                f'Dropping partial artifact {key}, buffered artifacts '
+                f'exceed {self._max_bytes} bytes'
+            )
+            self._drop(key)
+
+    def _drop(self, key: tuple[str, str]):
+        self._discard(key)
+        self.dropped += 1
+        self._dropped_keys[key] = None
+        while len(self._dropped_keys) > 1000:
+            self._dropped_keys.popitem(last=False)
+
+    @property
+    def pending_bytes(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._partials)
@@ -0,0 +1,337 @@
+"""Bounded, ordered log of the events shown on the UI event list.
+
+Events are kept sorted by timestamp as they are appended, so reads never
+sort. Appends, evictions and positional reads are O(1) (amortized); a page
+read costs O(log N + page). Evicting an event from the middle of an index
+leaves a tombstone, which adds O(log T) to the reads of that index.
+Secondary indexes by conversation and by actor make filtered pages as cheap
+as unfiltered ones.
+
+Configuration through environment variables:
+  A2A_UI_EVENT_LOG_SIZE    maximum number of events kept (default 10000)
+"""
+
+import bisect
+import itertools
+import os
+import threading
+
+from typing import Any
+
+from service.server.sync_cursor import format_cursor, new_epoch, parse_cursor
+from service.types import Event
+
+
+# Compact the backing lists once this many slots before the head are unused
+_COMPACT_THRESHOLD = 1024
+
+
+def configured_event_log_size() -> int:
+    return int(os.environ.get('A2A_UI_EVENT_LOG_SIZE', '10000'))
+
+
+def _page_bounds(
+    start: int, end: int, offset: int, limit: int | None, descending: bool
+) -> tuple[int, int]:
+    """Positions [start, stop) of a page within the matching range."""
+    offset = max(offset, 0)
+    if descending:
+        stop = max(end - offset, start)
+        first = start if limit is None else max(stop - max(limit, 0), start)
+        return first, stop
+    first = min(start + offset, end)
+    stop = end if limit is None else min(first + max(limit, 0), end)
+    return first, stop
+
+
+class _OrderedSegment:
+    """Array of items sorted by key with a moving head.
+
+    Items are appended at the tail (the common case, keys arrive in order)
+    or inserted in key order, and dropped from the head by advancing an
+    offset. An item removed elsewhere is found through its slot and left as
+    a tombstone that positional reads skip. The dead prefix and the
+    tombstones are released in bulk, so removals stay O(1) amortized while
+    positional access costs O(log T) for T tombstones.
+    """
+
+    def __init__(self):
+        self._keys: list[float] = []
+        self._items: list[Any] = []
+        self._head = 0
+        # id(item) -> index of the item in the lists
+        self._slots: dict[int, int] = {}
+        # Sorted indexes of the items removed after the head
+        self._tombstones: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self._items) - self._head - len(self._tombstones)
+
+    def insert(self, key: float, item: Any):
+        if not self or key >= self._keys[-1]:
+            self._slots[id(item)] = len(self._items)
+            self._keys.append(key)
+            self._items.append(item)
+            return
+        # Late arrival, keep the order stable for equal keys
+        index = bisect.bisect_right(self._keys, key, lo=self._head)
+        self._keys.insert(index, key)
+        self._items.insert(index, item)
+        # The list insert already moves the tail, so do its slots
+        for i in range(index, len(self._items)):
+            if self._items[i] is not None:
+                self._slots[id(self._items[i])] = i
+        for i in range(
+            bisect.bisect_left(self._tombstones, index), len(self._tombstones)
+        ):
+            self._tombstones[i] += 1
+
+    def first(self) -> Any:
+        return self._items[self._head]
+
+    def remove(self, item: Any):
+        index = self._slots.pop(id(item), None)
+        if index is None:
+            return
+        self._items[index] = None
+        if index != self._head:
+            bisect.insort(self._tombstones, index)
+            if (
+                len(self._tombstones) >= _COMPACT_THRESHOLD
+                or len(self._tombstones) > len(self)
+            ):
+                self._sweep()
+            return
+        self._head += 1
+        # Tombstones reached by the head join the dead prefix
+        dead = 0
+        while (
+            dead < len(self._tombstones)
+            and self._tombstones[dead] == self._head
+        ):
+            dead += 1
+            self._head += 1
+        if dead:
+            del self._tombstones[:dead]
+        self._compact()
+
+    def _compact(self):
+        if self._head >= _COMPACT_THRESHOLD and self._head * 2 >= len(
+            self._items
+        ):
+            del self._items[: self._head]
+            del self._keys[: self._head]
+            for item_id in self._slots:
+                self._slots[item_id] -= self._head
+            self._tombstones = [i - self._head for i in self._tombstones]
+            self._head = 0
+
+    def _sweep(self):
+        """Drop the dead prefix and the tombstones."""
+        live = [
+            i
+            for i in range(self._head, len(self._items))
+            if self._items[i] is not None
+        ]
+        self._keys = [self._keys[i] for i in live]
+        self._items = [self._items[i] for i in live]
+        self._slots = {id(item): i for i, item in enumerate(self._items)}
+        self._tombstones = []
+        self._head = 0
+
+    def _index_of(self, position: int) -> int:
+        """Index in the lists of the item at a logical position."""
+        # Tombstone i is before the item when fewer than position live
+        # items precede it, tombstones[i] - i only grows with i
+        lo, hi = 0, len(self._tombstones)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._tombstones[mid] - mid - self._head <= position:
+                lo = mid + 1
+            else:
+                hi = mid
+        return self._head + position + lo
+
+    def index_after(self, key: float) -> int:
+        """Logical position of the first item with a key greater than key."""
+        index = bisect.bisect_right(self._keys, key, lo=self._head)
+        tombstones = bisect.bisect_left(self._tombstones, index)
+        return index - self._head - tombstones
+
+    def slice(self, start: int, stop: int) -> list[Any]:
+        if not self._tombstones:
+            return self._items[self._head + start : self._head + stop]
+        items = self._items[self._index_of(start) : self._index_of(stop)]
+        return [item for item in items if item is not None]
+
+
+class EventLog:
+    """Append-only event history with a configurable cap.
+
+    Every event gets a sequence number in arrival order which, with the epoch
+    of the log, makes the sync cursor of /events/get. Once the log holds max_events events the
+    oldest arrival is dropped.
+    """
+
+    def __init__(self, max_events: int | None = None):
+        self._max_events = max_events or configured_event_log_size()
+        self._sequence = itertools.count(1)
+        self._last_sequence = 0
+        self._epoch = new_epoch()
+        # Ordered by timestamp
+        self._by_time = _OrderedSegment()
+        # Ordered by sequence number, drives eviction and cursor reads
+        self._by_sequence = _OrderedSegment()
+        self._by_context: dict[str, _OrderedSegment] = {}
+        self._by_actor: dict[str, _OrderedSegment] = {}
+        self._ids: set[str] = set()
+        # Task callbacks may append from other threads
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._by_sequence)
+
+    @property
+    def sequence(self) -> int:
+        """Sequence number of the last appended event."""
+        return self._last_sequence
+
+    @property
+    def cursor(self) -> str:
+        """Sync cursor of the last appended event."""
+        return format_cursor(self._epoch, self._last_sequence)
+
+    @property
+    def max_events(self) -> int:
+        return self._max_events
+
+    def append(self, event: Event):
+        with self._lock:
+            if event.id in self._ids:
+                return
+            self._ids.add(event.id)
+            self._last_sequence = next(self._sequence)
+            self._by_sequence.insert(self._last_sequence, event)
+            self._by_time.insert(event.timestamp, event)
+            self._index(self._by_context, event.content.context_id, event)
+            self._index(self._by_actor, event.actor, event)
+            while len(self._by_sequence) > self._max_events:
+                self._evict(self._by_sequence.first())
+
+    @staticmethod
+    def _index(
+        index: dict[str, _OrderedSegment], key: str | None, event: Event
+    ):
+        if key:
+            index.setdefault(key, _OrderedSegment()).insert(
+                event.timestamp, event
+            )
+
+    @staticmethod
+    def _unindex(
+        index: dict[str, _OrderedSegment], key: str | None, event: Event
+    ):
+        segment = index.get(key) if key else None
+        if segment is None:
+            return
+        segment.remove(event)
+        if not segment:
+            del index[key]
+
+    def _evict(self, event: Event):
+        self._by_sequence.remove(event)
+        self._by_time.remove(event)
+        self._unindex(self._by_context, event.content.context_id, event)
+        self._unindex(self._by_actor, event.actor, event)
+        self._ids.discard(event.id)
+
+    def page(
+        self,
+        offset: int = 0,
+        limit: int | None = None,
+        since_timestamp: float | None = None,
+        context_id: str | None = None,
+        actor: str | None = None,
+        descending: bool = False,
+    ) -> tuple[list[Event], int]:
+        """Return a page of events in timestamp order.
+
+        since_timestamp keeps the events strictly newer than it, descending
+        pages from the newest event. Returns the page and the number of
+        events matching the filters.
+        """
+        with self._lock:
+            if context_id and actor:
+                return self._filtered_page(
+                    offset,
+                    limit,
+                    since_timestamp,
+                    context_id,
+                    actor,
+                    descending,
+                )
+            if context_id:
+                segment = self._by_context.get(context_id)
+            elif actor:
+                segment = self._by_actor.get(actor)
+            else:
+                segment = self._by_time
+            if segment is None:
+                return [], 0
+            start = (
+                segment.index_after(since_timestamp)
+                if since_timestamp is not None
+                else 0
+            )
+            total = len(segment) - start
+            start, stop = _page_bounds(
+                start, len(segment), offset, limit, descending
+            )
+            events = segment.slice(start, stop)
+            if descending:
+                events.reverse()
+            return events, total
+
+    def _filtered_page(
+        self,
+        offset: int,
+        limit: int | None,
+        since_timestamp: float | None,
+        context_id: str,
+        actor: str,
+        descending: bool,
+    ) -> tuple[list[Event], int]:
+        # Both filters set, walk the conversation index which is the
+        # smaller of the two in practice.
+        segment = self._by_context.get(context_id)
+        if segment is None:
+            return [], 0
+        start = (
+            segment.index_after(since_timestamp)
+            if since_timestamp is not None
+            else 0
+        )
+        matches = [
+            x for x in segment.slice(start, len(segment)) if x.actor == actor
+        ]
+        start, stop = _page_bounds(0, len(matches), offset, limit, descending)
+        events = matches[start:stop]
+        if descending:
+            events.reverse()
+        return events, len(matches)
+
+    def since(self, cursor: str | None) -> tuple[list[Event], str]:
+        """Events appended after the cursor, in timestamp order.
+
+        A cursor of another epoch was issued by a previous process and
+        returns the full history.
+        """
+        with self._lock:
+            sequence = parse_cursor(self._epoch, cursor, self._last_sequence)
+            if not sequence:
+                return self._by_time.slice(0, len(self._by_time)), self.cursor
+            start = self._by_sequence.index_after(sequence)
+            events = self._by_sequence.slice(start, len(self._by_sequence))
+            # Usually already in timestamp order, sorting the delta is cheap
+            events.sort(key=lambda x: x.timestamp)
+            return events, self.cursor
@@ -0,0 +1,90 @@
+import asyncio
+import itertools
+
+from typing import Any
+
+
+class EventSubscription:
+    """A single subscriber of the EventBroadcaster.
+
+    Each subscription owns a bounded queue living on the event loop that
+    created it. If the consumer falls behind and the queue fills up, the
+    backlog is dropped and replaced by a single 'sync' entry that tells the
+    consumer to reload the full state instead.
+    """
+
+    def __init__(
+        self,
+        broadcaster: 'EventBroadcaster',
+        loop: asyncio.AbstractEventLoop,
+        max_queue_size: int,
+    ):
+        self._broadcaster = broadcaster
+        self._loop = loop
+        self._queue: asyncio.Queue[tuple[int, str, Any]] = asyncio.Queue(
+            maxsize=max_queue_size
+        )
+
+    def _put(self, item: tuple[int, str, Any]):
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait((item[0], 'sync', None))
+
+    def deliver(self, item: tuple[int, str, Any]):
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._put(item)
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._put, item)
+
+    async def get(self) -> tuple[int, str, Any]:
+        return await self._queue.get()
+
+    def close(self):
+        self._broadcaster.unsubscribe(self)
+
+    def __enter__(self) -> 'EventSubscription':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class EventBroadcaster:
+    """Fans out state changes of an ApplicationManager to stream subscribers.
+
+    Publishing is safe from any thread, the items are handed over to the
+    event loop of every subscriber.
+    """
+
+    def __init__(self, max_queue_size: int = 256):
+        self._max_queue_size = max_queue_size
+        self._subscriptions: set[EventSubscription] = set()
+        self._sequence = itertools.count(1)
+
+    def subscribe(self) -> EventSubscription:
+        subscription = EventSubscription(
+            self, asyncio.get_running_loop(), self._max_queue_size
+        )
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: EventSubscription):
+        self._subscriptions.discard(subscription)
+
+    def publish(self, kind: str, data: Any):
+        if not self._subscriptions:
+            return
+        item = (next(self._sequence), kind, data)
+        for subscription in list(self._subscriptions):
+            subscription.deliver(item)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
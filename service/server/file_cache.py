@@ -0,0 +1,214 @@
+"""Content addressed cache for the file parts served by /message/file/{id}.
+
+Every payload is decoded once, hashed and written to disk under its sha256
+digest, so identical files are stored a single time and the digest doubles as
+a strong ETag. A bounded LRU keeps the most recently served small files in
+memory, with their MIME type; everything else is memory-mapped from disk when
+it is requested, so large artifacts never have to live on the heap. The disk
+tier is bounded too, past its budget the least recently used files are
+deleted, and the files left by earlier runs count against it.
+"""
+
+import hashlib
+import mmap
+import os
+import re
+import tempfile
+import threading
+
+from collections import OrderedDict
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+
+_DIGEST_RE = re.compile(r'^[0-9a-f]{64}$')
+# Prefix of the files still being written
+_TMP_PREFIX = '.tmp'
+
+CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class CachedFile:
+    digest: str
+    mime_type: str
+    size: int
+    # Either the in-memory bytes or the path of the file on disk
+    data: bytes | None = None
+    path: str | None = None
+
+    def iter_range(
+        self, start: int = 0, end: int | None = None
+    ) -> Iterator[bytes]:
+        """Yield the bytes in [start, end] (inclusive) in chunks."""
+        end = self.size - 1 if end is None else min(end, self.size - 1)
+        if start > end:
+            return
+        if self.data is not None:
+            view = memoryview(self.data)
+            for offset in range(start, end + 1, CHUNK_SIZE):
+                yield bytes(view[offset : min(offset + CHUNK_SIZE, end + 1)])
+            return
+        with open(self.path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                for offset in range(start, end + 1, CHUNK_SIZE):
+                    yield m[offset : min(offset + CHUNK_SIZE, end + 1)]
+
+
+class FileCache:
+    """Disk backed file store with an in-memory LRU of bounded size."""
+
+    def __init__(
+        self,
+        directory: str | None = None,
+        memory_budget: int = 64 * 1024 * 1024,
+        max_memory_item: int = 4 * 1024 * 1024,
+        disk_budget: int = 1024 * 1024 * 1024,
+    ):
+        self._directory = directory or os.path.join(
+            tempfile.gettempdir(), 'a2a-ui-files'
+        )
+        os.makedirs(self._directory, exist_ok=True)
+        self._memory_budget = memory_budget
+        self._max_memory_item = min(max_memory_item, memory_budget)
+        # digest -> (bytes, MIME type), least recently used first
+        self._memory: OrderedDict[str, tuple[bytes, str]] = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_budget = disk_budget
+        # digest -> size of the file on disk, least recently used first
+        self._disk: OrderedDict[str, int] = self._scan()
+        self._disk_bytes = sum(self._disk.values())
+        self._lock = threading.Lock()
+        with self._lock:
+            self._prune()
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self._directory, digest[:2], digest)
+
+    def _scan(self) -> OrderedDict[str, int]:
+        """Index the files left on disk by earlier runs, oldest first."""
+        files = []
+        for entry in os.scandir(self._directory):
+            if not entry.is_dir():
+                continue
+            for file in os.scandir(entry.path):
+                try:
+                    if file.name.startswith(_TMP_PREFIX):
+                        # Interrupted while being written
+                        os.remove(file.path)
+                    elif _DIGEST_RE.match(file.name):
+                        stat = file.stat()
+                        files.append((stat.st_mtime, file.name, stat.st_size))
+                except OSError:
+                    continue
+        files.sort()
+        return OrderedDict((digest, size) for _, digest, size in files)
+
+    def put(self, data: bytes, mime_type: str) -> str:
+        """Store the payload and return its digest.
+
+        Hashes and writes the payload, callers on the event loop run it in
+        a worker thread for large payloads.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            stored = digest in self._disk
+            if stored:
+                self._disk.move_to_end(digest)
+        if not stored:
+            path = self._path(digest)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # The MIME type is in place before the data file is published,
+            # and both are written under a temporary name first so a
+            # concurrent reader never sees a partially written file.
+            self._write(path + '.type', mime_type.encode('utf-8'))
+            self._write(path, data)
+            with self._lock:
+                if digest not in self._disk:
+                    self._disk[digest] = len(data)
+                    self._disk_bytes += len(data)
+                self._prune()
+        with self._lock:
+            self._remember(digest, data, mime_type)
+        return digest
+
+    def _write(self, path: str, data: bytes):
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(path), prefix=_TMP_PREFIX
+        )
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def _prune(self):
+        """Delete the least recently used files past the disk budget.
+
+        The most recent file is kept even when it alone exceeds the budget.
+        """
+        while self._disk_bytes > self._disk_budget and len(self._disk) > 1:
+            digest = next(iter(self._disk))
+            self._disk_bytes -= self._disk.pop(digest)
+            entry = self._memory.pop(digest, None)
+            if entry is not None:
+                self._memory_bytes -= len(entry[0])
+            # Readers that already opened the file keep streaming it
+            for path in (self._path(digest), self._path(digest) + '.type'):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def get(self, digest: str) -> CachedFile | None:
+        if not _DIGEST_RE.match(digest):
+            return None
+        with self._lock:
+            entry = self._memory.get(digest)
+            if entry is not None:
+                self._memory.move_to_end(digest)
+                if digest in self._disk:
+                    self._disk.move_to_end(digest)
+                data, mime_type = entry
+                return CachedFile(digest, mime_type, len(data), data=data)
+            if digest in self._disk:
+                self._disk.move_to_end(digest)
+        path = self._path(digest)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return None
+        try:
+            with open(path + '.type') as f:
+                mime_type = f.read()
+        except OSError:
+            mime_type = 'application/octet-stream'
+        if size <= self._max_memory_item:
+            with open(path, 'rb') as f:
+                data = f.read()
+            with self._lock:
+                self._remember(digest, data, mime_type)
+            return CachedFile(digest, mime_type, size, data=data)
+        return CachedFile(digest, mime_type, size, path=path)
+
+    def _remember(self, digest: str, data: bytes, mime_type: str):
+        if len(data) > self._max_memory_item:
+            return
+        if digest in self._memory:
+            self._memory.move_to_end(digest)
+            return
+        self._memory[digest] = (data, mime_type)
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self._memory_budget:
+            _, (evicted, _) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._memory_bytes
+
+    @property
+    def disk_bytes(self) -> int:
+        return self._disk_bytes
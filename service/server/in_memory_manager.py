@@ -14,10 +14,13 @@ from a2a.types import (
     TaskStatus,
     TextPart,
 )
-from utils.agent_card import get_agent_card
+from utils.agent_card import resolve_agent_card
 
 from service.server import test_image
 from service.server.application_manager import ApplicationManager
+from service.server.event_log import EventLog
+from service.server.event_stream import EventBroadcaster
+from service.server.state_store import StateStore
 from service.types import Conversation, Event
 
 
@@ -29,28 +32,25 @@ class InMemoryFakeAgentManager(ApplicationManager):
     uses to send messages to the agent and provide information for the frontend.
     """
 
-    _conversations: list[Conversation]
-    _messages: list[Message]
-    _tasks: list[Task]
-    _events: list[Event]
+    _store: StateStore
     _pending_message_ids: list[str]
     _next_message_idx: int
     _agents: list[AgentCard]
 
     def __init__(self):
-        self._conversations = []
-        self._messages = []
-        self._tasks = []
-        self._events = []
+        self._store = StateStore()
         self._pending_message_ids = []
         self._next_message_idx = 0
         self._agents = []
         self._task_map = {}
+        self._event_stream = EventBroadcaster()
+        self._event_log = EventLog()
 
     def create_conversation(self) -> Conversation:
         conversation_id = str(uuid.uuid4())
         c = Conversation(conversation_id=conversation_id, is_active=True)
-        self._conversations.append(c)
+        self._store.add_conversation(c)
+        self._event_stream.publish('conversation', c)
         return c
 
     def sanitize_message(self, message: Message) -> Message:
@@ -61,29 +61,25 @@ class InMemoryFakeAgentManager(ApplicationManager):
         # Check if the last event in the conversation was tied to a task.
         if conversation.messages:
             if conversation.messages[-1].task_id and task_still_open(
-                next(
-                    filter(
-                        lambda x: x.id == conversation.messages[-1].task_id,
-                        self._tasks,
-                    ),
-                    None,
-                )
+                self._store.get_task(conversation.messages[-1].task_id)
             ):
                 message.task_id = conversation.messages[-1].task_id
 
         return message
 
     async def process_message(self, message: Message):
-        self._messages.append(message)
         message_id = message.message_id
         context_id = message.context_id or ''
         task_id = message.task_id or ''
         if message_id:
             self._pending_message_ids.append(message_id)
+        await self.load_conversation(context_id)
         conversation = self.get_conversation(context_id)
         if conversation:
-            conversation.messages.append(message)
-        self._events.append(
+            self._store.append_conversation_message(conversation, message)
+            self._event_stream.publish('message', message)
+        self._event_stream.publish('pending', self.get_pending_messages())
+        self.add_event(
             Event(
                 id=str(uuid.uuid4()),
                 actor='host',
@@ -108,8 +104,9 @@ class InMemoryFakeAgentManager(ApplicationManager):
         await asyncio.sleep(self._next_message_idx)
         response = self.next_message()
         if conversation:
-            conversation.messages.append(response)
-        self._events.append(
+            self._store.append_conversation_message(conversation, response)
+            self._event_stream.publish('message', response)
+        self.add_event(
             Event(
                 id=str(uuid.uuid4()),
                 actor='host',
@@ -133,18 +130,18 @@ class InMemoryFakeAgentManager(ApplicationManager):
             else:
                 task.history.append(response)
             self.update_task(task)
+            self._event_stream.publish('task', task)
+        self._event_stream.publish('pending', self.get_pending_messages())
 
     def add_task(self, task: Task):
-        self._tasks.append(task)
+        self._store.add_task(task)
 
     def update_task(self, task: Task):
-        for i, t in enumerate(self._tasks):
-            if t.id == task.id:
-                self._tasks[i] = task
-                return
+        self._store.update_task(task)
 
     def add_event(self, event: Event):
-        self._events.append(event)
+        self._event_log.append(event)
+        self._event_stream.publish('event', event)
 
     def next_message(self) -> Message:
         message = _message_queue[self._next_message_idx]
@@ -156,24 +153,17 @@ class InMemoryFakeAgentManager(ApplicationManager):
     def get_conversation(
         self, conversation_id: str | None
     ) -> Conversation | None:
-        if not conversation_id:
-            return None
-        return next(
-            filter(
-                lambda c: c and c.conversation_id == conversation_id,
-                self._conversations,
-            ),
-            None,
-        )
+        return self._store.get_conversation(conversation_id)
+
+    async def load_conversation(self, conversation_id: str | None):
+        await self._store.load_conversation(conversation_id)
 
     def get_pending_messages(self) -> list[tuple[str, str]]:
         rval: list[tuple[str, str]] = []
         for message_id in self._pending_message_ids:
             if message_id in self._task_map:
                 task_id = self._task_map[message_id]
-                task = next(
-                    filter(lambda x: x.id == task_id, self._tasks), None
-                )
+                task = self._store.get_task(task_id)
                 if not task:
                     rval.append((message_id, ''))
                 elif task.history and task.history[-1].parts:
@@ -194,8 +184,8 @@ class InMemoryFakeAgentManager(ApplicationManager):
             return rval
         return [(x, '') for x in self._pending_message_ids]
 
-    def register_agent(self, url):
-        agent_data = get_agent_card(url)
+    async def register_agent(self, url):
+        agent_data = await resolve_agent_card(url)
         if not agent_data.url:
             agent_data.url = url
         self._agents.append(agent_data)
@@ -210,15 +200,65 @@ class InMemoryFakeAgentManager(ApplicationManager):
 
     @property
     def conversations(self) -> list[Conversation]:
-        return self._conversations
+        return self._store.conversations
 
     @property
     def tasks(self) -> list[Task]:
-        return self._tasks
+        return self._store.tasks
 
     @property
     def events(self) -> list[Event]:
-        return []
+        return self._event_log.page()[0]
+
+    def conversations_since(
+        self, since: str | None
+    ) -> tuple[list[Conversation], str]:
+        return self._store.conversations_since(since)
+
+    def messages_since(
+        self, conversation_id: str, since: str | None
+    ) -> tuple[list[Message], str]:
+        return self._store.messages_since(conversation_id, since)
+
+    def tasks_since(self, since: str | None) -> tuple[list[Task], str]:
+        return self._store.tasks_since(since)
+
+    def events_since(self, since: str | None) -> tuple[list[Event], str]:
+        return self._event_log.since(since)
+
+    def page_events(
+        self,
+        offset: int = 0,
+        limit: int | None = None,
+        since_timestamp: float | None = None,
+        context_id: str | None = None,
+        actor: str | None = None,
+        descending: bool = False,
+    ) -> tuple[list[Event], int, str]:
+        # Read the cursor first, events appended while paging are then
+        # returned again by the next `since` call instead of being skipped.
+        cursor = self._event_log.cursor
+        events, total = self._event_log.page(
+            offset, limit, since_timestamp, context_id, actor, descending
+        )
+        return events, total, cursor
+
+    def page_tasks(
+        self,
+        offset: int = 0,
+        limit: int | None = None,
+        context_id: str | None = None,
+        state: str | None = None,
+        descending: bool = False,
+    ) -> tuple[list[Task], int, str]:
+        tasks, total = self._store.page_tasks(
+            offset, limit, context_id, state, descending
+        )
+        return tasks, total, self._store.cursor
+
+    @property
+    def event_stream(self) -> EventBroadcaster:
+        return self._event_stream
 
 
 _contextId = str(uuid.uuid4())
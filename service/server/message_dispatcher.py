@@ -0,0 +1,126 @@
+"""Bounded asyncio dispatcher for incoming user messages.
+
+Messages are queued per conversation (context_id) and processed by a fixed
+number of worker tasks on the server event loop. Messages of the same
+conversation run strictly in arrival order while different conversations run
+concurrently, up to the worker limit. Once the total backlog reaches the
+queue size new messages are rejected so the HTTP layer can answer 429.
+"""
+
+import asyncio
+import logging
+import time
+
+from collections import deque
+from collections.abc import Awaitable, Callable
+
+from a2a.types import Message
+
+
+logger = logging.getLogger(__name__)
+
+
+class DispatcherFullError(Exception):
+    """Raised when the dispatcher backlog is full."""
+
+
+class MessageDispatcher:
+    def __init__(
+        self,
+        handler: Callable[[Message], Awaitable[None]],
+        max_concurrency: int = 4,
+        max_queue_size: int = 100,
+    ):
+        self._handler = handler
+        self._max_concurrency = max_concurrency
+        self._max_queue_size = max_queue_size
+        # context_id -> messages waiting, with the time they were queued
+        self._pending: dict[str, deque[tuple[Message, float]]] = {}
+        # Conversations with pending messages and no message in flight
+        self._ready: asyncio.Queue[str] | None = None
+        self._active: set[str] = set()
+        self._workers: list[asyncio.Task] = []
+        self._depth = 0
+        # Metrics
+        self._processed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def _start(self):
+        if self._workers:
+            return
+        self._ready = asyncio.Queue()
+        for i in range(self._max_concurrency):
+            self._workers.append(
+                asyncio.create_task(
+                    self._worker(), name=f'message-dispatcher-{i}'
+                )
+            )
+
+    def submit(self, message: Message):
+        """Queue a message for processing, must run on the server loop."""
+        if self._depth >= self._max_queue_size:
+            self._rejected += 1
+            raise DispatcherFullError(
+                f'{self._depth} messages already queued'
+            )
+        self._start()
+        context_id = message.context_id or ''
+        queue = self._pending.setdefault(context_id, deque())
+        queue.append((message, time.monotonic()))
+        self._depth += 1
+        # Conversations already queued or in flight are rescheduled by the
+        # worker once their current message is done.
+        if len(queue) == 1 and context_id not in self._active:
+            self._ready.put_nowait(context_id)
+
+    async def _worker(self):
+        while True:
+            context_id = await self._ready.get()
+            queue = self._pending[context_id]
+            message, queued_at = queue.popleft()
+            self._depth -= 1
+            self._active.add(context_id)
+            wait = time.monotonic() - queued_at
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+            try:
+                await self._handler(message)
+                self._processed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._failed += 1
+                logger.exception(
+                    f'Failed to process message {message.message_id}: {e}'
+                )
+            finally:
+                self._active.discard(context_id)
+                if queue:
+                    self._ready.put_nowait(context_id)
+                else:
+                    del self._pending[context_id]
+
+    def metrics(self) -> dict[str, float | int]:
+        dispatched = self._processed + self._failed + len(self._active)
+        return {
+            'queue_depth': self._depth,
+            'in_flight': len(self._active),
+            'max_concurrency': self._max_concurrency,
+            'max_queue_size': self._max_queue_size,
+            'processed': self._processed,
+            'failed': self._failed,
+            'rejected': self._rejected,
+            'avg_wait_seconds': self._total_wait / dispatched
+            if dispatched
+            else 0.0,
+            'max_wait_seconds': self._max_wait,
+        }
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
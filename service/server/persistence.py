@@ -0,0 +1,490 @@
+"""SQLite persistence for the ApplicationManager state.
+
+Writes are write-behind: callers hand over the live record and return
+immediately, a background thread coalesces repeated writes of the same
+record and commits them in batches, one transaction per flush. The
+database runs in WAL mode so reads (startup and lazy message and task
+loading) never wait for a running commit.
+
+Configuration through environment variables:
+  A2A_UI_STATE_DB                  database path, 'off' disables persistence
+                                   (default <tmp>/a2a-ui/state.db)
+  A2A_UI_STATE_CACHE_CONVERSATIONS conversations whose messages are kept
+                                   in memory (default 100)
+  A2A_UI_STATE_CACHE_TASKS         tasks whose bodies are kept in memory
+                                   (default 1000)
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from collections.abc import Callable
+from typing import Any
+
+from a2a.types import Message, Task
+
+from service.types import AgentInfo, Conversation, Event
+
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversations (
+    conversation_id TEXT PRIMARY KEY,
+    updated_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    message_id TEXT PRIMARY KEY,
+    context_id TEXT,
+    task_id TEXT,
+    seq INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_context ON messages (context_id, seq);
+CREATE INDEX IF NOT EXISTS messages_task ON messages (task_id);
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    context_id TEXT,
+    state TEXT,
+    updated_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_context ON tasks (context_id);
+CREATE INDEX IF NOT EXISTS tasks_updated ON tasks (updated_at);
+CREATE TABLE IF NOT EXISTS message_tasks (
+    message_id TEXT PRIMARY KEY,
+    task_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS message_tasks_task ON message_tasks (task_id);
+CREATE TABLE IF NOT EXISTS events (
+    id TEXT PRIMARY KEY,
+    context_id TEXT,
+    task_id TEXT,
+    actor TEXT,
+    timestamp REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_context ON events (context_id, timestamp);
+CREATE INDEX IF NOT EXISTS events_task ON events (task_id);
+CREATE INDEX IF NOT EXISTS events_timestamp ON events (timestamp);
+CREATE TABLE IF NOT EXISTS agents (
+    url TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+"""
+
+
+def _conversation_row(conversation: Conversation) -> tuple:
+    # Messages are stored in their own table and loaded on demand
+    return (
+        conversation.conversation_id,
+        time.time(),
+        conversation.model_dump_json(exclude={'messages'}),
+    )
+
+
+def _message_row(record: tuple[Message, int]) -> tuple:
+    message, seq = record
+    return (
+        message.message_id,
+        message.context_id,
+        message.task_id,
+        seq,
+        message.model_dump_json(exclude_none=True),
+    )
+
+
+def _task_row(task: Task) -> tuple:
+    return (
+        task.id,
+        task.context_id,
+        task.status.state.value,
+        time.time(),
+        task.model_dump_json(exclude_none=True),
+    )
+
+
+def _event_row(event: Event) -> tuple:
+    return (
+        event.id,
+        event.content.context_id,
+        event.content.task_id,
+        event.actor,
+        event.timestamp,
+        event.model_dump_json(exclude_none=True),
+    )
+
+
+def _agent_row(record: tuple[str, AgentInfo]) -> tuple:
+    url, agent_info = record
+    return (url, agent_info.model_dump_json(exclude_none=True))
+
+
+# kind -> (table, key column, columns, row builder)
+_KINDS: dict[str, tuple[str, str, tuple[str, ...], Callable[[Any], tuple]]] = {
+    'conversation': (
+        'conversations',
+        'conversation_id',
+        ('conversation_id', 'updated_at', 'data'),
+        _conversation_row,
+    ),
+    'message': (
+        'messages',
+        'message_id',
+        ('message_id', 'context_id', 'task_id', 'seq', 'data'),
+        _message_row,
+    ),
+    'task': (
+        'tasks',
+        'id',
+        ('id', 'context_id', 'state', 'updated_at', 'data'),
+        _task_row,
+    ),
+    'message_task': (
+        'message_tasks',
+        'message_id',
+        ('message_id', 'task_id'),
+        tuple,
+    ),
+    'event': (
+        'events',
+        'id',
+        ('id', 'context_id', 'task_id', 'actor', 'timestamp', 'data'),
+        _event_row,
+    ),
+    'agent': ('agents', 'url', ('url', 'data'), _agent_row),
+}
+
+_DELETED = object()
+_CLEARED = object()
+
+
+def configured_state_db() -> str | None:
+    path = os.environ.get('A2A_UI_STATE_DB', '')
+    if path.lower() == 'off':
+        return None
+    return path or os.path.join(tempfile.gettempdir(), 'a2a-ui', 'state.db')
+
+
+def configured_cache_conversations() -> int:
+    return int(os.environ.get('A2A_UI_STATE_CACHE_CONVERSATIONS', '100'))
+
+
+def configured_cache_tasks() -> int:
+    return int(os.environ.get('A2A_UI_STATE_CACHE_TASKS', '1000'))
+
+
+class StatePersistence:
+    """Write-behind SQLite store for conversations, tasks, events and agents.
+
+    put() keeps a reference to the record, it is serialized by the writer
+    thread when the batch is flushed, so a task updated many times between
+    two flushes is written once.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        flush_interval: float = 0.05,
+        max_batch: int = 500,
+        max_events: int | None = None,
+    ):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._path = path
+        self._flush_interval = flush_interval
+        self._max_batch = max_batch
+        # Older events are pruned from disk, same cap as the in memory log
+        self._max_events = max_events
+        self._write_conn = self._connect()
+        self._write_conn.executescript(_SCHEMA)
+        self._migrate()
+        self._read_conn = self._connect()
+        self._read_lock = threading.Lock()
+        # (kind, key) -> record or _DELETED, in insertion order
+        self._pending: dict[tuple[str, str], Any] = {}
+        self._condition = threading.Condition()
+        self._writing = False
+        # Batch being committed by the writer thread
+        self._batch: dict[tuple[str, str], Any] = {}
+        self._closed = False
+        row = self._read_conn.execute(
+            'SELECT COALESCE(MAX(seq), 0) FROM messages'
+        ).fetchone()
+        self._message_seq = row[0]
+        self._thread = threading.Thread(
+            target=self._run, name='state-writer', daemon=True
+        )
+        self._thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self._path, check_same_thread=False, isolation_level=None
+        )
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def _migrate(self):
+        columns = {
+            row[1]
+            for row in self._write_conn.execute('PRAGMA table_info(tasks)')
+        }
+        if 'state' not in columns:
+            # Databases of older versions, the state is read from the JSON
+            self._write_conn.execute('ALTER TABLE tasks ADD COLUMN state TEXT')
+            self._write_conn.execute(
+                "UPDATE tasks SET state = json_extract(data, '$.status.state')"
+            )
+
+    # Writes
+
+    def put(self, kind: str, key: str, record: Any):
+        with self._condition:
+            if self._closed:
+                return
+            self._pending.pop((kind, key), None)
+            self._pending[(kind, key)] = record
+            if len(self._pending) >= self._max_batch:
+                self._condition.notify()
+
+    def put_message(self, message: Message):
+        with self._condition:
+            self._message_seq += 1
+            seq = self._message_seq
+        self.put('message', message.message_id, (message, seq))
+
+    def delete(self, kind: str, key: str):
+        self.put(kind, key, _DELETED)
+
+    def clear(self, kind: str):
+        """Delete every record of a kind."""
+        with self._condition:
+            self._pending = {
+                k: v for k, v in self._pending.items() if k[0] != kind
+            }
+            self._pending[(kind, '')] = _CLEARED
+
+    def flush(self, timeout: float | None = 5.0) -> bool:
+        """Block until every pending write is committed."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            self._condition.notify()
+            while (self._pending or self._writing) and self._thread.is_alive():
+                remaining = (
+                    None if deadline is None else deadline - time.monotonic()
+                )
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def close(self):
+        self.flush(timeout=None)
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        self._write_conn.close()
+        self._read_conn.close()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self._pending and not self._closed:
+                    self._condition.wait(self._flush_interval)
+                if self._closed and not self._pending:
+                    return
+                batch = self._pending
+                self._pending = {}
+                self._batch = batch
+                self._writing = bool(batch)
+            if batch:
+                try:
+                    self._write(batch)
+                except Exception as e:
+                    logger.exception(f'Failed to persist state: {e}')
+                with self._condition:
+                    self._batch = {}
+                    self._writing = False
+                    self._condition.notify_all()
+            # Let updates of the same records accumulate between flushes
+            time.sleep(self._flush_interval)
+
+    def _write(self, batch: dict[tuple[str, str], Any]):
+        clears: list[str] = []
+        upserts: dict[str, list[tuple]] = {}
+        deletes: dict[str, list[tuple]] = {}
+        retry: dict[tuple[str, str], Any] = {}
+        for (kind, key), record in batch.items():
+            if record is _CLEARED:
+                clears.append(kind)
+                continue
+            if record is _DELETED:
+                deletes.setdefault(kind, []).append((key,))
+                continue
+            try:
+                upserts.setdefault(kind, []).append(_KINDS[kind][3](record))
+            except RuntimeError:
+                # The record changed while being serialized, try again
+                # with the next batch.
+                retry[(kind, key)] = record
+        conn = self._write_conn
+        conn.execute('BEGIN')
+        try:
+            # put() drops the pending records of a cleared kind, whatever
+            # is left in the batch is newer than the clear.
+            for kind in clears:
+                conn.execute(f'DELETE FROM {_KINDS[kind][0]}')
+            for kind, rows in upserts.items():
+                table, key_column, columns, _ = _KINDS[kind]
+                # An upsert keeps the rowid, so rows keep their creation order
+                updates = ', '.join(
+                    f'{x} = excluded.{x}' for x in columns if x != key_column
+                )
+                conn.executemany(
+                    f'INSERT INTO {table} ({", ".join(columns)}) '
+                    f'VALUES ({", ".join("?" * len(columns))}) '
+                    f'ON CONFLICT ({key_column}) DO UPDATE SET {updates}',
+                    rows,
+                )
+            for kind, keys in deletes.items():
+                table, key_column, _, _ = _KINDS[kind]
+                conn.executemany(
+                    f'DELETE FROM {table} WHERE {key_column} = ?', keys
+                )
+            if self._max_events and 'event' in upserts:
+                conn.execute(
+                    'DELETE FROM events WHERE rowid <= '
+                    '(SELECT MAX(rowid) FROM events) - ?',
+                    (self._max_events,),
+                )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        if retry:
+            with self._condition:
+                for key, record in retry.items():
+                    self._pending.setdefault(key, record)
+
+    # Reads
+
+    def _query(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self._read_lock:
+            return self._read_conn.execute(sql, params).fetchall()
+
+    def load_conversations(self) -> list[Conversation]:
+        """Every conversation, without its messages, oldest first."""
+        return [
+            Conversation(**json.loads(data))
+            for (data,) in self._query(
+                'SELECT data FROM conversations ORDER BY rowid'
+            )
+        ]
+
+    def load_recent_conversation_ids(self, limit: int) -> list[str]:
+        rows = self._query(
+            'SELECT conversation_id FROM conversations '
+            'ORDER BY updated_at DESC, rowid DESC LIMIT ?',
+            (limit,),
+        )
+        return [x for (x,) in reversed(rows)]
+
+    def load_messages(self, context_id: str) -> list[Message]:
+        """Messages of a conversation in seq order, queued writes included.
+
+        Never waits for the writer thread, the records still in the write
+        queue are merged over the committed rows.
+        """
+        # Snapshot the queue before reading the database, a record committed
+        # in between is then found in both and the queued copy wins.
+        queued: dict[str, Any] = {}
+        cleared = False
+        with self._condition:
+            for batch in (self._batch, self._pending):
+                for (kind, key), record in batch.items():
+                    if kind != 'message':
+                        continue
+                    if record is _CLEARED:
+                        cleared = True
+                        queued.clear()
+                    else:
+                        queued[key] = record
+        records: dict[str, tuple[Message, int]] = {}
+        if not cleared:
+            for message_id, seq, data in self._query(
+                'SELECT message_id, seq, data FROM messages '
+                'WHERE context_id = ?',
+                (context_id,),
+            ):
+                records[message_id] = (Message(**json.loads(data)), seq)
+        for message_id, record in queued.items():
+            if record is _DELETED or record[0].context_id != context_id:
+                records.pop(message_id, None)
+            else:
+                records[message_id] = record
+        return [
+            message
+            for message, _ in sorted(records.values(), key=lambda x: x[1])
+        ]
+
+    def load_task_states(self) -> list[tuple[str, str | None, str | None]]:
+        """(id, context_id, state) of every task, in creation order."""
+        return self._query(
+            'SELECT id, context_id, state FROM tasks ORDER BY rowid'
+        )
+
+    def load_tasks(self, task_ids: list[str]) -> dict[str, Task]:
+        """Tasks by id, the ones still queued for writing included."""
+        tasks: dict[str, Task] = {}
+        with self._condition:
+            for task_id in task_ids:
+                for batch in (self._pending, self._batch):
+                    record = batch.get(('task', task_id))
+                    if record is not None and record is not _DELETED:
+                        tasks[task_id] = record
+                        break
+        missing = [x for x in task_ids if x not in tasks]
+        # Stay below the SQLite limit on bound parameters
+        for start in range(0, len(missing), 500):
+            chunk = missing[start : start + 500]
+            for task_id, data in self._query(
+                f'SELECT id, data FROM tasks WHERE id IN '
+                f'({", ".join("?" * len(chunk))})',
+                tuple(chunk),
+            ):
+                tasks[task_id] = Task(**json.loads(data))
+        return tasks
+
+    def load_message_task(self, message_id: str) -> str | None:
+        """Task id of a message, queued writes and clears included."""
+        with self._condition:
+            for batch in (self._pending, self._batch):
+                record = batch.get(('message_task', message_id))
+                if record is not None:
+                    return None if record is _DELETED else record[1]
+                if batch.get(('message_task', '')) is _CLEARED:
+                    return None
+        rows = self._query(
+            'SELECT task_id FROM message_tasks WHERE message_id = ?',
+            (message_id,),
+        )
+        return rows[0][0] if rows else None
+
+    def load_events(self, limit: int) -> list[Event]:
+        rows = self._query(
+            'SELECT data FROM events ORDER BY timestamp DESC LIMIT ?', (limit,)
+        )
+        return [Event(**json.loads(data)) for (data,) in reversed(rows)]
+
+    def load_agents(self) -> dict[str, AgentInfo]:
+        return {
+            url: AgentInfo(**json.loads(data))
+            for url, data in self._query('SELECT url, data FROM agents')
+        }
@@ -1,34 +1,51 @@
 import asyncio
 import base64
+import json
 import os
-import threading
-import uuid
 
-from typing import cast
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
 
 import httpx
 
-from a2a.types import FilePart, FileWithUri, Message, Part
+from a2a.types import FilePart, FileWithBytes, FileWithUri, Message, Part
 from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from service.types import (
+    Conversation,
+    ConversationSummary,
     CreateConversationResponse,
     GetEventResponse,
+    JSONRPCError,
+    JSONRPCResponse,
     ListAgentResponse,
     ListConversationResponse,
+    ListMessageParams,
     ListMessageResponse,
     ListTaskResponse,
     MessageInfo,
     PendingMessageResponse,
     RegisterAgentResponse,
     SendMessageResponse,
+    GetEventParams,
+    ListTaskParams,
+    SyncParams,
 )
 
 from .adk_host_manager import ADKHostManager, get_message_id
 from .application_manager import ApplicationManager
+from .file_cache import CachedFile, FileCache
 from .in_memory_manager import InMemoryFakeAgentManager
+from .event_log import configured_event_log_size
+from .message_dispatcher import DispatcherFullError, MessageDispatcher
+from .persistence import StatePersistence, configured_state_db
 # from .mcp_agent_manager import MCPAgentManager
 
+# File payloads larger than this are cached in a worker thread
+OFFLOAD_FILE_SIZE = 256 * 1024
+
 
 class ConversationServer:
     """ConversationServer is the backend to serve the agent interactions in the UI
@@ -47,11 +64,18 @@ class ConversationServer:
             os.environ.get('GOOGLE_GENAI_USE_VERTEXAI', '').upper() == 'TRUE'
         )
 
+        self._persistence: StatePersistence | None = None
         if agent_manager.upper() == 'ADK':
+            state_db = configured_state_db()
+            if state_db:
+                self._persistence = StatePersistence(
+                    state_db, max_events=configured_event_log_size()
+                )
             self.manager = ADKHostManager(
                 http_client,
                 api_key=api_key,
                 uses_vertex_ai=uses_vertex_ai,
+                persistence=self._persistence,
             )
         # elif agent_manager.upper() == 'MCP':
         #     self.manager = MCPAgentManager(
@@ -61,8 +85,25 @@ class ConversationServer:
         #     )
         else:
             self.manager = InMemoryFakeAgentManager()
-        self._file_cache = {}  # dict[str, FilePart] maps file id to message data
-        self._message_to_cache = {}  # dict[str, str] maps message id to cache id
+        self._dispatcher = MessageDispatcher(
+            self.manager.process_message,
+            max_concurrency=int(os.environ.get('A2A_UI_MESSAGE_WORKERS', '4')),
+            max_queue_size=int(
+                os.environ.get('A2A_UI_MESSAGE_QUEUE_SIZE', '100')
+            ),
+        )
+        self._file_cache = FileCache(
+            directory=os.environ.get('A2A_UI_FILE_CACHE_DIR') or None,
+            memory_budget=int(
+                os.environ.get('A2A_UI_FILE_CACHE_MEMORY', str(64 * 1024 * 1024))
+            ),
+            disk_budget=int(
+                os.environ.get('A2A_UI_FILE_CACHE_DISK', str(1024 * 1024 * 1024))
+            ),
+        )
+        # maps message part id to the digest of its cached file, oldest first
+        self._message_to_cache: OrderedDict[str, str] = OrderedDict()
+        self._message_to_cache_size = 10_000
 
         app.add_api_route(
             '/conversation/create', self._create_conversation, methods=['POST']
@@ -71,7 +112,13 @@ class ConversationServer:
             '/conversation/list', self._list_conversation, methods=['POST']
         )
         app.add_api_route('/message/send', self._send_message, methods=['POST'])
+        app.add_api_route(
+            '/message/queue', self._message_queue_metrics, methods=['POST']
+        )
         app.add_api_route('/events/get', self._get_events, methods=['POST'])
+        app.add_api_route(
+            '/events/stream', self._stream_events, methods=['GET']
+        )
         app.add_api_route(
             '/message/list', self._list_messages, methods=['POST']
         )
@@ -98,6 +145,18 @@ class ConversationServer:
         app.add_api_route(
             '/api_key/update', self._update_api_key, methods=['POST']
         )
+        app.add_api_route('/rpc/batch', self._batch, methods=['POST'])
+
+        # Read-only methods that can be combined in a /rpc/batch call. They
+        # only read in-memory manager state and never await.
+        self._batch_methods: dict[str, Callable[[Any], JSONRPCResponse]] = {
+            'conversation/list': self._rpc_list_conversation,
+            'task/list': self._rpc_list_tasks,
+            'message/list': self._rpc_list_messages,
+            'message/pending': self._rpc_pending_messages,
+            'events/get': self._rpc_get_events,
+            'agent/list': self._rpc_list_agents,
+        }
 
     # Update API key in manager
     def update_api_key(self, api_key: str):
@@ -111,21 +170,18 @@ class ConversationServer:
     async def _send_message(self, request: Request):
         message_data = await request.json()
         message = Message(**message_data['params'])
+        await self.manager.load_conversation(message.context_id)
         message = self.manager.sanitize_message(message)
-        loop = asyncio.get_event_loop()
-        if isinstance(self.manager, ADKHostManager):
-            t = threading.Thread(
-                target=lambda: cast(
-                    ADKHostManager, self.manager
-                ).process_message_threadsafe(message, loop)
-            )
-        else:
-            t = threading.Thread(
-                target=lambda: asyncio.run(
-                    self.manager.process_message(message)
-                )
+        try:
+            self._dispatcher.submit(message)
+        except DispatcherFullError as e:
+            return JSONResponse(
+                rpc_error(
+                    message_data.get('id'), -32000, f'Server busy: {e}'
+                ).model_dump(mode='json', exclude_none=True),
+                status_code=429,
+                headers={'Retry-After': '1'},
             )
-        t.start()
         return SendMessageResponse(
             result=MessageInfo(
                 message_id=message.message_id,
@@ -133,15 +189,83 @@ class ConversationServer:
             )
         )
 
+    async def _message_queue_metrics(self):
+        """Queue depth, wait times and counters of the message dispatcher"""
+        return {'result': self._dispatcher.metrics()}
+
+    async def stop(self):
+        await self._dispatcher.stop()
+        if self._persistence:
+            # Commits whatever is still queued, off the event loop
+            await asyncio.to_thread(self._persistence.close)
+
     async def _list_messages(self, request: Request):
-        message_data = await request.json()
-        conversation_id = message_data['params']
-        conversation = self.manager.get_conversation(conversation_id)
-        if conversation:
-            return ListMessageResponse(
-                result=self.cache_content(conversation.messages)
-            )
-        return ListMessageResponse(result=[])
+        params = await request_params(request)
+        await self._load_listed_conversation(params)
+        return self._rpc_list_messages(params)
+
+    async def _load_listed_conversation(self, params: Any):
+        """Load the history read by a message/list call, and cache its
+        files, off the event loop"""
+        try:
+            params = self._list_messages_params(params)
+        except Exception:
+            # The handler answers the validation error
+            return
+        await self.manager.load_conversation(params.conversation_id)
+        messages, _ = self.manager.messages_since(
+            params.conversation_id, params.since
+        )
+        await self.cache_files(messages)
+
+    def _list_messages_params(self, params: Any) -> ListMessageParams:
+        if isinstance(params, str):
+            return ListMessageParams(conversation_id=params)
+        return ListMessageParams(**params)
+
+    def _rpc_list_messages(self, params: Any) -> ListMessageResponse:
+        params = self._list_messages_params(params)
+        messages, cursor = self.manager.messages_since(
+            params.conversation_id, params.since
+        )
+        return ListMessageResponse(
+            result=self.cache_content(messages), cursor=cursor
+        )
+
+    async def cache_files(self, messages: list[Message]):
+        """Cache the file parts of the messages ahead of cache_content.
+
+        Decoding, hashing and writing a large payload runs in a worker
+        thread instead of blocking the event loop.
+        """
+        for m in messages:
+            message_id = get_message_id(m)
+            if not message_id:
+                continue
+            for i, p in enumerate(m.parts):
+                part = p.root
+                message_part_id = f'{message_id}:{i}'
+                if (
+                    part.kind != 'file'
+                    or not isinstance(part.file, FileWithBytes)
+                    or message_part_id in self._message_to_cache
+                ):
+                    continue
+                if len(part.file.bytes) > OFFLOAD_FILE_SIZE:
+                    cache_id = await asyncio.to_thread(self._cache_file, part)
+                else:
+                    cache_id = self._cache_file(part)
+                self._remember_file(message_part_id, cache_id)
+
+    def _cache_file(self, part: FilePart) -> str:
+        return self._file_cache.put(
+            file_payload(part), part.file.mimeType or ''
+        )
+
+    def _remember_file(self, message_part_id: str, cache_id: str):
+        self._message_to_cache[message_part_id] = cache_id
+        if len(self._message_to_cache) > self._message_to_cache_size:
+            self._message_to_cache.popitem(last=False)
 
     def cache_content(self, messages: list[Message]):
         rval = []
@@ -153,15 +277,17 @@ class ConversationServer:
             new_parts: list[Part] = []
             for i, p in enumerate(m.parts):
                 part = p.root
-                if part.kind != 'file':
+                if part.kind != 'file' or not isinstance(
+                    part.file, FileWithBytes
+                ):
                     new_parts.append(p)
                     continue
                 message_part_id = f'{message_id}:{i}'
-                if message_part_id in self._message_to_cache:
-                    cache_id = self._message_to_cache[message_part_id]
-                else:
-                    cache_id = str(uuid.uuid4())
-                    self._message_to_cache[message_part_id] = cache_id
+                cache_id = self._message_to_cache.get(message_part_id)
+                if cache_id is None:
+                    # Not passed through cache_files, e.g. added since
+                    cache_id = self._cache_file(part)
+                    self._remember_file(message_part_id, cache_id)
                 # Replace the part data with a url reference
                 new_parts.append(
                     Part(
@@ -173,30 +299,169 @@ class ConversationServer:
                         )
                     )
                 )
-                if cache_id not in self._file_cache:
-                    self._file_cache[cache_id] = part
             m.parts = new_parts
             rval.append(m)
         return rval
 
     async def _pending_messages(self):
+        return self._rpc_pending_messages(None)
+
+    def _rpc_pending_messages(self, params: Any) -> PendingMessageResponse:
         return PendingMessageResponse(
             result=self.manager.get_pending_messages()
         )
 
-    def _list_conversation(self):
-        return ListConversationResponse(result=self.manager.conversations)
+    async def _list_conversation(self, request: Request):
+        return self._rpc_list_conversation(await request_params(request))
+
+    def _rpc_list_conversation(self, params: Any) -> ListConversationResponse:
+        since = parse_sync_params(params).since
+        conversations, cursor = self.manager.conversations_since(since)
+        return ListConversationResponse(
+            result=[conversation_summary(x) for x in conversations],
+            cursor=cursor,
+        )
+
+    async def _get_events(self, request: Request):
+        return self._rpc_get_events(await request_params(request))
 
-    def _get_events(self):
-        return GetEventResponse(result=self.manager.events)
+    def _rpc_get_events(self, params: Any) -> GetEventResponse:
+        params = GetEventParams(**params) if params else GetEventParams()
+        if params.since:
+            events, cursor = self.manager.events_since(params.since)
+            return GetEventResponse(result=events, cursor=cursor)
+        events, total, cursor = self.manager.page_events(
+            offset=params.offset,
+            limit=params.limit,
+            since_timestamp=params.since_timestamp,
+            context_id=params.context_id,
+            actor=params.actor,
+            descending=params.descending,
+        )
+        return GetEventResponse(result=events, cursor=cursor, total=total)
+
+    async def _stream_events(self, request: Request):
+        """Server-Sent Events channel pushing state deltas to the UI.
+
+        Each SSE message carries one of the kinds published by the manager:
+        'conversation', 'message', 'task', 'pending', 'delta', 'event' or
+        'sync'. A 'sync' is sent on connect and whenever the subscriber fell
+        behind, asking the client to reload the full state once. 'delta'
+        carries the streamed text of a pending message. The optional `kinds`
+        query parameter restricts the stream to a comma separated list of
+        kinds.
+        """
+        kinds = request.query_params.get('kinds')
+        wanted = set(kinds.split(',')) if kinds else None
+        subscription = self.manager.event_stream.subscribe()
+
+        async def event_source():
+            with subscription:
+                yield self._format_sse(0, 'sync', None)
+                while not await request.is_disconnected():
+                    try:
+                        seq, kind, data = await asyncio.wait_for(
+                            subscription.get(), timeout=15
+                        )
+                    except asyncio.TimeoutError:
+                        yield ': keep-alive\n\n'
+                        continue
+                    if wanted is None or kind == 'sync' or kind in wanted:
+                        if kind == 'message':
+                            await self.cache_files([data])
+                        yield self._format_sse(seq, kind, data)
+
+        return StreamingResponse(
+            event_source(),
+            media_type='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+        )
+
+    def _format_sse(self, seq: int, kind: str, data) -> str:
+        if kind == 'message':
+            data = self.cache_content([data])[0].model_dump(
+                mode='json', exclude_none=True
+            )
+        elif kind == 'conversation':
+            data = stream_conversation(data)
+        elif kind in ('task', 'event'):
+            data = data.model_dump(mode='json', exclude_none=True)
+        return f'id: {seq}\nevent: {kind}\ndata: {json.dumps(data)}\n\n'
+
+    async def _list_tasks(self, request: Request):
+        return self._rpc_list_tasks(await request_params(request))
+
+    def _rpc_list_tasks(self, params: Any) -> ListTaskResponse:
+        params = ListTaskParams(**params) if params else ListTaskParams()
+        if params.since or (
+            params.limit is None
+            and not params.offset
+            and not params.context_id
+            and not params.state
+            and not params.descending
+        ):
+            tasks, cursor = self.manager.tasks_since(params.since)
+            return ListTaskResponse(result=tasks, cursor=cursor)
+        tasks, total, cursor = self.manager.page_tasks(
+            offset=params.offset,
+            limit=params.limit,
+            context_id=params.context_id,
+            state=params.state,
+            descending=params.descending,
+        )
+        return ListTaskResponse(result=tasks, cursor=cursor, total=total)
+
+    async def _batch(self, request: Request):
+        """JSON-RPC 2.0 batch of read-only methods answered in one round-trip.
 
-    def _list_tasks(self):
-        return ListTaskResponse(result=self.manager.tasks)
+        All calls are dispatched back to back without yielding to the event
+        loop, so every response in the batch reflects the same snapshot of
+        the manager state.
+        """
+        try:
+            calls = await request.json()
+        except json.JSONDecodeError:
+            return JSONResponse(
+                rpc_error(None, -32700, 'Parse error').model_dump(
+                    mode='json', exclude_none=True
+                )
+            )
+        if not isinstance(calls, list) or not calls:
+            return JSONResponse(
+                rpc_error(None, -32600, 'Invalid Request').model_dump(
+                    mode='json', exclude_none=True
+                )
+            )
+        # Histories evicted from memory are loaded before the dispatch, which
+        # must not yield between calls
+        for call in calls:
+            if isinstance(call, dict) and call.get('method') == 'message/list':
+                await self._load_listed_conversation(call.get('params'))
+        responses = [self._dispatch_batch_call(call) for call in calls]
+        return JSONResponse(
+            [r.model_dump(mode='json', exclude_none=True) for r in responses]
+        )
+
+    def _dispatch_batch_call(self, call: Any) -> JSONRPCResponse:
+        if not isinstance(call, dict) or 'method' not in call:
+            return rpc_error(None, -32600, 'Invalid Request')
+        request_id = call.get('id')
+        handler = self._batch_methods.get(call['method'])
+        if not handler:
+            return rpc_error(
+                request_id, -32601, f'Method not found: {call["method"]}'
+            )
+        try:
+            response = handler(call.get('params'))
+        except Exception as e:
+            return rpc_error(request_id, -32603, str(e))
+        response.id = request_id
+        return response
 
     async def _register_agent(self, request: Request):
         message_data = await request.json()
         url = message_data['params']
-        self.manager.register_agent(url)
+        await self.manager.register_agent(url)
         return RegisterAgentResponse()
 
     async def _remove_agent(self, request: Request):
@@ -206,6 +471,9 @@ class ConversationServer:
         return RegisterAgentResponse()  # Usando a mesma resposta
 
     async def _list_agents(self):
+        return self._rpc_list_agents(None)
+
+    def _rpc_list_agents(self, params: Any) -> ListAgentResponse:
         return ListAgentResponse(result=self.manager.agents)
 
     async def _toggle_agent(self, request: Request):
@@ -235,7 +503,8 @@ class ConversationServer:
         """Force refresh of agent discovery"""
         try:
             if hasattr(self.manager, '_refresh_agents'):
-                count = await self.manager._refresh_agents()
+                # A manual refresh also probes ports that are backing off
+                count = await self.manager._refresh_agents(force=True)
                 return {
                     'result': {
                         'discovered_count': count,
@@ -257,16 +526,11 @@ class ConversationServer:
                 }
             }
 
-    def _files(self, file_id):
-        if file_id not in self._file_cache:
-            raise Exception('file not found')
-        part = self._file_cache[file_id]
-        if 'image' in part.file.mimeType:
-            return Response(
-                content=base64.b64decode(part.file.bytes),
-                media_type=part.file.mimeType,
-            )
-        return Response(content=part.file.bytes, media_type=part.file.mimeType)
+    def _files(self, file_id: str, request: Request):
+        cached = self._file_cache.get(file_id)
+        if not cached:
+            return Response(status_code=404)
+        return file_response(cached, request)
 
     async def _update_api_key(self, request: Request):
         """Update the API key"""
@@ -281,3 +545,97 @@ class ConversationServer:
             return {'status': 'error', 'message': 'No API key provided'}
         except Exception as e:
             return {'status': 'error', 'message': str(e)}
+
+
+async def request_params(request: Request) -> Any:
+    # The list endpoints historically accepted requests without a body.
+    body = await request.body()
+    if not body:
+        return None
+    return json.loads(body).get('params')
+
+
+def parse_sync_params(params: Any) -> SyncParams:
+    return SyncParams(**params) if params else SyncParams()
+
+
+def rpc_error(request_id: Any, code: int, message: str) -> JSONRPCResponse:
+    return JSONRPCResponse(
+        id=request_id, error=JSONRPCError(code=code, message=message)
+    )
+
+
+def file_payload(part: FilePart) -> bytes:
+    # Images are served decoded, other files as their base64 text.
+    if 'image' in (part.file.mimeType or ''):
+        return base64.b64decode(part.file.bytes)
+    return part.file.bytes.encode('utf-8')
+
+
+def file_response(cached: CachedFile, request: Request) -> Response:
+    """Stream a cached file with ETag, Cache-Control and Range support."""
+    etag = f'"{cached.digest}"'
+    headers = {
+        'ETag': etag,
+        # The id is the content digest, the payload can never change.
+        'Cache-Control': 'public, max-age=31536000, immutable',
+        'Accept-Ranges': 'bytes',
+    }
+    if etag in request.headers.get('if-none-match', ''):
+        return Response(status_code=304, headers=headers)
+
+    byte_range = parse_range(request.headers.get('range'), cached.size)
+    if byte_range == 'invalid':
+        headers['Content-Range'] = f'bytes */{cached.size}'
+        return Response(status_code=416, headers=headers)
+    if byte_range:
+        start, end = byte_range
+        headers['Content-Range'] = f'bytes {start}-{end}/{cached.size}'
+        headers['Content-Length'] = str(end - start + 1)
+        return StreamingResponse(
+            cached.iter_range(start, end),
+            status_code=206,
+            media_type=cached.mime_type,
+            headers=headers,
+        )
+    headers['Content-Length'] = str(cached.size)
+    return StreamingResponse(
+        cached.iter_range(), media_type=cached.mime_type, headers=headers
+    )
+
+
+def parse_range(header: str | None, size: int) -> tuple[int, int] | str | None:
+    """Parse a single 'bytes=start-end' range, None means the whole file."""
+    if not header or not header.startswith('bytes='):
+        return None
+    spec = header[len('bytes=') :].split(',')[0].strip()
+    start_text, _, end_text = spec.partition('-')
+    try:
+        if start_text:
+            start = int(start_text)
+            end = int(end_text) if end_text else size - 1
+        else:
+            # Suffix range, the last N bytes
+            start = max(size - int(end_text), 0)
+            end = size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        return 'invalid'
+    return start, min(end, size - 1)
+
+
+def conversation_summary(conversation: Conversation) -> ConversationSummary:
+    # Messages are listed and streamed on their own, only ship the ids here,
+    # so a delta stays the size of the change, not of the history.
+    return ConversationSummary(
+        conversation_id=conversation.conversation_id,
+        is_active=conversation.is_active,
+        name=conversation.name,
+        task_ids=conversation.task_ids,
+        message_ids=[m.message_id for m in conversation.messages],
+    )
+
+
+def stream_conversation(conversation: Conversation) -> dict:
+    return conversation_summary(conversation).model_dump(mode='json')
@@ -0,0 +1,414 @@
+import asyncio
+
+from collections import OrderedDict
+from collections.abc import Callable
+
+from a2a.types import Message, Task
+
+from service.server.persistence import StatePersistence
+from service.server.sync_cursor import format_cursor, new_epoch, parse_cursor
+from service.types import Conversation
+
+
+class StateStore:
+    """Indexed in-memory storage for conversations, tasks and messages.
+
+    The ApplicationManager implementations receive a stream of task updates
+    from remote agents and every update needs to resolve the task, its
+    conversation and the message that started it. Keeping those lookups in
+    id keyed dicts (plus a couple of secondary indexes) keeps the callback
+    hot path O(1) regardless of how many tasks the process has seen.
+
+    Every change also bumps a store wide version. Each record kind keeps a
+    change log ordered by version, so the records changed after a given
+    cursor are read back in time proportional to the number of changes.
+    Cursors carry the epoch of the store, a cursor of a previous process
+    gets a full sync.
+
+    With a StatePersistence every change is also written to SQLite and
+    memory stays bounded. Only the messages of the max_loaded_conversations
+    most recently used conversations and the bodies of the max_loaded_tasks
+    most recently used tasks stay in memory, the others are loaded back on
+    first access. Every task keeps its id, context and state in memory, so
+    filtering and counting never read the database. The message -> task
+    index lives in SQLite only, and the task change log keeps the last
+    max_task_changes entries, older cursors get a full sync.
+    """
+
+    def __init__(
+        self,
+        persistence: StatePersistence | None = None,
+        max_loaded_conversations: int = 100,
+        on_evict: Callable[[str], None] | None = None,
+        max_loaded_tasks: int = 1000,
+        max_task_changes: int = 10000,
+    ):
+        # Dicts preserve insertion order so the list views keep the order
+        # in which items were first created.
+        self._conversations: dict[str, Conversation] = {}
+        self._messages_by_id: dict[str, Message] = {}
+        # task_id -> (context_id, state) of every task, in creation order
+        self._task_states: dict[str, tuple[str | None, str]] = {}
+        # Task bodies in memory, least recently used first
+        self._task_bodies: OrderedDict[str, Task] = OrderedDict()
+        # context_id -> task_id -> None, used as an ordered set
+        self._context_tasks: dict[str, dict[str, None]] = {}
+        # message_id -> task_id, only without persistence
+        self._message_tasks: dict[str, str] = {}
+        self._version = 0
+        self._epoch = new_epoch()
+        # scope -> record id -> version of the last change, oldest first.
+        # Scopes are 'conversation', 'task' and 'message/<conversation_id>'.
+        self._changes: dict[str, OrderedDict[str, int]] = {}
+        # Version of the newest change dropped from the task change log
+        self._task_changes_floor = 0
+        self._max_task_changes = max_task_changes
+        self._max_loaded_tasks = max_loaded_tasks
+        self._persistence = persistence
+        self._max_loaded_conversations = max_loaded_conversations
+        # Called with the conversation id when its messages leave memory
+        self._on_evict = on_evict
+        # Conversations whose messages are in memory, least recently used
+        # first
+        self._loaded: OrderedDict[str, None] = OrderedDict()
+
+    def load(self):
+        """Read the persisted conversations and tasks back.
+
+        Only the messages of the most recently updated conversations are
+        loaded, task bodies and the message -> task index are read on first
+        access.
+        """
+        if not self._persistence:
+            return
+        for conversation in self._persistence.load_conversations():
+            self._conversations[conversation.conversation_id] = conversation
+            self._touch('conversation', conversation.conversation_id)
+        for task_id, context_id, state in self._persistence.load_task_states():
+            self._task_states[task_id] = (context_id, state)
+            self._index_task(task_id, context_id)
+            self._touch('task', task_id)
+        for conversation_id in self._persistence.load_recent_conversation_ids(
+            self._max_loaded_conversations
+        ):
+            self._load_history(
+                self._conversations[conversation_id],
+                self._persistence.load_messages(conversation_id),
+            )
+
+    # Versioning
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def cursor(self) -> str:
+        """Sync cursor of the current version."""
+        return format_cursor(self._epoch, self._version)
+
+    def _touch(self, scope: str, key: str):
+        self._version += 1
+        log = self._changes.setdefault(scope, OrderedDict())
+        log[key] = self._version
+        log.move_to_end(key)
+        if (
+            scope == 'task'
+            and self._persistence
+            and len(log) > self._max_task_changes
+        ):
+            _, self._task_changes_floor = log.popitem(last=False)
+
+    def _changed_since(self, scope: str, since: int) -> list[str]:
+        log = self._changes.get(scope)
+        if not log:
+            return []
+        keys = []
+        for key, version in reversed(log.items()):
+            if version <= since:
+                break
+            keys.append(key)
+        keys.reverse()
+        return keys
+
+    def _normalize_cursor(self, since: str | None) -> int:
+        # A cursor of another epoch was issued by a previous process, start
+        # over with a full sync.
+        return parse_cursor(self._epoch, since, self._version)
+
+    # History loading
+
+    def _use(self, conversation: Conversation):
+        """Mark the history of a conversation as used, loading it first.
+
+        Callers on the event loop await load_conversation() beforehand, so
+        the read here only happens for conversations evicted in between.
+        """
+        conversation_id = conversation.conversation_id
+        if conversation_id in self._loaded:
+            self._loaded.move_to_end(conversation_id)
+        elif self._persistence:
+            self._load_history(
+                conversation, self._persistence.load_messages(conversation_id)
+            )
+        else:
+            self._loaded[conversation_id] = None
+
+    async def load_conversation(self, conversation_id: str | None):
+        """Load the history of an evicted conversation off the event loop."""
+        conversation = self._conversations.get(conversation_id or '')
+        if (
+            conversation is None
+            or not self._persistence
+            or conversation_id in self._loaded
+        ):
+            return
+        messages = await asyncio.to_thread(
+            self._persistence.load_messages, conversation_id
+        )
+        # A synchronous access may have loaded it in the meantime
+        if conversation_id in self._loaded:
+            self._loaded.move_to_end(conversation_id)
+        else:
+            self._load_history(conversation, messages)
+
+    def _load_history(
+        self, conversation: Conversation, messages: list[Message]
+    ):
+        conversation_id = conversation.conversation_id
+        conversation.messages = messages
+        for message in messages:
+            self._messages_by_id[message.message_id] = message
+            self._touch(f'message/{conversation_id}', message.message_id)
+        self._loaded[conversation_id] = None
+        self._evict_histories()
+
+    def _evict_histories(self):
+        if not self._persistence:
+            return
+        while len(self._loaded) > self._max_loaded_conversations:
+            conversation_id, _ = self._loaded.popitem(last=False)
+            conversation = self._conversations[conversation_id]
+            for message in conversation.messages:
+                self._messages_by_id.pop(message.message_id, None)
+            conversation.messages = []
+            self._changes.pop(f'message/{conversation_id}', None)
+            if self._on_evict:
+                self._on_evict(conversation_id)
+
+    # Conversations
+
+    def add_conversation(self, conversation: Conversation):
+        self._conversations[conversation.conversation_id] = conversation
+        self._touch('conversation', conversation.conversation_id)
+        for message in conversation.messages:
+            self._messages_by_id[message.message_id] = message
+            self._touch(
+                f'message/{conversation.conversation_id}', message.message_id
+            )
+        if self._persistence:
+            self._persistence.put(
+                'conversation', conversation.conversation_id, conversation
+            )
+            for message in conversation.messages:
+                self._persistence.put_message(message)
+        self._loaded[conversation.conversation_id] = None
+        self._evict_histories()
+
+    def get_conversation(
+        self, conversation_id: str | None
+    ) -> Conversation | None:
+        if not conversation_id:
+            return None
+        conversation = self._conversations.get(conversation_id)
+        if conversation:
+            self._use(conversation)
+        return conversation
+
+    @property
+    def conversations(self) -> list[Conversation]:
+        return list(self._conversations.values())
+
+    def conversations_since(
+        self, since: str | None
+    ) -> tuple[list[Conversation], str]:
+        since = self._normalize_cursor(since)
+        if not since:
+            return self.conversations, self.cursor
+        return [
+            self._conversations[x]
+            for x in self._changed_since('conversation', since)
+        ], self.cursor
+
+    # Messages
+
+    def append_conversation_message(
+        self, conversation: Conversation, message: Message
+    ):
+        """Append a message to a conversation and record the change."""
+        self._use(conversation)
+        conversation.messages.append(message)
+        self._messages_by_id[message.message_id] = message
+        self._touch('conversation', conversation.conversation_id)
+        self._touch(
+            f'message/{conversation.conversation_id}', message.message_id
+        )
+        if self._persistence:
+            self._persistence.put_message(message)
+            self._persistence.put(
+                'conversation', conversation.conversation_id, conversation
+            )
+
+    def messages_since(
+        self, conversation_id: str, since: str | None
+    ) -> tuple[list[Message], str]:
+        conversation = self.get_conversation(conversation_id)
+        if not conversation:
+            return [], self.cursor
+        since = self._normalize_cursor(since)
+        if not since:
+            return list(conversation.messages), self.cursor
+        return [
+            self._messages_by_id[x]
+            for x in self._changed_since(f'message/{conversation_id}', since)
+        ], self.cursor
+
+    # Tasks
+
+    def add_task(self, task: Task):
+        self._task_states[task.id] = (task.context_id, task.status.state)
+        self._index_task(task.id, task.context_id)
+        self._cache_task(task)
+        self._touch('task', task.id)
+        if self._persistence:
+            self._persistence.put('task', task.id, task)
+
+    def update_task(self, task: Task) -> bool:
+        """Replace a known task, returns False if the task is unknown."""
+        previous = self._task_states.get(task.id)
+        if previous is None:
+            return False
+        if previous[0] != task.context_id:
+            self._unindex_task(task.id, previous[0])
+        self._task_states[task.id] = (task.context_id, task.status.state)
+        self._index_task(task.id, task.context_id)
+        self._cache_task(task)
+        self._touch('task', task.id)
+        if self._persistence:
+            self._persistence.put('task', task.id, task)
+        return True
+
+    def get_task(self, task_id: str | None) -> Task | None:
+        if not task_id or task_id not in self._task_states:
+            return None
+        task = self._task_bodies.get(task_id)
+        if task is not None:
+            self._task_bodies.move_to_end(task_id)
+            return task
+        task = self._persistence.load_tasks([task_id]).get(task_id)
+        if task is not None:
+            self._cache_task(task)
+        return task
+
+    def has_task(self, task_id: str | None) -> bool:
+        return bool(task_id) and task_id in self._task_states
+
+    def tasks_for_context(self, context_id: str | None) -> list[Task]:
+        if not context_id or context_id not in self._context_tasks:
+            return []
+        return self._read_tasks(list(self._context_tasks[context_id]))
+
+    @property
+    def tasks(self) -> list[Task]:
+        return self._read_tasks(list(self._task_states))
+
+    def tasks_since(self, since: str | None) -> tuple[list[Task], str]:
+        since = self._normalize_cursor(since)
+        if not since or since < self._task_changes_floor:
+            return self.tasks, self.cursor
+        return self._read_tasks(self._changed_since('task', since)), self.cursor
+
+    def page_tasks(
+        self,
+        offset: int = 0,
+        limit: int | None = None,
+        context_id: str | None = None,
+        state: str | None = None,
+        descending: bool = False,
+    ) -> tuple[list[Task], int]:
+        """A page of the tasks in creation order, plus the matching total.
+
+        Filtering reads the resident task states, only the bodies of the
+        page are loaded.
+        """
+        if context_id:
+            ids = list(self._context_tasks.get(context_id, {}))
+        else:
+            ids = list(self._task_states)
+        if state:
+            ids = [x for x in ids if self._task_states[x][1] == state]
+        if descending:
+            ids.reverse()
+        offset = max(offset, 0)
+        stop = len(ids) if limit is None else offset + max(limit, 0)
+        return self._read_tasks(ids[offset:stop]), len(ids)
+
+    def _read_tasks(self, task_ids: list[str]) -> list[Task]:
+        """Bodies of the tasks, in order.
+
+        Evicted bodies are read in one query and not cached, so a full
+        listing does not push the recently used tasks out of memory.
+        """
+        missing = [x for x in task_ids if x not in self._task_bodies]
+        loaded = self._persistence.load_tasks(missing) if missing else {}
+        tasks = []
+        for task_id in task_ids:
+            task = self._task_bodies.get(task_id) or loaded.get(task_id)
+            if task is not None:
+                tasks.append(task)
+        return tasks
+
+    def _cache_task(self, task: Task):
+        self._task_bodies[task.id] = task
+        self._task_bodies.move_to_end(task.id)
+        if not self._persistence:
+            return
+        while len(self._task_bodies) > self._max_loaded_tasks:
+            self._task_bodies.popitem(last=False)
+
+    def _index_task(self, task_id: str, context_id: str | None):
+        if context_id:
+            self._context_tasks.setdefault(context_id, {})[task_id] = None
+
+    def _unindex_task(self, task_id: str, context_id: str | None):
+        if not context_id:
+            return
+        ids = self._context_tasks.get(context_id)
+        if ids is None:
+            return
+        ids.pop(task_id, None)
+        if not ids:
+            del self._context_tasks[context_id]
+
+    # Message -> task index
+
+    def attach_message_to_task(self, message_id: str, task_id: str):
+        if self._persistence:
+            self._persistence.put(
+                'message_task', message_id, (message_id, task_id)
+            )
+        else:
+            self._message_tasks[message_id] = task_id
+
+    def task_id_for_message(self, message_id: str) -> str | None:
+        if self._persistence:
+            return self._persistence.load_message_task(message_id)
+        return self._message_tasks.get(message_id)
+
+    def task_for_message(self, message_id: str) -> Task | None:
+        return self.get_task(self.task_id_for_message(message_id))
+
+    def clear_message_index(self):
+        self._message_tasks = {}
+        if self._persistence:
+            self._persistence.clear('message_task')
@@ -0,0 +1,120 @@
+"""Incremental text relay from streaming remote agents to the UI.
+
+Remote agents stream TaskStatusUpdateEvent and TaskArtifactUpdateEvent
+chunks. The relay assembles the text of every pending user message from
+those chunks and turns each one into a delta `(offset, text)`: the client
+truncates its copy of the progress text to `offset` and appends `text`.
+Appended artifact chunks produce pure appends, a status message that does
+not extend the current text replaces it from offset 0.
+"""
+
+from dataclasses import dataclass, field
+
+from a2a.types import (
+    Part,
+    TaskArtifactUpdateEvent,
+    TaskStatusUpdateEvent,
+)
+
+
+def text_of(parts: list[Part] | None) -> str:
+    if not parts:
+        return ''
+    return ''.join(p.root.text for p in parts if p.root.kind == 'text')
+
+
+@dataclass
+class StreamDelta:
+    message_id: str
+    task_id: str | None
+    offset: int
+    text: str
+
+    def to_dict(self) -> dict:
+        return {
+            'message_id': self.message_id,
+            'task_id': self.task_id,
+            'offset': self.offset,
+            'text': self.text,
+        }
+
+
+@dataclass
+class _TextBuffer:
+    chunks: list[str] = field(default_factory=list)
+    length: int = 0
+    # Artifact text wins over status messages once it starts streaming
+    from_artifact: bool = False
+    # Joined text, invalidated on every change
+    _text: str | None = None
+
+    def text(self) -> str:
+        if self._text is None:
+            self._text = ''.join(self.chunks)
+            self.chunks = [self._text] if self._text else []
+        return self._text
+
+    def append(self, text: str) -> int:
+        offset = self.length
+        self.chunks.append(text)
+        self.length += len(text)
+        self._text = None
+        return offset
+
+    def replace(self, text: str):
+        self.chunks = [text] if text else []
+        self.length = len(text)
+        self._text = text
+
+
+class StreamRelay:
+    """Per message assembly buffers for streamed agent output."""
+
+    def __init__(self):
+        # pending message id -> assembled progress text
+        self._buffers: dict[str, _TextBuffer] = {}
+
+    def feed(
+        self,
+        message_id: str,
+        event: TaskStatusUpdateEvent | TaskArtifactUpdateEvent,
+    ) -> StreamDelta | None:
+        """Add a streamed chunk, returns the delta to push if any."""
+        buffer = self._buffers.setdefault(message_id, _TextBuffer())
+        if isinstance(event, TaskArtifactUpdateEvent):
+            text = text_of(event.artifact.parts)
+            if not text:
+                return None
+            if not buffer.from_artifact:
+                # The first artifact chunk replaces the status text
+                buffer.from_artifact = True
+                buffer.replace(text)
+                return StreamDelta(message_id, event.task_id, 0, text)
+            if not event.append and buffer.length:
+                # A new artifact starts on its own line
+                text = '\n' + text
+            offset = buffer.append(text)
+            return StreamDelta(message_id, event.task_id, offset, text)
+        if buffer.from_artifact or not event.status.message:
+            return None
+        text = text_of(event.status.message.parts)
+        if not text:
+            return None
+        current = buffer.text()
+        if text.startswith(current):
+            # Cumulative status text, only ship what is new
+            if len(text) == len(current):
+                return None
+            offset = buffer.append(text[len(current) :])
+            return StreamDelta(
+                message_id, event.task_id, offset, text[len(current) :]
+            )
+        buffer.replace(text)
+        return StreamDelta(message_id, event.task_id, 0, text)
+
+    def text(self, message_id: str) -> str | None:
+        buffer = self._buffers.get(message_id)
+        return buffer.text() if buffer and buffer.length else None
+
+    def discard(self, message_id: str):
+        self._buffers.pop(message_id, None)
@@ -0,0 +1,37 @@
+"""Sync cursors handed out by the list endpoints.
+
+A cursor reads '<epoch>.<version>'. Every StateStore and EventLog picks a
+random epoch when it is created, once per server process. A cursor issued by
+an earlier process has another epoch and is answered with a full sync, even
+after the version counter of this process has passed its version.
+"""
+
+import uuid
+
+
+def new_epoch() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def format_cursor(epoch: str, version: int) -> str:
+    return f'{epoch}.{version}'
+
+
+def cursor_epoch(cursor: str | None) -> str | None:
+    if not cursor:
+        return None
+    return str(cursor).partition('.')[0]
+
+
+def parse_cursor(epoch: str, cursor: str | None, latest: int) -> int:
+    """Version of a cursor issued under epoch, 0 (full sync) otherwise.
+
+    latest is the current version, a cursor past it is not one of ours.
+    """
+    if not cursor:
+        return 0
+    cursor_epoch, _, version = cursor.partition('.')
+    if cursor_epoch != epoch or not version.isdigit():
+        return 0
+    version = int(version)
+    return version if version <= latest else 0
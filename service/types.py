@@ -8,7 +8,7 @@ from a2a.types import (
     Message,
     Task,
 )
-from pydantic import BaseModel, Field, TypeAdapter
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 
 class JSONRPCMessage(BaseModel):
@@ -40,6 +40,20 @@ class Conversation(BaseModel):
     messages: list[Message] = Field(default_factory=list)
 
 
+class ConversationSummary(BaseModel):
+    """A conversation as listed by conversation/list, without its messages.
+
+    Only the message ids are shipped, the messages themselves are read
+    through message/list and its own cursor.
+    """
+
+    conversation_id: str
+    is_active: bool
+    name: str = ''
+    task_ids: list[str] = Field(default_factory=list)
+    message_ids: list[str] = Field(default_factory=list)
+
+
 class Event(BaseModel):
     id: str
     actor: str = ''
@@ -48,6 +62,41 @@ class Event(BaseModel):
     timestamp: float
 
 
+class SyncParams(BaseModel):
+    # Integer cursors of older clients are read as strings without an epoch
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
+    # Cursor returned by a previous list call. When set only the records
+    # changed after it are returned, a cursor of a previous server process
+    # gets the full list.
+    since: str | None = None
+
+
+class GetEventParams(SyncParams):
+    # Paging over the event history in timestamp order, ignored when
+    # `since` is set.
+    offset: int = 0
+    limit: int | None = None
+    since_timestamp: float | None = None
+    context_id: str | None = None
+    actor: str | None = None
+    descending: bool = False
+
+
+class ListTaskParams(SyncParams):
+    # Paging over the tasks in creation order, ignored when `since` is set.
+    # Without limit or filters the full list is returned.
+    offset: int = 0
+    limit: int | None = None
+    context_id: str | None = None
+    state: str | None = None
+    descending: bool = False
+
+
+class ListMessageParams(SyncParams):
+    conversation_id: str
+
+
 class SendMessageRequest(JSONRPCRequest):
     method: Literal['message/send'] = 'message/send'
     params: Message
@@ -55,12 +104,13 @@ class SendMessageRequest(JSONRPCRequest):
 
 class ListMessageRequest(JSONRPCRequest):
     method: Literal['message/list'] = 'message/list'
-    # This is the conversation id
-    params: str
+    # This is the conversation id, or the conversation id with a cursor
+    params: str | ListMessageParams
 
 
 class ListMessageResponse(JSONRPCResponse):
     result: list[Message] | None = None
+    cursor: str | None = None
 
 
 class MessageInfo(BaseModel):
@@ -74,18 +124,24 @@ class SendMessageResponse(JSONRPCResponse):
 
 class GetEventRequest(JSONRPCRequest):
     method: Literal['events/get'] = 'events/get'
+    params: GetEventParams | None = None
 
 
 class GetEventResponse(JSONRPCResponse):
     result: list[Event] | None = None
+    cursor: str | None = None
+    # Number of events matching the filters of a paged request
+    total: int | None = None
 
 
 class ListConversationRequest(JSONRPCRequest):
     method: Literal['conversation/list'] = 'conversation/list'
+    params: SyncParams | None = None
 
 
 class ListConversationResponse(JSONRPCResponse):
-    result: list[Conversation] | None = None
+    result: list[ConversationSummary] | None = None
+    cursor: str | None = None
 
 
 class PendingMessageRequest(JSONRPCRequest):
@@ -106,10 +162,14 @@ class CreateConversationResponse(JSONRPCResponse):
 
 class ListTaskRequest(JSONRPCRequest):
     method: Literal['task/list'] = 'task/list'
+    params: ListTaskParams | None = None
 
 
 class ListTaskResponse(JSONRPCResponse):
     result: list[Task] | None = None
+    cursor: str | None = None
+    # Number of tasks matching the filters of a paged request
+    total: int | None = None
 
 
 class RegisterAgentRequest(JSONRPCRequest):
@@ -4,24 +4,38 @@ import sys
 import traceback
 import uuid
 
-from typing import Any
+from collections.abc import Callable
+from typing import Any, TypeVar
 
 from a2a.types import FileWithBytes, Message, Part, Role, Task, TaskState
 from service.client.client import ConversationClient
+from service.client.http_pool import get_http_client, scoped_http_client
+from service.server.sync_cursor import cursor_epoch
 from service.types import (
+    AgentClientError,
     Conversation,
+    ConversationSummary,
     CreateConversationRequest,
     Event,
+    GetEventParams,
     GetEventRequest,
+    JSONRPCResponse,
     ListAgentRequest,
     ListConversationRequest,
+    ListConversationResponse,
+    ListMessageParams,
     ListMessageRequest,
+    ListMessageResponse,
+    ListTaskParams,
     ListTaskRequest,
+    ListTaskResponse,
     MessageInfo,
     PendingMessageRequest,
+    PendingMessageResponse,
     RegisterAgentRequest,
     RemoveAgentRequest,
     SendMessageRequest,
+    SyncParams,
 )
 
 from .state import (
@@ -36,8 +50,12 @@ from .state import (
 
 server_url = 'http://localhost:8085'
 
+T = TypeVar('T')
+R = TypeVar('R', bound=JSONRPCResponse)
 
-async def ListConversations() -> list[Conversation]:
+
+@scoped_http_client()
+async def ListConversations() -> list[ConversationSummary]:
     client = ConversationClient(server_url)
     try:
         response = await client.list_conversation(ListConversationRequest())
@@ -47,6 +65,7 @@ async def ListConversations() -> list[Conversation]:
     return []
 
 
+@scoped_http_client()
 async def SendMessage(message: Message) -> Message | MessageInfo | None:
     client = ConversationClient(server_url)
     try:
@@ -58,6 +77,7 @@ async def SendMessage(message: Message) -> Message | MessageInfo | None:
     return None
 
 
+@scoped_http_client()
 async def CreateConversation() -> Conversation:
     client = ConversationClient(server_url)
     try:
@@ -72,6 +92,7 @@ async def CreateConversation() -> Conversation:
     return Conversation(conversation_id='', is_active=False)
 
 
+@scoped_http_client()
 async def ListRemoteAgents():
     client = ConversationClient(server_url)
     try:
@@ -82,6 +103,7 @@ async def ListRemoteAgents():
         return []
 
 
+@scoped_http_client()
 async def AddRemoteAgent(path: str):
     client = ConversationClient(server_url)
     try:
@@ -90,6 +112,7 @@ async def AddRemoteAgent(path: str):
         print('Failed to register the agent', e)
 
 
+@scoped_http_client()
 async def RemoveRemoteAgent(path: str):
     client = ConversationClient(server_url)
     try:
@@ -98,47 +121,65 @@ async def RemoveRemoteAgent(path: str):
         print('Failed to remove the agent', e)
 
 
+@scoped_http_client()
 async def ToggleRemoteAgent(agent_url: str, enabled: bool):
     """Habilita/desabilita um agente"""
-    client = ConversationClient(server_url)
     try:
-        import httpx
-        async with httpx.AsyncClient() as http_client:
-            response = await http_client.post(
-                f'{server_url}/agent/toggle', 
-                json={'params': {'agent_url': agent_url, 'enabled': enabled}}
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await get_http_client().post(
+            f'{server_url}/agent/toggle',
+            json={'params': {'agent_url': agent_url, 'enabled': enabled}},
+        )
+        response.raise_for_status()
+        return response.json()
     except Exception as e:
         print('Failed to toggle agent', e)
         return {'result': {'success': False, 'message': str(e)}}
 
 
+@scoped_http_client()
 async def RefreshAgents():
     """Força redescoberta de agentes"""
-    client = ConversationClient(server_url)
     try:
-        import httpx
-        async with httpx.AsyncClient() as http_client:
-            response = await http_client.post(f'{server_url}/agent/refresh', json={})
-            response.raise_for_status()
-            return response.json()
+        response = await get_http_client().post(
+            f'{server_url}/agent/refresh', json={}
+        )
+        response.raise_for_status()
+        return response.json()
     except Exception as e:
         print('Failed to refresh agents', e)
         return {'result': {'discovered_count': 0, 'message': str(e)}}
 
 
-async def GetEvents() -> list[Event]:
+@scoped_http_client()
+async def GetEventPage(
+    offset: int = 0,
+    limit: int | None = None,
+    context_id: str | None = None,
+    actor: str | None = None,
+    descending: bool = False,
+) -> tuple[list[Event], int]:
+    """A page of events and the number of events matching the filters."""
     client = ConversationClient(server_url)
     try:
-        response = await client.get_events(GetEventRequest())
-        return response.result if response.result else []
+        response = await client.get_events(
+            GetEventRequest(
+                params=GetEventParams(
+                    offset=offset,
+                    limit=limit,
+                    context_id=context_id,
+                    actor=actor,
+                    descending=descending,
+                )
+            )
+        )
+        events = response.result or []
+        return events, response.total or len(events)
     except Exception as e:
         print('Failed to get events', e)
-    return []
+    return [], 0
 
 
+@scoped_http_client()
 async def GetProcessingMessages():
     client = ConversationClient(server_url)
     try:
@@ -153,6 +194,7 @@ def GetMessageAliases():
     return {}
 
 
+@scoped_http_client()
 async def GetTasks():
     client = ConversationClient(server_url)
     try:
@@ -163,6 +205,36 @@ async def GetTasks():
     return []
 
 
+@scoped_http_client()
+async def GetTaskPage(
+    offset: int = 0,
+    limit: int | None = None,
+    context_id: str | None = None,
+    state: str | None = None,
+    descending: bool = False,
+) -> tuple[list[Task], int]:
+    """A page of tasks and the number of tasks matching the filters."""
+    client = ConversationClient(server_url)
+    try:
+        response = await client.list_tasks(
+            ListTaskRequest(
+                params=ListTaskParams(
+                    offset=offset,
+                    limit=limit,
+                    context_id=context_id,
+                    state=state,
+                    descending=descending,
+                )
+            )
+        )
+        tasks = response.result or []
+        return tasks, response.total or len(tasks)
+    except Exception as e:
+        print('Failed to list tasks ', e)
+    return [], 0
+
+
+@scoped_http_client()
 async def ListMessages(conversation_id: str) -> list[Message]:
     client = ConversationClient(server_url)
     try:
@@ -175,42 +247,166 @@ async def ListMessages(conversation_id: str) -> list[Message]:
     return []
 
 
+@scoped_http_client()
 async def UpdateAppState(state: AppState, conversation_id: str):
-    """Update the app state."""
+    """Update the app state.
+
+    Each list call sends the cursor of the previous sync and only the records
+    that changed since then are downloaded, converted and merged in place.
+    All calls go out as one /rpc/batch round-trip.
+    """
+    client = ConversationClient(server_url)
+    cursors = state.sync_cursors
     try:
         if conversation_id:
             state.current_conversation_id = conversation_id
-            messages = await ListMessages(conversation_id)
-            if not messages:
+            if state.synced_conversation_id != conversation_id:
+                state.synced_conversation_id = conversation_id
                 state.messages = []
-            else:
-                state.messages = [convert_message_to_state(x) for x in messages]
-        conversations = await ListConversations()
-        if not conversations:
-            state.conversations = []
-        else:
-            state.conversations = [
-                convert_conversation_to_state(x) for x in conversations
-            ]
-
-        state.task_list = []
-        for task in await GetTasks():
-            state.task_list.append(
-                SessionTask(
-                    context_id=extract_conversation_id(task),
-                    task=convert_task_to_state(task),
+                cursors.pop('message', None)
+        requests = [
+            ListConversationRequest(
+                params=SyncParams(since=cursors.get('conversation'))
+            ),
+            ListTaskRequest(params=SyncParams(since=cursors.get('task'))),
+            PendingMessageRequest(),
+        ]
+        if conversation_id:
+            requests.append(
+                ListMessageRequest(
+                    params=ListMessageParams(
+                        conversation_id=conversation_id,
+                        since=cursors.get('message'),
+                    )
                 )
             )
-        state.background_tasks = await GetProcessingMessages()
+        results = await client.batch(requests)
+
+        if conversation_id:
+            since = cursors.get('message')
+            response = batch_response(ListMessageResponse, results[3])
+            state.messages = merge_records(
+                state.messages,
+                [convert_message_to_state(x) for x in response.result or []],
+                lambda x: x.message_id,
+                is_full_sync(since, response.cursor),
+            )
+            cursors['message'] = response.cursor or ''
+
+        since = cursors.get('conversation')
+        response = batch_response(ListConversationResponse, results[0])
+        state.conversations = merge_records(
+            state.conversations,
+            [convert_conversation_to_state(x) for x in response.result or []],
+            lambda x: x.conversation_id,
+            is_full_sync(since, response.cursor),
+        )
+        cursors['conversation'] = response.cursor or ''
+
+        since = cursors.get('task')
+        response = batch_response(ListTaskResponse, results[1])
+        state.task_list = merge_records(
+            state.task_list,
+            [convert_task_to_session_task(x) for x in response.result or []],
+            lambda x: x.task.task_id,
+            is_full_sync(since, response.cursor),
+        )
+        cursors['task'] = response.cursor or ''
+
+        response = batch_response(PendingMessageResponse, results[2])
+        state.background_tasks = dict(response.result or [])
         state.message_aliases = GetMessageAliases()
     except Exception as e:
         print('Failed to update state: ', e)
         traceback.print_exc(file=sys.stdout)
 
 
+def batch_response(response_type: type[R], raw: dict[str, Any]) -> R:
+    response = response_type(**raw)
+    if response.error:
+        raise AgentClientError(
+            f'{response.error.code}: {response.error.message}'
+        )
+    return response
+
+
+def is_full_sync(since: str | None, cursor: str | None) -> bool:
+    # A cursor of another epoch means the server restarted and sent
+    # everything again.
+    return not since or cursor_epoch(since) != cursor_epoch(cursor)
+
+
+def merge_records(
+    current: list[T],
+    updates: list[T],
+    key: Callable[[T], str],
+    replace: bool = False,
+) -> list[T]:
+    """Upsert updated records into a state list, keeping the list order."""
+    if replace:
+        return updates
+    if not updates:
+        return current
+    positions = {key(x): i for i, x in enumerate(current)}
+    for record in updates:
+        i = positions.get(key(record))
+        if i is None:
+            positions[key(record)] = len(current)
+            current.append(record)
+        else:
+            current[i] = record
+    return current
+
+
+def ApplyStreamEvent(state: AppState, kind: str, data: Any):
+    """Merge a delta pushed by the server event stream into the app state."""
+    if kind == 'conversation':
+        conversation = StateConversation(
+            conversation_id=data['conversation_id'],
+            conversation_name=data['name'],
+            is_active=data['is_active'],
+            message_ids=data['message_ids'],
+        )
+        merge_records(
+            state.conversations, [conversation], lambda x: x.conversation_id
+        )
+    elif kind == 'message':
+        message = Message(**data)
+        for c in state.conversations:
+            if (
+                c.conversation_id == message.context_id
+                and message.message_id not in c.message_ids
+            ):
+                c.message_ids.append(message.message_id)
+        if message.context_id != state.current_conversation_id:
+            return
+        merge_records(
+            state.messages,
+            [convert_message_to_state(message)],
+            lambda x: x.message_id,
+        )
+    elif kind == 'task':
+        merge_records(
+            state.task_list,
+            [convert_task_to_session_task(Task(**data))],
+            lambda x: x.task.task_id,
+        )
+    elif kind == 'pending':
+        state.background_tasks = dict(data)
+    elif kind == 'delta':
+        # Streamed text of a pending message, applied at its offset. A
+        # delta past the end means one was missed, the next 'pending'
+        # push carries the full text again.
+        current = state.background_tasks.get(data['message_id'], '')
+        if data['offset'] <= len(current):
+            state.background_tasks[data['message_id']] = (
+                current[: data['offset']] + data['text']
+            )
+
+
+@scoped_http_client()
 async def UpdateApiKey(api_key: str):
     """Update the API key"""
-    import httpx
     from utils.api_key_manager import ApiKeyManager
 
     try:
@@ -222,11 +418,10 @@ async def UpdateApiKey(api_key: str):
         api_key_manager.save_api_key(api_key)
 
         # Call the update API endpoint
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f'{server_url}/api_key/update', json={'api_key': api_key}
-            )
-            response.raise_for_status()
+        response = await get_http_client().post(
+            f'{server_url}/api_key/update', json={'api_key': api_key}
+        )
+        response.raise_for_status()
         return True
     except Exception as e:
         print('Failed to update API key: ', e)
@@ -247,13 +442,13 @@ def convert_message_to_state(message: Message) -> StateMessage:
 
 
 def convert_conversation_to_state(
-    conversation: Conversation,
+    conversation: ConversationSummary,
 ) -> StateConversation:
     return StateConversation(
         conversation_id=conversation.conversation_id,
         conversation_name=conversation.name,
         is_active=conversation.is_active,
-        message_ids=[extract_message_id(x) for x in conversation.messages],
+        message_ids=list(conversation.message_ids),
     )
 
 
@@ -291,6 +486,13 @@ def convert_task_to_state(task: Task) -> StateTask:
     )
 
 
+def convert_task_to_session_task(task: Task) -> SessionTask:
+    return SessionTask(
+        context_id=extract_conversation_id(task),
+        task=convert_task_to_state(task),
+    )
+
+
 def convert_event_to_state(event: Event) -> StateEvent:
     return StateEvent(
         context_id=extract_message_conversation(event.content),
@@ -89,6 +89,11 @@ class AppState:
     # This is used to track the message sent to agent with form data
     form_responses: dict[str, str] = dataclasses.field(default_factory=dict)
     polling_interval: int = 1
+    # Cursors returned by the list endpoints, keyed by record kind, so that
+    # UpdateAppState only downloads what changed since the previous sync.
+    sync_cursors: dict[str, str] = dataclasses.field(default_factory=dict)
+    # Conversation the synced messages belong to
+    synced_conversation_id: str = ''
 
     # Added for API key management
     api_key: str = ''
@@ -96,6 +101,36 @@ class AppState:
     api_key_dialog_open: bool = False
 
 
+@me.stateclass
+class EventTableState:
+    """Page of the event list currently on screen.
+
+    Only the formatted rows of the visible page are kept, filtering, sorting
+    and paging happen on the server.
+    """
+
+    offset: int = 0
+    page_size: int = 50
+    total: int = 0
+    context_filter: str = ''
+    actor_filter: str = ''
+    newest_first: bool = True
+    rows: list[dict[str, str]] = dataclasses.field(default_factory=list)
+
+
+@me.stateclass
+class TaskTableState:
+    """Page of the task list currently on screen."""
+
+    offset: int = 0
+    page_size: int = 50
+    total: int = 0
+    context_filter: str = ''
+    state_filter: str = ''
+    newest_first: bool = True
+    rows: list[dict[str, str]] = dataclasses.field(default_factory=list)
+
+
 @me.stateclass
 class SettingsState:
     """Settings State"""
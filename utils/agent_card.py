@@ -1,11 +1,120 @@
-import requests
+import asyncio
+import time
+
+from dataclasses import dataclass
+
+import httpx
 
 from a2a.types import AgentCard
 
 
-def get_agent_card(remote_agent_address: str) -> AgentCard:
-    """Get the agent card."""
+AGENT_CARD_PATH = '/.well-known/agent.json'
+DEFAULT_TIMEOUT = 5.0
+
+
+def normalize_agent_address(remote_agent_address: str) -> str:
     if not remote_agent_address.startswith(('http://', 'https://')):
         remote_agent_address = 'http://' + remote_agent_address
-    agent_card = requests.get(f'{remote_agent_address}/.well-known/agent.json')
-    return AgentCard(**agent_card.json())
+    return remote_agent_address.rstrip('/')
+
+
+@dataclass
+class _CachedCard:
+    card: AgentCard
+    fetched_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+class AgentCardResolver:
+    """Async agent card fetcher with a TTL cache.
+
+    Cards are cached per address for `ttl` seconds. Expired cards are
+    revalidated with If-None-Match / If-Modified-Since, and concurrent
+    requests for the same address share a single fetch.
+    """
+
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient | None = None,
+        ttl: float = 300.0,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        self._http_client = http_client
+        self._ttl = ttl
+        self._timeout = httpx.Timeout(timeout, connect=min(timeout, 2.0))
+        self._cache: dict[str, _CachedCard] = {}
+        # address -> (loop, in-flight fetch)
+        self._inflight: dict[
+            str, tuple[asyncio.AbstractEventLoop, asyncio.Future]
+        ] = {}
+
+    def _client(self) -> httpx.AsyncClient:
+        if self._http_client is not None:
+            return self._http_client
+        from service.client.http_pool import get_http_client
+
+        return get_http_client()
+
+    async def resolve(self, remote_agent_address: str) -> AgentCard:
+        address = normalize_agent_address(remote_agent_address)
+        cached = self._cache.get(address)
+        if cached and time.monotonic() - cached.fetched_at < self._ttl:
+            return cached.card
+
+        loop = asyncio.get_running_loop()
+        inflight = self._inflight.get(address)
+        if inflight and inflight[0] is loop:
+            return await asyncio.shield(inflight[1])
+
+        future = loop.create_future()
+        self._inflight[address] = (loop, future)
+        try:
+            card = await self._fetch(address, cached)
+            future.set_result(card)
+            return card
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else is waiting.
+            future.exception()
+            raise
+        finally:
+            if self._inflight.get(address, (None, None))[1] is future:
+                del self._inflight[address]
+
+    async def _fetch(
+        self, address: str, cached: _CachedCard | None
+    ) -> AgentCard:
+        headers = {}
+        if cached and cached.etag:
+            headers['If-None-Match'] = cached.etag
+        if cached and cached.last_modified:
+            headers['If-Modified-Since'] = cached.last_modified
+        response = await self._client().get(
+            f'{address}{AGENT_CARD_PATH}',
+            headers=headers,
+            timeout=self._timeout,
+        )
+        if response.status_code == 304 and cached:
+            cached.fetched_at = time.monotonic()
+            return cached.card
+        response.raise_for_status()
+        card = AgentCard(**response.json())
+        self._cache[address] = _CachedCard(
+            card=card,
+            fetched_at=time.monotonic(),
+            etag=response.headers.get('etag'),
+            last_modified=response.headers.get('last-modified'),
+        )
+        return card
+
+    def invalidate(self, remote_agent_address: str):
+        self._cache.pop(normalize_agent_address(remote_agent_address), None)
+
+
+_default_resolver = AgentCardResolver()
+
+
+async def resolve_agent_card(remote_agent_address: str) -> AgentCard:
+    """Get the agent card without blocking the event loop."""
+    return await _default_resolver.resolve(remote_agent_address)